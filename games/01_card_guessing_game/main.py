@@ -4,6 +4,15 @@ import random
 import os
 import asyncio
 
+# Shared helpers live in games/shared (copied next to main.py for pygbag builds)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared.assets import cache
+from shared.text import text_cache
+from shared.render import DirtyRenderer
+from shared.scheduler import FrameScheduler
+from shared.profiler import profiler
+from shared.runtime import runtime
+
 class Deck:
     def __init__(self):
         self.cards = self.create_deck()
@@ -27,12 +36,14 @@ class Deck:
 
 class GameWindow:
     def __init__(self):
-        pygame.init()
+        runtime.init()
 
         self.screen_width = 800
         self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        self.screen = runtime.display((self.screen_width, self.screen_height))
         pygame.display.set_caption("Card Guessing Game")
+        # The card table is mostly static, so only the regions a move changes are presented
+        self.renderer = DirtyRenderer(self.screen)
 
         # Colors
         self.WHITE = (255, 255, 255)
@@ -48,13 +59,14 @@ class GameWindow:
         self.deck = Deck()
         self.deck.shuffle()
 
-        self.font = pygame.font.SysFont(None, 55)
+        self.font = runtime.font(None, 55)
         self.drawn_card = None
         self.suits = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
         self.ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
 
-        self.card_images = self.load_card_images('images/playing-cards-master')   
-        self.other_images = self.load_other_images('images/playing-cards-master')
+        self.image_folder = 'images/playing-cards-master'
+        self.card_images = self.load_card_images(self.image_folder)
+        self.other_images = self.load_other_images(self.image_folder)
 
         self.starting_points = 1000000     
         self.new_points_calc = self.starting_points
@@ -71,8 +83,7 @@ class GameWindow:
         self.viewing_removed_cards = False
 
     def draw_text(self, text, x, y, color):
-        text_surface = self.font.render(text, True, color)
-        self.screen.blit(text_surface, (x, y))
+        text_cache.draw(self.screen, self.font, text, (x, y), color)
 
     def load_card_images(self, folder):
         card_images = {}
@@ -81,7 +92,7 @@ class GameWindow:
                 card_name = f'{suit}_{rank}'
                 image_path = os.path.join(folder, f'{card_name}.png')
                 if os.path.exists(image_path):
-                    card_images[card_name] = pygame.image.load(image_path)
+                    card_images[card_name] = cache.load(image_path)
         return card_images
 
     def load_other_images(self, folder):
@@ -90,11 +101,17 @@ class GameWindow:
         for image in image_list:
             image_path = os.path.join(folder, f'{image}.png')
             if os.path.exists(image_path):
-                other_images[image] = pygame.image.load(image_path)
+                other_images[image] = cache.load(image_path)
         return other_images
 
+    def mark_row(self, y):
+        """Present one line of text across the screen."""
+        self.renderer.mark((0, y, self.screen_width, self.font.get_height()))
+
     def handle_keydown(self, key):
         if key == pygame.K_SPACE:
+            # A new card changes most of the table
+            self.renderer.invalidate()
             self.gamestate = True
             self.drawn_card = self.deck.draw_card()
             if self.drawn_card:
@@ -128,6 +145,11 @@ class GameWindow:
         elif key in [pygame.K_LEFT, pygame.K_a]:
             self.points_added = True
             self.selected_rank_index = (self.selected_rank_index - 1) % len(self.ranks)
+        else:
+            return
+        # A new guess redraws its line and may score points on the line at the top
+        self.mark_row(self.screen_height // 10)
+        self.mark_row(self.screen_height - 100)
 
     def draw_button(self, text, x, y, width, height, color, action=None):
         mouse = pygame.mouse.get_pos()
@@ -140,6 +162,7 @@ class GameWindow:
 
     def open_removed_cards_view(self):
         self.viewing_removed_cards = not self.viewing_removed_cards
+        self.renderer.invalidate()
 
     def draw_removed_cards(self):
         card_width, card_height = 63, 99
@@ -155,7 +178,7 @@ class GameWindow:
         for card in sorted_cards[-52:]:
             card_name = f"{card['suit']}_{card['rank']}"
             if card_name in self.card_images:
-                img = pygame.transform.scale(self.card_images[card_name], (card_width, card_height))
+                img = cache.load(os.path.join(self.image_folder, f'{card_name}.png'), (card_width, card_height))
                 rect = img.get_rect(center=(x_offset, y_offset))
                 self.screen.blit(img, rect)
                 y_offset += 100
@@ -168,16 +191,25 @@ class GameWindow:
 
         self.draw_button("Back to Game", self.screen_width // 3, self.screen_height - 70, 275, 50, self.BLUE, self.open_removed_cards_view)
 
+    def launch_launcher(self):
+        runtime.launch_launcher()
+
     async def main(self):
-        clock = pygame.time.Clock()
+        # Turn based: only redraw when a key or click arrives
+        scheduler = FrameScheduler()
         running = True
 
         while running:
+            profiler.begin_frame()
+            profiler.phase("events")
             for event in pygame.event.get():
+                profiler.handle_event(event)
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_r:
+                    if event.key == pygame.K_ESCAPE:
+                        self.launch_launcher()
+                    elif event.key == pygame.K_r:
                         print('Restarting...')
                         self.deck = Deck()
                         self.deck.shuffle()
@@ -185,15 +217,20 @@ class GameWindow:
                         self.new_points_calc = self.starting_points  # Reset round points if necessary
                         self.guessed_card_counts = {}
                         self.gamestate = False
+                        self.renderer.invalidate()
                     else:
                         self.handle_keydown(event.key)
 
+            profiler.phase("draw")
             self.screen.fill(self.GREY)
 
             if self.viewing_removed_cards:
                 self.draw_removed_cards()
-                pygame.display.flip()
-                await asyncio.sleep(0)
+                self.renderer.mark(profiler.draw(self.screen))
+                profiler.phase("present")
+                self.renderer.present()
+                profiler.end_frame()
+                await scheduler.next_frame()
                 continue
 
             if not self.deck.cards:
@@ -210,7 +247,16 @@ class GameWindow:
                     rect = trash_img.get_rect(center=(self.screen_width - 100, self.screen_height - 100))
                     self.screen.blit(trash_img, rect)
 
-                self.draw_text(str(int(self.player_total_points)), self.screen_width - 200, self.screen_height // 10, self.BLACK)
+                # Award points before drawing them, so a frame never shows the old total
+                if self.drawn_card:
+                    if self.suits[self.selected_suit_index] == self.drawn_card["suit"] and not self.points_added:
+                        self.player_total_points += 100
+                        self.points_added = True
+                    if self.ranks[self.selected_rank_index] == self.drawn_card["rank"] and not self.points_added:
+                        self.player_total_points += 500
+                        self.points_added = True
+
+                text_cache.draw_number(self.screen, self.font, int(self.player_total_points), (self.screen_width - 200, self.screen_height // 10), self.BLACK)
                 self.draw_text("POINTS:", self.screen_width // 10, self.screen_height // 10, self.BLACK)
 
                 if self.new_points_calc == self.starting_points:
@@ -223,7 +269,7 @@ class GameWindow:
                     color = self.GREEN
                 else:
                     color = self.GREY2
-                self.draw_text(str(int(self.new_points_calc)), self.screen_width // 3, self.screen_height // 10, color)
+                text_cache.draw_number(self.screen, self.font, int(self.new_points_calc), (self.screen_width // 3, self.screen_height // 10), color)
 
                 guess_color = self.RED if self.selected_suit_index < 2 else self.BLACK
                 self.draw_text("GUESS:", self.screen_width // 10, self.screen_height - 100, self.BLACK)
@@ -238,12 +284,6 @@ class GameWindow:
                         self.screen.blit(card_img, rect)
 
                 if self.drawn_card:
-                    if self.suits[self.selected_suit_index] == self.drawn_card["suit"] and not self.points_added:
-                        self.player_total_points += 100
-                        self.points_added = True
-                    if self.ranks[self.selected_rank_index] == self.drawn_card["rank"] and not self.points_added:
-                        self.player_total_points += 500
-                        self.points_added = True
                     if self.is_guess_correct:
                         win_img = self.other_images.get("win_outline")
                         if win_img:
@@ -251,11 +291,13 @@ class GameWindow:
                             self.screen.blit(win_img, rect)
                     self.draw_text("Correct!" if self.is_guess_correct else '', self.screen_width // 5, self.screen_height - 50, self.BLACK)
 
-            pygame.display.flip()
-            clock.tick(60)
-            await asyncio.sleep(0)
+            self.renderer.mark(profiler.draw(self.screen))
+            profiler.phase("present")
+            self.renderer.present()
+            profiler.end_frame()
+            await scheduler.next_frame()
 
-        pygame.quit()
+        runtime.quit()
         sys.exit()
 
 if __name__ == "__main__":
@@ -0,0 +1,165 @@
+import numpy as np
+
+
+class SpatialHash:
+    """Uniform grid over the ball positions for nearby-ball queries.
+
+    Every ball gets an integer cell key; `order` lists ball indices sorted by
+    key, so the balls in a run of cells are one searchsorted() away. The order
+    is kept between steps and only re-sorted from where it was: balls move a
+    few pixels per step, so the old order is nearly sorted already and the
+    stable sort is close to a single pass. Positions outside the screen are
+    clamped into the border cells.
+    """
+
+    def __init__(self, width, height, cell_size=64):
+        self.cell_size = cell_size
+        self.cols = int(width // cell_size) + 1
+        self.rows = int(height // cell_size) + 1
+        self.clear()
+
+    def clear(self):
+        self.order = np.zeros(0, dtype=np.intp)
+        self.sorted_keys = np.zeros(0, dtype=np.int64)
+
+    def cell(self, x, y):
+        cx = min(max(int(x // self.cell_size), 0), self.cols - 1)
+        cy = min(max(int(y // self.cell_size), 0), self.rows - 1)
+        return cx, cy
+
+    def keys(self, xs, ys):
+        cx = np.clip(xs // self.cell_size, 0, self.cols - 1).astype(np.int64)
+        cy = np.clip(ys // self.cell_size, 0, self.rows - 1).astype(np.int64)
+        return cy * self.cols + cx
+
+    def compact(self, keep):
+        """Follow BallStore.cull(): drop removed balls and renumber the rest."""
+        new_index = np.cumsum(keep) - 1
+        # Filter keys and order with the same mask so they stay lined up
+        kept = keep[self.order]
+        self.order = new_index[self.order[kept]]
+        self.sorted_keys = self.sorted_keys[kept]
+
+    def update(self, xs, ys):
+        """Re-sort after balls moved; balls spawned since the last update go at the end."""
+        n = len(xs)
+        if n > len(self.order):
+            self.order = np.concatenate((self.order, np.arange(len(self.order), n)))
+        keys = self.keys(xs, ys)[self.order]
+        resort = np.argsort(keys, kind="stable")
+        self.order = self.order[resort]
+        self.sorted_keys = keys[resort]
+
+    def query(self, x, y, reach):
+        """Indices of the balls in every cell within `reach` of (x, y)."""
+        cx0, cy0 = self.cell(x - reach, y - reach)
+        cx1, cy1 = self.cell(x + reach, y + reach)
+        rows = np.arange(cy0, cy1 + 1) * self.cols
+        starts = np.searchsorted(self.sorted_keys, rows + cx0, "left")
+        ends = np.searchsorted(self.sorted_keys, rows + cx1, "right")
+        if len(starts) == 1:
+            return self.order[starts[0]:ends[0]]
+        return np.concatenate([self.order[a:b] for a, b in zip(starts.tolist(), ends.tolist())])
+
+
+class BallStore:
+    """All live balls as parallel NumPy columns (struct of arrays).
+
+    Balls are packed in [0, count); moving, culling and the player distance
+    test each run as a handful of array operations instead of a Python loop
+    over dicts. prev_x/prev_y hold the positions before the last move so the
+    renderer can interpolate between fixed steps. Collision queries go
+    through a SpatialHash, so they only look at balls near the target.
+    """
+
+    COLUMNS = ("x", "y", "prev_x", "prev_y", "vx", "vy", "radius")
+
+    def __init__(self, width, height, capacity=256):
+        self.count = 0
+        self.max_radius = 0
+        self.grid = SpatialHash(width, height)
+        self.indexed = True
+        for name in self.COLUMNS:
+            setattr(self, name, np.zeros(capacity))
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self):
+        return len(self.x)
+
+    def grow(self):
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            bigger = np.zeros(len(column) * 2)
+            bigger[:self.count] = column[:self.count]
+            setattr(self, name, bigger)
+
+    def spawn(self, x, y, vx, vy, radius):
+        if self.count == self.capacity:
+            self.grow()
+        i = self.count
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.radius[i] = radius
+        self.max_radius = max(self.max_radius, radius)
+        self.count += 1
+        self.indexed = False
+
+    def move(self, dt):
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+        self.indexed = False
+
+    def cull(self, width, height):
+        """Drop balls that have fully left the screen in the direction they travel."""
+        n = self.count
+        x, y, vx, vy, r = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n], self.radius[:n]
+        gone = (((vy > 0) & (y >= height + r)) | ((vy < 0) & (y <= -r))
+                | ((vx > 0) & (x >= width + r)) | ((vx < 0) & (x <= -r)))
+        if not gone.any():
+            return
+        keep = ~gone
+        kept = int(keep.sum())
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:kept] = column[:n][keep]
+        self.grid.compact(keep)
+        self.count = kept
+
+    def near(self, px, py, reach):
+        """Indices of the balls that might be within `reach` of (px, py)."""
+        if not self.indexed:
+            n = self.count
+            self.grid.update(self.x[:n], self.y[:n])
+            self.indexed = True
+        return self.grid.query(px, py, reach + self.max_radius)
+
+    def hits(self, px, py, player_radius):
+        """True if any ball overlaps the circle at (px, py)."""
+        if not self.count:
+            return False
+        nearby = self.near(px, py, player_radius)
+        dx = self.x[nearby] - px
+        dy = self.y[nearby] - py
+        reach = self.radius[nearby] + player_radius
+        return bool((dx * dx + dy * dy < reach * reach).any())
+
+    def interpolated(self, alpha):
+        """Draw positions `alpha` of the way from the previous step to the latest."""
+        n = self.count
+        xs = self.prev_x[:n] + (self.x[:n] - self.prev_x[:n]) * alpha
+        ys = self.prev_y[:n] + (self.y[:n] - self.prev_y[:n]) * alpha
+        return xs, ys
+
+    def clear(self):
+        self.count = 0
+        self.max_radius = 0
+        self.grid.clear()
+        self.indexed = True
@@ -1,13 +1,34 @@
+# /// script
+# dependencies = [
+#     "numpy",
+# ]
+# ///
 import pygame
 import random
 import asyncio
+import os
+import sys
+
+# Shared helpers live in games/shared (copied next to main.py for pygbag builds)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared.text import text_cache
+from shared.clock import Clock
+from shared.profiler import profiler
+from shared.loop import FixedStep
+from shared.runtime import runtime
+from shared.timers import TimerWheel
+from shared.sprites import CircleSprites
+
+# Game-local modules (balls.py) sit next to this file
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from balls import BallStore
 
 class GameWindow():
     def __init__(self):
-        pygame.init()
+        runtime.init()
         self.screen_width = 800
         self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        self.screen = runtime.display((self.screen_width, self.screen_height))
         pygame.display.set_caption("Dodge Ball")
 
         self.WHITE = (255, 255, 255)
@@ -20,23 +41,37 @@ class GameWindow():
         self.GOLD = (243, 175, 25)
         self.GREY2 = (100, 100, 100)
 
-        self.font = pygame.font.SysFont(None, 55)
+        self.font = runtime.font(None, 55)
         self.dt = 0
-
+        # Set by stress.py: collisions are still tested but never end the
+        # game or pick up bombs, so the ball count can keep climbing
+        self.stress = False
+        # Mode-switch countdown and bonus popup, advanced by the main loop
+        self.timers = TimerWheel()
+
+        # Every ball from every side lives in one array-backed store; the
+        # bomb uses one too so both checks go through the spatial hash
+        self.balls = BallStore(self.screen_width, self.screen_height)
+        self.bombs = BallStore(self.screen_width, self.screen_height, capacity=4)
+        # Ball and bomb circles for both modes' sizes, rendered once
+        self.sprites = CircleSprites()
+        self.sprites.prepare((20, 10), self.RED)
+        self.sprites.prepare((20, 10), self.BLACK)
         self.reset_game()
 
     def reset_game(self):
         self.player_pos = pygame.Vector2(self.screen_width / 2, self.screen_height / 2)
-        self.balls_top = []
-        self.balls_bottom = []
-        self.balls_left = []
-        self.balls_right = []
-        self.bomb = []
+        self.player_prev = self.player_pos.copy()
+        self.balls.clear()
+        self.bombs.clear()
         self.player_total_points = 0
         self.gamestate = True
         self.mode_switch = True
+        self.timers.clear()
         self.timer = ''
-        self.points = ''
+        self.countdown_left = 0
+        self.bonus = None
+        self.p = 0
         self.mode = 'easy'
         self.ball_size = 20
         self.player_ball_size = 20
@@ -63,174 +98,212 @@ class GameWindow():
         self.interval = 0.06
         self.point_multiplier = 0.5
 
-    async def countdown(self, t): 
-        while t: 
-            mins, secs = divmod(t, 60) 
-            self.timer = '{:01d}'.format(secs) 
-            await asyncio.sleep(1) 
-            t -= 1
+    def bullet_hell_mode(self):
+        # Spawn rate ramps up every step until thousands of balls are on screen
+        self.mode = 'bullet hell'
+        self.ball_size = 10
+        self.player_ball_size = 10
+        self.bomb_size = 10
+        self.player_speed = 300
+        self.interval = 0.1
+        self.interval_ramp = 0.5
+        self.max_interval = 12
+        self.point_multiplier = 2
+
+    def spawn_count(self):
+        """Balls one side spawns this step; above 1 the interval means several per step."""
+        whole = int(self.interval)
+        return whole + (random.random() < self.interval - whole)
+
+    def countdown(self, t):
+        """Lock mode switching for `t` seconds, showing the seconds left."""
+        self.countdown_left = t
+        self.timer = str(t)
+        self.timers.every(1, self.count_down)
+
+    def count_down(self):
+        self.countdown_left -= 1
+        if self.countdown_left:
+            self.timer = str(self.countdown_left)
+            return True
         self.timer = ''
-        self.mode_switch = True    
+        self.mode_switch = True
+        return False
 
-    async def bonus_points_thread(self, t):
-        while t:
-            mins, secs = divmod(t, 60) 
-            self.points = '{:01d}'.format(secs) 
-            await asyncio.sleep(1)
-            t -= 1
-        self.points = ''
+    def bonus_points(self, p):
+        """Add `p` points and show "+ p" for a second."""
+        self.p = p
+        self.player_total_points += p
+        if self.bonus:
+            self.bonus.cancel()
+        self.bonus = self.timers.after(1, self.hide_bonus)
+
+    def hide_bonus(self):
+        self.bonus = None
 
     def spawn_ball_top(self):
         x_pos = random.randint(0, self.screen_width)
         y_pos = 0
         speed = random.randint(100, 300)
-        self.balls_top.append({"pos": pygame.Vector2(x_pos, y_pos), "speed": speed})
+        self.balls.spawn(x_pos, y_pos, 0, speed, self.ball_size)
 
     def spawn_ball_bottom(self):
         x_pos = random.randint(0, self.screen_width)
         y_pos = self.screen_height
         speed = random.randint(100, 300)
-        self.balls_bottom.append({"pos": pygame.Vector2(x_pos, y_pos), "speed": speed})
+        self.balls.spawn(x_pos, y_pos, 0, -speed, self.ball_size)
 
     def spawn_ball_left(self):
         x_pos = 0
         y_pos = random.randint(0, self.screen_height)
         speed = random.randint(100, 300)
-        self.balls_left.append({"pos": pygame.Vector2(x_pos, y_pos), "speed": speed})
+        self.balls.spawn(x_pos, y_pos, speed, 0, self.ball_size)
         
     def spawn_ball_right(self):
         x_pos = self.screen_width
         y_pos = random.randint(0, self.screen_height)
         speed = random.randint(100, 300)
-        self.balls_right.append({"pos": pygame.Vector2(x_pos, y_pos), "speed": speed})
+        self.balls.spawn(x_pos, y_pos, -speed, 0, self.ball_size)
 
     def spawn_bomb(self):
-        self.bomb = []
+        self.bombs.clear()
         x_pos = random.randint(0, self.screen_width)
         y_pos = random.randint(0, self.screen_height)
         speed = 0
-        self.bomb.append({"pos": pygame.Vector2(x_pos, y_pos), "speed": speed})
+        self.bombs.spawn(x_pos, y_pos, 0, speed, self.bomb_size)
 
     def draw_text(self, text, x, y, color):
-        text_surface = self.font.render(text, True, color)
-        self.screen.blit(text_surface, (x, y))
+        text_cache.draw(self.screen, self.font, text, (x, y), color)
+
+    def update(self, dt):
+        """Advance the game by one fixed step of `dt` seconds."""
+        if not self.gamestate:
+            return
+        self.player_prev.update(self.player_pos)
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_w] or keys[pygame.K_UP]:
+            self.player_pos.y -= self.player_speed * dt
+        if keys[pygame.K_s] or keys[pygame.K_DOWN]:
+            self.player_pos.y += self.player_speed * dt
+        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
+            self.player_pos.x -= self.player_speed * dt
+        if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+            self.player_pos.x += self.player_speed * dt
+
+        self.player_pos.x = max(self.player_ball_size, min(self.player_pos.x, self.screen_width - self.player_ball_size))
+        self.player_pos.y = max(self.player_ball_size, min(self.player_pos.y, self.screen_height - self.player_ball_size))
+
+        if self.mode == 'bullet hell':
+            self.interval = min(self.max_interval, self.interval + self.interval_ramp * dt)
+
+        with profiler.span("spawn_balls"):
+            for _ in range(self.spawn_count()):
+                self.spawn_ball_top()
+            for _ in range(self.spawn_count()):
+                self.spawn_ball_bottom()
+            for _ in range(self.spawn_count()):
+                self.spawn_ball_left()
+            for _ in range(self.spawn_count()):
+                self.spawn_ball_right()
+        if random.random() < min(self.interval, 1) * 0.05:
+            self.spawn_bomb()
+
+        with profiler.span("move_balls"):
+            self.balls.move(dt)
+
+        self.bombs.move(dt)
+
+        with profiler.span("cull_balls"):
+            self.balls.cull(self.screen_width, self.screen_height)
+
+        with profiler.span("collide_balls"):
+            if self.balls.hits(self.player_pos.x, self.player_pos.y, self.player_ball_size) and not self.stress:
+                self.gamestate = False
+
+        if self.bombs.hits(self.player_pos.x, self.player_pos.y, self.player_ball_size) and not self.stress:
+            self.balls.clear()
+            self.bombs.clear()
+            self.bonus_points(500)
+
+        self.player_total_points += self.point_multiplier
+
+    def draw(self, alpha):
+        """Draw the game `alpha` of the way from the previous step to the latest one."""
+        pygame.draw.circle(self.screen, self.GOLD, self.player_prev.lerp(self.player_pos, alpha), self.player_ball_size)
+        text_cache.draw_number(self.screen, self.font, self.timer, (self.screen_width // 10, self.screen_height // 10), self.BLACK)
+
+        with profiler.span("draw_balls"):
+            self.draw_balls(self.balls, self.RED, alpha)
+
+        self.draw_balls(self.bombs, self.BLACK, alpha)
+
+        text_cache.draw_number(self.screen, self.font, int(self.player_total_points), (self.screen_width - 200, self.screen_height // 10), self.BLACK)
+
+        if self.bonus:
+            self.draw_text(f'+ {self.p}', self.screen_width - 200, self.screen_height // 6, self.PURPLE)
+
+    def draw_balls(self, store, color, alpha):
+        xs, ys = store.interpolated(alpha)
+        self.sprites.draw(self.screen, xs, ys, store.radius[:len(store)], color)
+
+    def launch_launcher(self):
+        runtime.launch_launcher()
 
     async def main(self):
         running = True
-        clock = pygame.time.Clock()
+        clock = Clock()
+        stepper = FixedStep()
 
         while running:
+            profiler.begin_frame()
+            profiler.phase("events")
             for event in pygame.event.get():
+                profiler.handle_event(event)
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
-                        pass
+                        self.launch_launcher()
                     if event.key == pygame.K_r:
                         print('Restarting...')
                         self.reset_game()
                     if self.mode_switch:
                         if event.key == pygame.K_q and self.mode == 'easy' and self.gamestate:
-                            self.p = 1000
-                            self.player_total_points += self.p
+                            self.bonus_points(1000)
                             self.hard_mode()
                             self.mode_switch = False
-                            t = 3
-                            asyncio.create_task(self.countdown(t))
-                            asyncio.create_task(self.bonus_points_thread(t))
-                        if event.key == pygame.K_e and self.mode == 'hard' and self.gamestate:
-                            self.p = 50
-                            self.player_total_points += self.p
+                            self.countdown(3)
+                        if event.key == pygame.K_b and self.mode == 'hard' and self.gamestate:
+                            self.bonus_points(5000)
+                            self.bullet_hell_mode()
+                            self.mode_switch = False
+                            self.countdown(3)
+                        if event.key == pygame.K_e and self.mode in ('hard', 'bullet hell') and self.gamestate:
+                            self.bonus_points(50)
                             self.easy_mode()
                             self.mode_switch = False
-                            t = 3
-                            asyncio.create_task(self.countdown(t))
-                            asyncio.create_task(self.bonus_points_thread(t))
+                            self.countdown(3)
 
-            self.screen.fill(self.GREY)
+            profiler.phase("update")
+            # Gameplay runs in fixed 1/60 s steps whatever the frame rate
+            stepper.run(self.dt, self.update)
+            self.timers.advance(self.dt)
 
+            profiler.phase("draw")
+            self.screen.fill(self.GREY)
             if self.gamestate:
-                pygame.draw.circle(self.screen, self.GOLD, self.player_pos, self.player_ball_size)
-                self.draw_text(self.timer, self.screen_width // 10, self.screen_height // 10, self.BLACK)
-
-                keys = pygame.key.get_pressed()
-                if keys[pygame.K_w] or keys[pygame.K_UP]:
-                    self.player_pos.y -= self.player_speed * self.dt
-                if keys[pygame.K_s] or keys[pygame.K_DOWN]:
-                    self.player_pos.y += self.player_speed * self.dt
-                if keys[pygame.K_a] or keys[pygame.K_LEFT]:
-                    self.player_pos.x -= self.player_speed * self.dt
-                if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-                    self.player_pos.x += self.player_speed * self.dt
-
-                self.player_pos.x = max(self.player_ball_size, min(self.player_pos.x, self.screen_width - self.player_ball_size))
-                self.player_pos.y = max(self.player_ball_size, min(self.player_pos.y, self.screen_height - self.player_ball_size))
-
-                if random.random() < self.interval:
-                    self.spawn_ball_top()
-                if random.random() < self.interval:
-                    self.spawn_ball_bottom()
-                if random.random() < self.interval:
-                    self.spawn_ball_left()                    
-                if random.random() < self.interval:
-                    self.spawn_ball_right()
-                if random.random() < self.interval * 0.05:
-                    self.spawn_bomb()
-
-                for ball in self.balls_top:
-                    ball["pos"].y += ball["speed"] * self.dt
-                    pygame.draw.circle(self.screen, self.RED, (int(ball["pos"].x), int(ball["pos"].y)), self.ball_size)
-                for ball in self.balls_bottom:
-                    ball["pos"].y -= ball["speed"] * self.dt
-                    pygame.draw.circle(self.screen, self.RED, (int(ball["pos"].x), int(ball["pos"].y)), self.ball_size)
-                for ball in self.balls_left:
-                    ball["pos"].x += ball["speed"] * self.dt
-                    pygame.draw.circle(self.screen, self.RED, (int(ball["pos"].x), int(ball["pos"].y)), self.ball_size)
-                for ball in self.balls_right:
-                    ball["pos"].x -= ball["speed"] * self.dt
-                    pygame.draw.circle(self.screen, self.RED, (int(ball["pos"].x), int(ball["pos"].y)), self.ball_size)
-
-                for bomb in self.bomb:
-                    bomb["pos"].y += bomb["speed"] * self.dt
-                    pygame.draw.circle(self.screen, self.BLACK, (int(bomb["pos"].x), int(bomb["pos"].y)), self.bomb_size)
-
-                self.draw_text(f'{int(self.player_total_points)}', self.screen_width - 200, self.screen_height // 10, self.BLACK)
-
-                if self.points == '3':
-                    self.draw_text(f'+ {self.p}', self.screen_width - 200, self.screen_height // 6, self.PURPLE)
-
-                self.balls_top = [b for b in self.balls_top if b["pos"].y < self.screen_height + self.ball_size]
-                self.balls_bottom = [b for b in self.balls_bottom if b["pos"].y > -self.ball_size]
-                self.balls_left = [b for b in self.balls_left if b["pos"].x < self.screen_width + self.ball_size]
-                self.balls_right = [b for b in self.balls_right if b["pos"].x > -self.ball_size]
-
-                for ball in self.balls_top + self.balls_bottom + self.balls_left + self.balls_right:
-                    if self.player_pos.distance_to(ball["pos"]) < self.player_ball_size + self.ball_size:
-                        self.gamestate = False
-                        break
-
-                for bomb in self.bomb:
-                    if self.player_pos.distance_to(bomb["pos"]) < self.player_ball_size + self.bomb_size:
-                        self.p = 500
-                        self.balls_top = []
-                        self.balls_bottom = []
-                        self.balls_left = []
-                        self.balls_right = []
-                        self.bomb = []
-                        self.player_total_points += self.p
-                        asyncio.create_task(self.bonus_points_thread(3))
-                        break
-
-                self.player_total_points += self.point_multiplier
-
+                self.draw(stepper.alpha)
             else:
                 self.draw_text(f'FINAL SCORE: {int(self.player_total_points)}', self.screen_width // 5, self.screen_height // 2, self.BLACK)
 
+            profiler.draw(self.screen)
+            profiler.phase("present")
             pygame.display.flip()
+            profiler.end_frame()
             self.dt = clock.tick(60) / 1000
             await asyncio.sleep(0)
 
-        pygame.quit()
+        runtime.quit()
 
 if __name__ == "__main__":
     game = GameWindow()
@@ -0,0 +1,123 @@
+"""Bullet-hell stress benchmark: frame time against live ball count.
+
+Runs Dodge Ball headless in bullet-hell mode with the player unable to die,
+so the spawn rate keeps ramping until thousands of balls are on screen. Every
+frame's time and per-stage profiler spans are bucketed by the number of live
+balls, which shows where the spawn/move/cull/collide/draw pipeline stops
+scaling.
+
+    python games/02_dodge_ball/stress.py                  # 40 simulated seconds
+    python games/02_dodge_ball/stress.py --seconds 60 --bucket 1000
+    python games/02_dodge_ball/stress.py --json after.json --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+GAMES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STAGES = ("spawn_balls", "move_balls", "cull_balls", "collide_balls", "draw_balls")
+
+
+def run(seconds, seed):
+    """Play bullet-hell mode for `seconds` of game time; returns one sample per frame."""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    sys.path.insert(0, GAMES_DIR)
+    import pygame
+    from bench import load_game
+    from shared.clock import settings
+    from shared.profiler import profiler
+
+    settings.uncapped = True
+    settings.virtual_ms = 0.0
+    _, game = load_game("02_dodge_ball", seed)
+    game.stress = True
+    game.bullet_hell_mode()
+
+    frames = int(seconds * 60)
+    samples = []
+
+    def on_tick():
+        # Called after end_frame(), so frame_totals still hold this frame
+        totals = profiler.frame_totals
+        sample = {"balls": len(game.balls), "frame": totals.get("frame", 0.0) * 1000}
+        for stage in STAGES:
+            sample[stage] = totals.get(stage, 0.0) * 1000
+        samples.append(sample)
+        if len(samples) >= frames:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    settings.on_tick = on_tick
+    try:
+        asyncio.run(game.main())
+    except SystemExit:
+        pass
+    return samples
+
+
+def bucket_samples(samples, size):
+    """{bucket start: summary} with mean/p95 frame time and mean stage times."""
+    from bench import percentile
+
+    buckets = {}
+    for sample in samples:
+        buckets.setdefault(sample["balls"] // size * size, []).append(sample)
+    rows = {}
+    for start, group in sorted(buckets.items()):
+        frame_times = sorted(sample["frame"] for sample in group)
+        row = {
+            "frames": len(group),
+            "mean_ms": sum(frame_times) / len(group),
+            "p95_ms": percentile(frame_times, 0.95),
+        }
+        for stage in STAGES:
+            row[stage] = sum(sample[stage] for sample in group) / len(group)
+        rows[start] = row
+    return rows
+
+
+def print_table(rows, size, baseline):
+    header = f"{'balls':<13}{'frames':>7}{'mean ms':>9}{'p95 ms':>9}"
+    header += "".join(f"{stage.split('_')[0]:>9}" for stage in STAGES)
+    print(header)
+    for start, row in rows.items():
+        line = (f"{f'{start}-{start + size - 1}':<13}{row['frames']:>7}"
+                f"{row['mean_ms']:>9.2f}{row['p95_ms']:>9.2f}")
+        line += "".join(f"{row[stage]:>9.3f}" for stage in STAGES)
+        old = baseline.get(str(start))
+        if old and old["mean_ms"]:
+            line += f"   {(row['mean_ms'] - old['mean_ms']) / old['mean_ms'] * 100:+.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=40, help="simulated seconds of bullet-hell play")
+    parser.add_argument("--bucket", type=int, default=500, help="live balls per table row")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", help="write the bucketed results to this file")
+    parser.add_argument("--compare", help="results file from an earlier run to diff mean frame time against")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["buckets"]
+    # The game runs from its own folder
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    samples = run(args.seconds, args.seed)
+    rows = bucket_samples(samples, args.bucket)
+    print_table(rows, args.bucket, baseline)
+    print(f"peak {max(sample['balls'] for sample in samples)} balls over {len(samples)} frames")
+
+    if json_path:
+        with open(json_path, "w") as file:
+            json.dump({"seed": args.seed, "seconds": args.seconds, "bucket": args.bucket,
+                       "buckets": {str(start): row for start, row in rows.items()}}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
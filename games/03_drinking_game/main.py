@@ -1,14 +1,23 @@
 import pygame
 import random
 import os
+import sys
 import asyncio
 
+# Shared helpers live in games/shared (copied next to main.py for pygbag builds)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared.assets import cache
+from shared.text import text_cache
+from shared.clock import Clock, sleep
+from shared.profiler import profiler
+from shared.runtime import runtime
+
 class GameWindow():
     def __init__(self):
-        pygame.init()
+        runtime.init()
         self.screen_width = 800
         self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        self.screen = runtime.display((self.screen_width, self.screen_height))
         pygame.display.set_caption("Drinking Game")
 
         # Colors
@@ -23,9 +32,10 @@ class GameWindow():
         self.GREY2 = (100, 100, 100)
         self.BROWN = (137, 81, 41)
 
-        self.font = pygame.font.SysFont(None, 55)
+        self.font = runtime.font(None, 55)
         self.dt = 0
-        self.beer_images = self.load_beer_images('images/beers')
+        self.beer_folder = os.path.join("images", "beers")
+        self.beer_images = self.load_beer_images(self.beer_folder)
         self.selected_beer_images = []
         self.selected_hat = None
         self.speed_max = 1400
@@ -42,8 +52,7 @@ class GameWindow():
         hat_images = [f for f in os.listdir("images/fishhats") if f.endswith(".png")]
         if hat_images:
             random_hat = random.choice(hat_images)
-            self.selected_hat = pygame.image.load(os.path.join("images/fishhats", random_hat))
-            self.selected_hat = pygame.transform.scale(self.selected_hat, (150, 150))
+            self.selected_hat = cache.load(os.path.join("images/fishhats", random_hat), (150, 150))
         self.sequence = []
         self.user_sequence = []
 
@@ -57,22 +66,24 @@ class GameWindow():
         for image in image_list:
             image_path = os.path.join(folder, f'{image}.png')
             if os.path.exists(image_path):
-                beer_images[image] = pygame.image.load(image_path)
+                beer_images[image] = cache.load(image_path)
             else:
                 print(f'Warning: Image not found for {image}')
         return beer_images
 
     def load_bg(self):
         try:
-            bg = pygame.image.load(os.path.join("images", "beers", "pub1.jpeg"))
-            bg = pygame.transform.scale(bg, (self.screen_width, self.screen_height))
-            man = pygame.image.load(os.path.join("images", "beers", "man.png"))
-            man = pygame.transform.scale(man, (self.screen_width, self.screen_height))
+            screen_size = (self.screen_width, self.screen_height)
+            bg = cache.load(os.path.join("images", "beers", "pub1.jpeg"), screen_size, alpha=False)
+            man = cache.load(os.path.join("images", "beers", "man.png"), screen_size)
             self.screen.blit(bg, (0, 0))
             self.screen.blit(man, (0, 0))
         except pygame.error as e:
             print(f"Error loading background image: {e}")
 
+    def beer_image_at_height(self, key, height):
+        return cache.load_scaled_height(os.path.join(self.beer_folder, f'{key}.png'), height)
+
     def select_unique_random_beer_images(self):
         return random.sample(list(self.beer_images.keys()), 7)
 
@@ -83,7 +94,7 @@ class GameWindow():
             hat_rect = self.selected_hat.get_rect(midtop=(self.screen_width // 2, 20))
             self.screen.blit(self.selected_hat, hat_rect)
         pygame.draw.rect(self.screen, self.BROWN, [0, self.screen_height // 1.25, self.screen_width, 300])
-        self.draw_text(str(int(self.player_total_points)), self.screen_width - 200, self.screen_height // 10, self.WHITE)
+        text_cache.draw_number(self.screen, self.font, int(self.player_total_points), (self.screen_width - 200, self.screen_height // 10), self.WHITE)
 
     async def generate_sequence(self):
         self.sequence.append(random.randint(0, 6))
@@ -94,12 +105,8 @@ class GameWindow():
         pygame.display.flip()
         for i in self.sequence:
             beer_key = self.selected_beer_images[i]
-            beer_image = self.beer_images.get(beer_key)
-            if beer_image:
-                new_height = 300
-                aspect = beer_image.get_width() / beer_image.get_height()
-                new_width = int(new_height * aspect)
-                beer_image = pygame.transform.scale(beer_image, (new_width, new_height))
+            if self.beer_images.get(beer_key):
+                beer_image = self.beer_image_at_height(beer_key, 300)
                 left_img = pygame.transform.rotate(beer_image, 245)
                 right_img = pygame.transform.rotate(beer_image, 115)
                 left_rect = left_img.get_rect(center=(250, 100))
@@ -109,15 +116,14 @@ class GameWindow():
                 self.background()
                 self.screen.blit(chosen_img, chosen_rect)
                 pygame.display.flip()
-                await asyncio.sleep(random.randint(500, self.speed_max) / 1000)
+                await sleep(random.randint(500, self.speed_max) / 1000)
                 self.background()
                 self.screen.blit(beer_image, table_rect)
                 pygame.display.flip()
-                await asyncio.sleep(random.randint(100, 500) / 1000)
+                await sleep(random.randint(100, 500) / 1000)
 
     def draw_text(self, text, x, y, color):
-        surface = self.font.render(text, True, color)
-        self.screen.blit(surface, (x, y))
+        text_cache.draw(self.screen, self.font, text, (x, y), color)
 
     def button_clicked(self, index):
         self.user_sequence.append(index)
@@ -135,12 +141,17 @@ class GameWindow():
             self.player_total_points -= 1
             self.gamestate = False
 
+    def launch_launcher(self):
+        runtime.launch_launcher()
+
     async def main(self):
-        clock = pygame.time.Clock()
+        clock = Clock()
         first_time = True
         running = True
 
         while running:
+            profiler.begin_frame()
+            profiler.phase("update")
             if first_time:
                 await self.generate_sequence()
                 first_time = False
@@ -149,16 +160,19 @@ class GameWindow():
                 await self.generate_sequence()
                 self.next_sequence_ready = False
 
+            profiler.phase("events")
             for event in pygame.event.get():
+                profiler.handle_event(event)
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
-                        pass
+                        self.launch_launcher()
                     elif event.key == pygame.K_r:
                         self.reset_game()
                         await self.generate_sequence()
 
+            profiler.phase("draw")
             self.background()
 
             if self.gamestate:
@@ -183,10 +197,8 @@ class GameWindow():
                     elif click[0] == 0:
                         self.mouse_held_down = False
 
-                    image = self.beer_images.get(key)
-                    if image:
-                        aspect = image.get_width() / image.get_height()
-                        resized = pygame.transform.scale(image, (int(300 * aspect), 300))
+                    if self.beer_images.get(key):
+                        resized = self.beer_image_at_height(key, 300)
                         rect = resized.get_rect(center=(self.first_beer_position_x + x_offset + 40, self.beer_position_y + 150))
                         self.screen.blit(resized, rect)
 
@@ -197,11 +209,14 @@ class GameWindow():
                 final_text = f'FINAL SCORE: {int(self.player_total_points)}'
                 self.draw_text(final_text, self.screen_width // 5, self.screen_height // 2, self.BLACK)
 
+            profiler.draw(self.screen)
+            profiler.phase("present")
             pygame.display.flip()
+            profiler.end_frame()
             self.dt = clock.tick(60) / 1000
             await asyncio.sleep(0)
 
-        pygame.quit()
+        runtime.quit()
 
 if __name__ == "__main__":
     game = GameWindow()
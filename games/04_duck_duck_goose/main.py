@@ -2,27 +2,40 @@ import math
 import pygame
 import random
 import os
+import sys
 import asyncio
 
+# Shared helpers live in games/shared (copied next to main.py for pygbag builds)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared.assets import cache
+from shared.text import text_cache
+from shared.clock import Clock, ticks
+from shared.profiler import profiler
+from shared.loop import FixedStep
+from shared.pool import Pool
+from shared.runtime import runtime
+
 class GameWindow():
     def __init__(self):
         random.seed()
-        pygame.init()
+        runtime.init()
         self.screen_width = 800
         self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        self.screen = runtime.display((self.screen_width, self.screen_height))
         pygame.display.set_caption("Duck Duck Goose")
         self.colors = {"WHITE": (255, 255, 255), "GREY": (178, 190, 181), "BLACK": (0, 0, 0), 
                        "RED": (210, 43, 43), "GREEN": (49, 146, 54), "BLUE": (76, 81, 247),
                        "PURPLE": (157, 77, 187), "GOLD": (243, 175, 25), "GREY2": (100, 100, 100)}
-        self.font = pygame.font.SysFont(None, 55)
+        self.font = runtime.font(None, 55)
         self.dt = 0
         self.bird_amount = 3
         self.bird_images = self.load_bird_images()
+        # Short-lived effects are recycled instead of allocated per click
+        self.shots = Pool(lambda: {"pos": pygame.Vector2(), "radius": 0, "max_radius": 0})
+        self.explosions = Pool(lambda: {"pos": pygame.Vector2(), "radius": 0, "max_radius": 0})
+        self.score_popups = Pool(lambda: {"pos": pygame.Vector2(), "text": "", "timer": 0})
         self.reset_game()
-        self.shots = []
         self.hitbox = False
-        self.score_popups = []
         self.kill_points = 0
 
     def load_bird_images(self):
@@ -35,7 +48,7 @@ class GameWindow():
         for bird in selected_birds:
             path = os.path.join("images", "birds", f"{bird}.png")
             try:
-                image = pygame.image.load(path)
+                image = cache.load(path)
                 images[bird] = image 
             except pygame.error as e:
                 print(f"Error loading {bird}.png: {e}")
@@ -44,11 +57,7 @@ class GameWindow():
 
     def load_bg_images(self, mouse_x, mouse_y):
         try:
-            gun = pygame.image.load(os.path.join("images", "background", "gun.png"))
-            new_height = 200
-            aspect_ratio = gun.get_width() / gun.get_height()
-            new_width = int(new_height * aspect_ratio)
-            gun = pygame.transform.scale(gun, (new_width, new_height))
+            gun = cache.load_scaled_height(os.path.join("images", "background", "gun.png"), 200)
             # Adjust the gun's position relative to the mouse
             image_rect = gun.get_rect(midbottom=(mouse_x, self.screen_height + mouse_y * 0.1))
             self.screen.blit(gun, image_rect)
@@ -57,8 +66,8 @@ class GameWindow():
             
     def load_bg(self):
         try:
-            bg = pygame.image.load(os.path.join("images", "background", "skywithtrees.jpg"))
-            bg = pygame.transform.scale(bg, (self.screen_width, self.screen_height))  # Ensure full-screen fit
+            bg = cache.load(os.path.join("images", "background", "skywithtrees.jpg"),
+                            (self.screen_width, self.screen_height), alpha=False)  # Ensure full-screen fit
             self.screen.blit(bg, (0, 0))  # Draw background at the top-left corner
         except pygame.error as e:
             print(f"Error loading background image: {e}")
@@ -93,7 +102,7 @@ class GameWindow():
 
     def reset_game(self):
         self.birds = []
-        self.explosions = []
+        self.explosions.clear()
         self.kill_points = 0
         self.player_total_points = 0
         self.gamestate = True
@@ -123,12 +132,16 @@ class GameWindow():
             aspect_ratio = original_image.get_height() / original_image.get_width()
             new_width = size
             new_height = int(new_width * aspect_ratio)
-            resized_image = pygame.transform.scale(original_image, (new_width, new_height))
+            path = os.path.join("images", "birds", f"{bird_type}.png")
+            resized_image = cache.load(path, (new_width, new_height))
+            # Flip once at spawn instead of every frame
+            resized_image = pygame.transform.flip(resized_image, direction == "right", False)
         else:
             resized_image = None
         
         self.birds.append({
             "pos": pygame.Vector2(x_pos, y_pos),
+            "prev": pygame.Vector2(x_pos, y_pos),
             "speed_x": speed_x,
             "wave_amplitude": wave_amplitude,
             "wave_frequency": wave_frequency,
@@ -146,8 +159,14 @@ class GameWindow():
             self.interval = self.interval * 1.1
             self.player_total_points += self.kill_points
             score_text = '+ ' + str(self.kill_points)
-            self.score_popups.append({"pos": pygame.Vector2(x, y), "text": score_text, "timer": 30})
-            self.explosions.append({"pos": bird["pos"].copy(), "radius": 5, "max_radius": 50})
+            popup = self.score_popups.spawn()
+            popup["pos"].update(x, y)
+            popup["text"] = score_text
+            popup["timer"] = 30
+            explosion = self.explosions.spawn()
+            explosion["pos"].update(bird["pos"])
+            explosion["radius"] = 5
+            explosion["max_radius"] = 50
             self.birds.remove(bird)
             self.current_target_index += 1  # Move to the next target in the sequence
 
@@ -158,13 +177,15 @@ class GameWindow():
             
     def gun_shots(self):
         x, y = pygame.mouse.get_pos()
-        self.shots.append({"pos": pygame.Vector2(x, y), "radius": 5, "max_radius": 20})
+        shot = self.shots.spawn()
+        shot["pos"].update(x, y)
+        shot["radius"] = 5
+        shot["max_radius"] = 20
         if self.player_total_points > 0:
             self.player_total_points -= 1  # Reward points for correct click
 
     def draw_text(self, text, x, y, color):
-        text_surface = self.font.render(text, True, color)
-        self.screen.blit(text_surface, (x, y))
+        text_cache.draw(self.screen, self.font, text, (x, y), color)
 
     def draw_sequence(self):
         """Display the target sequence at the top of the screen."""
@@ -191,22 +212,92 @@ class GameWindow():
         self.bird_images = self.load_bird_images()
         self.reset_game()
 
+    def update(self, dt):
+        """Advance birds and effects by one fixed step of `dt` seconds."""
+        if len(self.birds) == 0:
+            self.spawn_bird(random.choice(["left", "right"]))
+        if random.random() < self.interval:
+            self.spawn_bird("left")
+        if random.random() < self.interval:
+            self.spawn_bird("right")
+
+        with profiler.span("move_birds"):
+            for bird in self.birds:
+                bird["prev"].update(bird["pos"])
+                bird["pos"].x += bird["speed_x"] * dt
+                bird["pos"].y = bird["start_y"] + bird["wave_amplitude"] * math.sin(ticks() * 0.002 * bird["wave_frequency"] + bird["time_offset"])
+
+        self.birds = [b for b in self.birds if -50 <= b["pos"].x <= self.screen_width + 50]
+
+        self.shots.retain(self.grow_ring, 3)
+        self.explosions.retain(self.grow_ring, 5)
+        self.score_popups.retain(self.rise_popup)
+
+    def grow_ring(self, ring, amount):
+        """Grow a shot or explosion ring; False once it reached its full size."""
+        ring["radius"] += amount
+        return ring["radius"] < ring["max_radius"]
+
+    def rise_popup(self, popup):
+        popup["timer"] -= 1
+        popup["pos"].y -= 1  # Move the text upwards
+        return popup["timer"] > 0
+
+    def draw(self, alpha):
+        """Draw the game `alpha` of the way from the previous step to the latest one."""
+        self.load_bg()
+        with profiler.span("draw_birds"):
+            for bird in self.birds:
+                if bird["image"]:
+                    pos = bird["prev"].lerp(bird["pos"], alpha)
+                    self.screen.blit(bird["image"], (int(pos.x) - bird["size"] // 2, int(pos.y) - bird["size"] // 2))
+                    if self.hitbox == True:
+                        self.draw_hitbox(bird)
+
+        text_cache.draw_number(self.screen, self.font, int(self.player_total_points), (self.screen_width - 200, self.screen_height // 10), self.colors["WHITE"])
+        self.draw_sequence()  # Draw the sequence at the top
+
+        # Get mouse position
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+
+        # Draw crosshair at the mouse position
+        self.draw_crosshair(mouse_x, mouse_y)
+
+        for shot in self.shots:
+            pygame.draw.circle(self.screen, self.colors["GREY2"], (int(shot["pos"].x), int(shot["pos"].y)), shot["radius"], 3)
+
+        for explosion in self.explosions:
+            pygame.draw.circle(self.screen, self.colors["RED"], (int(explosion["pos"].x), int(explosion["pos"].y)), explosion["radius"], 3)
+
+        for popup in self.score_popups:
+            self.draw_text(popup["text"], int(popup["pos"].x), int(popup["pos"].y), self.colors["GOLD"])
+
+        # Load gun
+        self.load_bg_images(mouse_x, mouse_y)
+
+    def launch_launcher(self):
+        runtime.launch_launcher()
+
     async def main(self):
         running = True
-        clock = pygame.time.Clock()
+        clock = Clock()
+        stepper = FixedStep()
         time_elapsed = 0
         
         pygame.mouse.set_visible(False)
 
         while running:
+            profiler.begin_frame()
+            profiler.phase("events")
             for event in pygame.event.get():
+                profiler.handle_event(event)
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r:
                         self.reset_game()
                     if event.key == pygame.K_ESCAPE:
-                        pass
+                        self.launch_launcher()
                 elif event.type == pygame.MOUSEBUTTONDOWN and self.gamestate:
                     x, y = pygame.mouse.get_pos()
                     self.gun_shots()
@@ -235,70 +326,27 @@ class GameWindow():
                 if event.type == pygame.KEYDOWN and pygame.K_1 <= event.key <= pygame.K_9:
                     self.mode(event.key - pygame.K_1 + 1)                   
 
+            profiler.phase("update")
             if self.gamestate:
-                self.load_bg()
-                if len(self.birds) == 0:
-                    self.spawn_bird(random.choice(["left", "right"]))
-                if random.random() < self.interval:
-                    self.spawn_bird("left")
-                if random.random() < self.interval:
-                    self.spawn_bird("right")
-
+                # Birds and effects move in fixed 1/60 s steps whatever the frame rate
+                stepper.run(self.dt, self.update)
                 time_elapsed += self.dt
-                for bird in self.birds:
-                    bird["pos"].x += bird["speed_x"] * self.dt
-                    bird["pos"].y = bird["start_y"] + bird["wave_amplitude"] * math.sin(pygame.time.get_ticks() * 0.002 * bird["wave_frequency"] + bird["time_offset"])
-                    
-                    if bird["image"]:
-                        image = pygame.transform.flip(bird["image"], bird["direction"] == "right", False)
-                        self.screen.blit(image, (int(bird["pos"].x) - bird["size"] // 2, int(bird["pos"].y) - bird["size"] // 2))
-                        if self.hitbox == True:
-                            self.draw_hitbox(bird)
-                
-                self.birds = [b for b in self.birds if -50 <= b["pos"].x <= self.screen_width + 50]
-            
-                self.draw_text(f'{int(self.player_total_points)}', self.screen_width - 200, self.screen_height // 10, self.colors["WHITE"])
-                self.draw_sequence()  # Draw the sequence at the top
-
-                # Get mouse position
-                mouse_x, mouse_y = pygame.mouse.get_pos()
-
-                # Draw crosshair at the mouse position
-                self.draw_crosshair(mouse_x, mouse_y)
-
-                for shot in self.shots[:]:
-                    shot["radius"] += 3
-                    if shot["radius"] >= shot["max_radius"]:
-                        self.shots.remove(shot)
-                    else:
-                        pygame.draw.circle(self.screen, self.colors["GREY2"], (int(shot["pos"].x), int(shot["pos"].y)), shot["radius"], 3)
-
-                for explosion in self.explosions[:]:
-                    explosion["radius"] += 5
-                    if explosion["radius"] >= explosion["max_radius"]:
-                        self.explosions.remove(explosion)
-                    else:
-                        pygame.draw.circle(self.screen, self.colors["RED"], (int(explosion["pos"].x), int(explosion["pos"].y)), explosion["radius"], 3)
-
-                for popup in self.score_popups[:]:
-                    self.draw_text(popup["text"], int(popup["pos"].x), int(popup["pos"].y), self.colors["GOLD"])
-                    popup["timer"] -= 1
-                    popup["pos"].y -= 1  # Move the text upwards
-                    if popup["timer"] <= 0:
-                        self.score_popups.remove(popup)
-
-                # Load gun
-                self.load_bg_images(mouse_x, mouse_y)
 
+            profiler.phase("draw")
+            if self.gamestate:
+                self.draw(stepper.alpha)
             else:
                 self.screen.fill(self.colors["GREY"])
                 self.draw_text(f"FINAL SCORE: {self.player_total_points}", self.screen_width // 5, self.screen_height // 2, self.colors["BLACK"])
 
+            profiler.draw(self.screen)
+            profiler.phase("present")
             pygame.display.flip()
+            profiler.end_frame()
             self.dt = clock.tick(60) / 1000
             await asyncio.sleep(0)
         
-        pygame.quit()
+        runtime.quit()
 
 if __name__ == "__main__":
     game = GameWindow()
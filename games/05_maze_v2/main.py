@@ -1,25 +1,40 @@
 import pygame
 import random
 import os
+import sys
 import asyncio
 
+# Shared helpers live in games/shared (copied next to main.py for pygbag builds)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared.assets import cache
+from shared.text import text_cache
+from shared.clock import Clock, ticks
+from shared.profiler import profiler
+from shared.runtime import runtime
+
+# Game-local modules (maze.py) sit next to this file
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from maze import generate, TOP, RIGHT, BOTTOM, LEFT
+
 class GameWindow():
     def __init__(self):
         random.seed()
-        pygame.init()
+        runtime.init()
         self.screen_width = 800
         self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        self.screen = runtime.display((self.screen_width, self.screen_height))
         pygame.display.set_caption("Maze")
         self.colors = {"WHITE": (255, 255, 255), "GREY": (178, 190, 181), "BLACK": (0, 0, 0), 
                        "RED": (210, 43, 43), "GREEN": (49, 146, 54), "BLUE": (76, 81, 247),
                        "PURPLE": (157, 77, 187), "GOLD": (243, 175, 25), "GREY2": (100, 100, 100),
                        "GREY3": (195, 195, 195)}
-        self.font = pygame.font.SysFont(None, 55)
+        self.font = runtime.font(None, 55)
         self.dt = 0
         self.player_total_points = 0
         self.gamestate = True
         self.maze_size = 3
+        # Any key of maze.GENERATORS: "backtracker", "wilson" or "kruskal"
+        self.maze_algorithm = "backtracker"
         self.maze_setup()
 
         self.total_position = 0
@@ -86,12 +101,8 @@ class GameWindow():
         self.width, self.height = self.maze_size, self.maze_size  # Maze size (6x6)
         self.cell_size = 60  # Each cell (room) will be 60x60 pixels
         self.base_maze = self.create_maze(self.width, self.height)
-        self.mazes = [
-            self.base_maze,
-            self.rotate_maze(self.base_maze),
-            self.rotate_maze(self.rotate_maze(self.base_maze)),
-            self.rotate_maze(self.rotate_maze(self.rotate_maze(self.base_maze)))
-        ]
+        # The four orientations read the one maze through rotated coordinates
+        self.mazes = [self.base_maze.view(turns) for turns in range(4)]
 
         # Define a single start position
         start_x, start_y = random.randint(0, self.width - 1), self.height - 1
@@ -134,82 +145,37 @@ class GameWindow():
         self.ladder_positions = list(self.ladder_s)
         self.player_positions = list(self.start_positions)
 
-    def rotate_maze(self, maze):
-        """Rotate the maze 90 degrees clockwise."""
-        width, height = len(maze[0]), len(maze)
-        rotated_maze = [[None for _ in range(width)] for _ in range(height)]
-        
-        for y in range(height):
-            for x in range(width):
-                room = maze[y][x]
-                rotated_maze[x][height - 1 - y] = {
-                    'top': room['left'],
-                    'bottom': room['right'],
-                    'left': room['bottom'],
-                    'right': room['top'],
-                    'visited': room['visited']
-                }
-        
-        return rotated_maze
-
     def create_maze(self, width, height):
-        # Maze grid initialized with all walls present
-        maze = [[{'top': True, 'bottom': True, 'left': True, 'right': True, 'visited': False}
-                 for _ in range(width)] for _ in range(height)]
-
-        def get_neighbors(x, y):
-            """Returns a list of unvisited neighbors with their directions."""
-            neighbors = []
-            directions = [(0, -1, 'top', 'bottom'), (0, 1, 'bottom', 'top'),
-                          (-1, 0, 'left', 'right'), (1, 0, 'right', 'left')]
-
-            for dx, dy, wall, opposite in directions:
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < width and 0 <= ny < height and not maze[ny][nx]['visited']:
-                    neighbors.append((nx, ny, wall, opposite))
-
-            return neighbors
-
-        def carve_maze(x, y):
-            """Recursive function to generate the maze."""
-            maze[y][x]['visited'] = True
-            neighbors = get_neighbors(x, y)
-            random.shuffle(neighbors)
-
-            for nx, ny, wall, opposite in neighbors:
-                if not maze[ny][nx]['visited']:
-                    maze[y][x][wall] = False  # Remove wall from current room
-                    maze[ny][nx][opposite] = False  # Remove opposite wall from next room
-                    carve_maze(nx, ny)
-
-        # Start maze generation from a random position
-        start_x, start_y = random.randint(0, width - 1), random.randint(0, height - 1)
-        carve_maze(start_x, start_y)
-
-        return maze
+        # Iterative generators, so growing mazes never hit the recursion limit
+        return generate(width, height, self.maze_algorithm)
 
     def draw_maze(self, maze):
         """Render the maze on the Pygame screen."""
-        for y in range(self.height):
-            for x in range(self.width):
-                room = maze[y][x]
+        for y in range(maze.height):
+            for x in range(maze.width):
+                walls = maze.mask(x, y)
                 room_x = x * self.cell_size
                 room_y = y * self.cell_size
 
                 # Draw walls
-                if room['top']:
+                if walls & TOP:
                     pygame.draw.line(self.screen, self.colors['BLACK'], (room_x, room_y), 
                                      (room_x + self.cell_size, room_y), 2)
-                if room['bottom']:
+                if walls & BOTTOM:
                     pygame.draw.line(self.screen, self.colors['BLACK'], (room_x, room_y + self.cell_size), 
                                      (room_x + self.cell_size, room_y + self.cell_size), 2)
-                if room['left']:
+                if walls & LEFT:
                     pygame.draw.line(self.screen, self.colors['BLACK'], (room_x, room_y), 
                                      (room_x, room_y + self.cell_size), 2)
-                if room['right']:
+                if walls & RIGHT:
                     pygame.draw.line(self.screen, self.colors['BLACK'], (room_x + self.cell_size, room_y), 
                                      (room_x + self.cell_size, room_y + self.cell_size), 2)
 
+    def room_walls(self):
+        """Wall mask of the player's room in the current orientation."""
+        x, y = self.player_positions[self.current_maze_index]
+        return self.mazes[self.current_maze_index].mask(x, y)
+
     def draw_player(self, player_pos):
         """Draw the player as a red circle."""
         player_x_pos = player_pos[0] * self.cell_size + self.cell_size // 2
@@ -254,8 +220,7 @@ class GameWindow():
         self.maze_setup()
     
     def draw_text(self, text, x, y, color):
-        text_surface = self.font.render(text, True, color)
-        self.screen.blit(text_surface, (x, y))
+        text_cache.draw(self.screen, self.font, text, (x, y), color)
     
     def tint_surface(self, surface, tint_color):
         # Apply a red tint to a surface
@@ -299,10 +264,8 @@ class GameWindow():
         for wall in all_images:
             path = os.path.join("images", "doors", f"{wall}.png")
             try:
-                image = pygame.image.load(path)
                 size = custom_sizes.get(wall, default_size)
-                image = pygame.transform.scale(image, size)
-                images[wall] = image
+                images[wall] = cache.load(path, size)
             except pygame.error as e:
                 print(f"Error loading {wall}.png: {e}")
                 images[wall] = None
@@ -462,7 +425,7 @@ class GameWindow():
             print("you found a note")
         elif straight_area[0] <= mouse_pos[0] < straight_area[1] \
         and straight_area[2] <= mouse_pos[1] < straight_area[3] \
-        and not self.mazes[self.current_maze_index][self.player_positions[self.current_maze_index][1]][self.player_positions[self.current_maze_index][0]]['top']:
+        and not self.room_walls() & TOP:
             self.total_position += 0  
             # Move straight
             if self.current_maze_index == 0:
@@ -485,7 +448,7 @@ class GameWindow():
                     (self.player_positions[0][0] - 1, self.player_positions[0][1]), (self.player_positions[1][0], self.player_positions[1][1] - 1), 
                     (self.player_positions[2][0] + 1, self.player_positions[2][1]), (self.player_positions[3][0], self.player_positions[3][1] + 1)]
 
-        elif backwards_area[0] <= mouse_pos[1] < backwards_area[1] and not self.mazes[self.current_maze_index][self.player_positions[self.current_maze_index][1]][self.player_positions[self.current_maze_index][0]]['bottom']:
+        elif backwards_area[0] <= mouse_pos[1] < backwards_area[1] and not self.room_walls() & BOTTOM:
             self.total_position += 2  # Move backwards
             if self.current_maze_index == 0:
                 self.player_positions = [
@@ -508,7 +471,7 @@ class GameWindow():
                     (self.player_positions[2][0] + 1, self.player_positions[2][1]),(self.player_positions[3][0], self.player_positions[3][1] + 1)
                     ]
 
-        elif left_area[0] <= mouse_pos[0] < left_area[1] and not self.mazes[self.current_maze_index][self.player_positions[self.current_maze_index][1]][self.player_positions[self.current_maze_index][0]]['left']:
+        elif left_area[0] <= mouse_pos[0] < left_area[1] and not self.room_walls() & LEFT:
             self.total_position -= 1  # Move right
             # straight
             if self.current_maze_index == 0:
@@ -535,7 +498,7 @@ class GameWindow():
                     (self.player_positions[2][0], self.player_positions[2][1] - 1),(self.player_positions[3][0] + 1, self.player_positions[3][1])
                     ]
             
-        elif right_area[0] <= mouse_pos[0] < right_area[1] and not self.mazes[self.current_maze_index][self.player_positions[self.current_maze_index][1]][self.player_positions[self.current_maze_index][0]]['right']:
+        elif right_area[0] <= mouse_pos[0] < right_area[1] and not self.room_walls() & RIGHT:
             self.total_position += 1  # Move left
             # straight
             if self.current_maze_index == 0:
@@ -566,7 +529,7 @@ class GameWindow():
     def handle_key_movement(self, event_key):
         self.note = False
         self.falses()
-        if event_key == pygame.K_UP and not self.mazes[self.current_maze_index][self.player_positions[self.current_maze_index][1]][self.player_positions[self.current_maze_index][0]]['top']:
+        if event_key == pygame.K_UP and not self.room_walls() & TOP:
             self.total_position += 0
             if self.current_maze_index == 0:
                 self.player_positions = [
@@ -591,7 +554,7 @@ class GameWindow():
                     (self.player_positions[2][0] + 1, self.player_positions[2][1]),(self.player_positions[3][0], self.player_positions[3][1] + 1)
                     ]
                                         
-        elif event_key == pygame.K_DOWN and not self.mazes[self.current_maze_index][self.player_positions[self.current_maze_index][1]][self.player_positions[self.current_maze_index][0]]['bottom']:
+        elif event_key == pygame.K_DOWN and not self.room_walls() & BOTTOM:
             self.total_position += 2
             if self.current_maze_index == 0:
                 self.player_positions = [
@@ -614,7 +577,7 @@ class GameWindow():
                     (self.player_positions[2][0] + 1, self.player_positions[2][1]),(self.player_positions[3][0], self.player_positions[3][1] + 1)
                     ]
                                         
-        elif event_key == pygame.K_LEFT and not self.mazes[self.current_maze_index][self.player_positions[self.current_maze_index][1]][self.player_positions[self.current_maze_index][0]]['left']:
+        elif event_key == pygame.K_LEFT and not self.room_walls() & LEFT:
             self.total_position -= 1
             # straight
             if self.current_maze_index == 0:
@@ -641,7 +604,7 @@ class GameWindow():
                     (self.player_positions[2][0], self.player_positions[2][1] - 1),(self.player_positions[3][0] + 1, self.player_positions[3][1])
                     ]
             
-        elif event_key == pygame.K_RIGHT and not self.mazes[self.current_maze_index][self.player_positions[self.current_maze_index][1]][self.player_positions[self.current_maze_index][0]]['right']:
+        elif event_key == pygame.K_RIGHT and not self.room_walls() & RIGHT:
             self.total_position += 1
             # straight
             if self.current_maze_index == 0:
@@ -685,14 +648,20 @@ class GameWindow():
             self.current_note = ""
         self.showing_note = True
                 
+    def launch_launcher(self):
+        runtime.launch_launcher()
+
     async def main(self):
         running = True
-        clock = pygame.time.Clock()
+        clock = Clock()
         time_elapsed = 0
 
         while running:
+            profiler.begin_frame()
+            profiler.phase("events")
             self.screen.fill(self.colors["GREY"])
             for event in pygame.event.get():
+                profiler.handle_event(event)
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
@@ -713,6 +682,7 @@ class GameWindow():
                         mouse_pos = event.pos
                         self.handle_click(mouse_pos)
 
+            profiler.phase("update")
             if self.gamestate:
                 time_elapsed += self.dt
 
@@ -727,13 +697,14 @@ class GameWindow():
                     self.current_maze_index = 3
 
                 # Determine walls
-                if self.mazes[self.current_maze_index][self.player_positions[self.current_maze_index][1]][self.player_positions[self.current_maze_index][0]]['top']:
+                walls = self.room_walls()
+                if walls & TOP:
                     self.top_wall = True
-                if self.mazes[self.current_maze_index][self.player_positions[self.current_maze_index][1]][self.player_positions[self.current_maze_index][0]]['bottom']:
+                if walls & BOTTOM:
                     self.bottom_wall = True
-                if self.mazes[self.current_maze_index][self.player_positions[self.current_maze_index][1]][self.player_positions[self.current_maze_index][0]]['right']:
+                if walls & RIGHT:
                     self.left_wall = True
-                if self.mazes[self.current_maze_index][self.player_positions[self.current_maze_index][1]][self.player_positions[self.current_maze_index][0]]['left']:
+                if walls & LEFT:
                     self.right_wall = True
 
                 # Check if the player is at the start
@@ -812,12 +783,14 @@ class GameWindow():
                     self.start_fade_out()
                     self.gamestate = False
 
-                self.draw_wall_images()
-                
+                profiler.phase("draw")
+                with profiler.span("draw_wall_images"):
+                    self.draw_wall_images()
+
                 if self.showing_note:
                     pygame.draw.rect(self.screen, self.colors["GREY3"], (30, 100, 750, 450))
                     self.draw_text(self.current_note, 80, 300, self.colors["BLACK"])
-                    if pygame.time.get_ticks() - self.note_start_time > 5000:
+                    if ticks() - self.note_start_time > 5000:
                         self.showing_note = False
 
                 if self.fading:
@@ -835,8 +808,9 @@ class GameWindow():
                     self.draw_text('press SPACE to continue...', self.screen_width - 650, self.screen_height - 50, self.colors["GREY2"])
 
                 if self.minimap == True:
-                    self.draw_maze(self.mazes[self.current_maze_index])
-                    self.draw_player(self.player_positions[self.current_maze_index])
+                    with profiler.span("draw_maze"):
+                        self.draw_maze(self.mazes[self.current_maze_index])
+                        self.draw_player(self.player_positions[self.current_maze_index])
                 
                 # self.player_points = f'{int(self.player_total_points)}'
                 # self.draw_text(self.player_points, self.screen_width - 200, self.screen_height // 10, self.colors["BLACK"])
@@ -845,11 +819,14 @@ class GameWindow():
                 self.screen.fill(self.colors["GREY"])
                 self.draw_text(f"FINAL SCORE: {self.player_total_points}", self.screen_width // 5, self.screen_height // 2, self.colors["BLACK"])
 
+            profiler.draw(self.screen)
+            profiler.phase("present")
             pygame.display.flip()
+            profiler.end_frame()
             self.dt = clock.tick(60) / 1000
             await asyncio.sleep(0)
         
-        pygame.quit()
+        runtime.quit()
 
 if __name__ == "__main__":
     game = GameWindow()
@@ -0,0 +1,246 @@
+"""Mazes as packed wall masks, rotated views of them, and their generators.
+
+Every room's walls are one 4-bit mask in a bytearray, row-major. The bits
+go clockwise from the top, so turning a room a quarter turn clockwise is
+a 1-bit rotation of its mask. The game's four orientations are MazeViews
+that map coordinates and rotate masks on lookup instead of copying the
+grid, so a maze costs one byte per room however it is looked at.
+
+The generators are iterative and pluggable through GENERATORS; all of them
+carve a perfect maze (exactly one path between any two rooms).
+"""
+import random
+
+TOP, RIGHT, BOTTOM, LEFT = 1, 2, 4, 8
+ALL_WALLS = TOP | RIGHT | BOTTOM | LEFT
+
+# ROTATED[turns][mask]: the mask after `turns` quarter turns clockwise
+ROTATED = [bytes(((mask << turns) | (mask >> (4 - turns))) & ALL_WALLS for mask in range(16))
+           for turns in range(4)]
+
+
+class Maze:
+    """A width x height grid of rooms, every wall standing until carved."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.walls = bytearray([ALL_WALLS]) * (width * height)
+
+    def mask(self, x, y):
+        return self.walls[y * self.width + x]
+
+    def view(self, turns):
+        return MazeView(self, turns)
+
+
+class MazeView:
+    """The maze turned `turns` quarter turns clockwise, read through the original grid.
+
+    Room (x, y) of the view is the room GameWindow.generate_orientations()
+    maps to (x, y) for the same orientation.
+    """
+
+    def __init__(self, maze, turns):
+        self.maze = maze
+        self.turns = turns % 4
+        self.rotated = ROTATED[self.turns]
+        if self.turns % 2:
+            self.width, self.height = maze.height, maze.width
+        else:
+            self.width, self.height = maze.width, maze.height
+
+    def source(self, x, y):
+        """The room of the underlying maze shown at (x, y)."""
+        if self.turns == 0:
+            return x, y
+        if self.turns == 1:
+            return y, self.maze.height - 1 - x
+        if self.turns == 2:
+            return self.maze.width - 1 - x, self.maze.height - 1 - y
+        return self.maze.width - 1 - y, x
+
+    def mask(self, x, y):
+        return self.rotated[self.maze.mask(*self.source(x, y))]
+
+
+def open_grid(width, height):
+    """1 for every room of a grid with a one-room border of 0s around it.
+
+    Generators work on room indexes into this (width + 2)-wide grid, so a
+    neighbour is one addition away and the border stops them without a
+    bounds check.
+    """
+    stride = width + 2
+    rooms = bytearray(stride * (height + 2))
+    for y in range(1, height + 1):
+        rooms[y * stride + 1:y * stride + 1 + width] = b"\x01" * width
+    return rooms
+
+
+def unpad(maze, walls):
+    """Copy the rooms of a bordered wall grid into `maze`."""
+    stride = maze.width + 2
+    maze.walls = bytearray().join(walls[y * stride + 1:y * stride + 1 + maze.width]
+                                  for y in range(1, maze.height + 1))
+    return maze
+
+
+def moves(stride):
+    """(index step, wall, matching wall of the room behind it), clockwise from the top."""
+    return ((-stride, TOP, BOTTOM), (1, RIGHT, LEFT), (stride, BOTTOM, TOP), (-1, LEFT, RIGHT))
+
+
+def backtracker(width, height, rng=random):
+    """Depth-first search with an explicit stack: long, winding corridors.
+
+    The unvisited neighbours of a room make a 4-bit mask; `pick` maps that
+    mask and a random number below 12 (divisible by 1, 2, 3 and 4) straight
+    to an evenly chosen move, so the loop builds no lists.
+    """
+    stride = width + 2
+    unvisited = open_grid(width, height)
+    walls = bytearray([ALL_WALLS]) * len(unvisited)
+    steps = moves(stride)
+    pick = []
+    for free in range(16):
+        options = [steps[side] for side in range(4) if free >> side & 1]
+        pick.extend(options[r % len(options)] if options else None for r in range(12))
+    up = -stride
+    chance = rng.random
+    cell = (rng.randrange(height) + 1) * stride + rng.randrange(width) + 1
+    unvisited[cell] = 0
+    stack = [cell]
+    push = stack.append
+    pop = stack.pop
+    while True:
+        free = (unvisited[cell + up] | unvisited[cell + 1] << 1
+                | unvisited[cell + stride] << 2 | unvisited[cell - 1] << 3)
+        if not free:
+            pop()
+            if not stack:
+                break
+            cell = stack[-1]
+            continue
+        step, wall, opposite = pick[free * 12 + int(chance() * 12)]
+        walls[cell] ^= wall
+        cell += step
+        walls[cell] ^= opposite
+        unvisited[cell] = 0
+        push(cell)
+    return unpad(Maze(width, height), walls)
+
+
+def wilson(width, height, rng=random):
+    """Wilson's algorithm: loop-erased random walks, a uniformly random maze.
+
+    Each walk starts from a room not yet in the maze and remembers only the
+    last way it left every room, which erases its loops for free; once it
+    reaches the maze it is carved along those remembered exits.
+    """
+    stride = width + 2
+    inside = open_grid(width, height)
+    unvisited = bytearray(inside)
+    walls = bytearray([ALL_WALLS]) * len(inside)
+    steps = moves(stride)
+    offsets = [step for step, _, _ in steps]
+    exits = bytearray(len(inside))
+    direction = rng.getrandbits
+    rooms = [(y + 1) * stride + x + 1 for y in range(height) for x in range(width)]
+    unvisited[rooms[rng.randrange(len(rooms))]] = 0
+    for start in rooms:
+        if not unvisited[start]:
+            continue
+        cell = start
+        while unvisited[cell]:
+            way = direction(2)
+            following = cell + offsets[way]
+            if inside[following]:
+                exits[cell] = way
+                cell = following
+        cell = start
+        while unvisited[cell]:
+            step, wall, opposite = steps[exits[cell]]
+            unvisited[cell] = 0
+            walls[cell] ^= wall
+            cell += step
+            walls[cell] ^= opposite
+    return unpad(Maze(width, height), walls)
+
+
+def kruskal(width, height, rng=random):
+    """Randomized Kruskal: knock down walls in random order unless that makes a loop.
+
+    Rooms are joined in a union-find forest with path halving. Walls are
+    numbered 2 * room for a room's right wall and 2 * room + 1 for its
+    bottom one, so the shuffled list is plain ints.
+    """
+    stride = width + 2
+    size = stride * (height + 2)
+    parent = list(range(size))
+    walls = bytearray([ALL_WALLS]) * size
+    edges = []
+    for y in range(1, height + 1):
+        row = y * stride
+        edges.extend(range(2 * (row + 1), 2 * (row + width - 1) + 1, 2))
+        if y < height:
+            edges.extend(range(2 * (row + 1) + 1, 2 * (row + width) + 2, 2))
+    rng.shuffle(edges)
+    joins = width * height - 1
+    for edge in edges:
+        room = edge >> 1
+        other = room + stride if edge & 1 else room + 1
+        a = room
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        b = other
+        while parent[b] != b:
+            parent[b] = parent[parent[b]]
+            b = parent[b]
+        if a == b:
+            continue
+        parent[a] = b
+        if edge & 1:
+            walls[room] ^= BOTTOM
+            walls[other] ^= TOP
+        else:
+            walls[room] ^= RIGHT
+            walls[other] ^= LEFT
+        joins -= 1
+        if not joins:
+            break
+    return unpad(Maze(width, height), walls)
+
+
+GENERATORS = {
+    "backtracker": backtracker,
+    "wilson": wilson,
+    "kruskal": kruskal,
+}
+
+
+def generate(width, height, algorithm="backtracker", rng=random):
+    """A new perfect maze from GENERATORS[algorithm], drawing from `rng`."""
+    return GENERATORS[algorithm](width, height, rng)
+
+
+def is_perfect(maze):
+    """True if every room is reachable and there are no loops (a spanning tree)."""
+    width, height = maze.width, maze.height
+    passages = sum(bin(mask ^ ALL_WALLS).count("1") for mask in maze.walls) // 2
+    if passages != width * height - 1:
+        return False
+    seen = bytearray(width * height)
+    seen[0] = 1
+    stack = [0]
+    while stack:
+        room = stack.pop()
+        mask = maze.walls[room]
+        x = room % width
+        for wall, step, inside in ((TOP, -width, room >= width), (BOTTOM, width, room < (height - 1) * width),
+                                   (LEFT, -1, x > 0), (RIGHT, 1, x < width - 1)):
+            if not mask & wall and inside and not seen[room + step]:
+                seen[room + step] = 1
+                stack.append(room + step)
+    return all(seen)
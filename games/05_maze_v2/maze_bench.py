@@ -0,0 +1,60 @@
+"""Maze generation speed by algorithm and size.
+
+Times every generator in maze.GENERATORS on square mazes of each size
+(best of --repeat runs, seeded) and checks that each result is a perfect
+maze: every room reachable, no loops.
+
+    python games/05_maze_v2/maze_bench.py
+    python games/05_maze_v2/maze_bench.py --sizes 100 1000 --algorithms backtracker kruskal
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from maze import GENERATORS, generate, is_perfect
+
+
+def best_time(algorithm, size, seed, repeat):
+    best = None
+    for run in range(repeat):
+        rng = random.Random(seed + run)
+        start = time.perf_counter()
+        maze = generate(size, size, algorithm, rng)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, maze
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 30, 100, 300, 1000])
+    parser.add_argument("--algorithms", nargs="+", choices=list(GENERATORS), default=list(GENERATORS))
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    parser.add_argument("--no-check", action="store_true", help="skip the perfect-maze check")
+    parser.add_argument("--json", help="write the rows to this file")
+    args = parser.parse_args()
+
+    rows = []
+    print(f"{'size':>6}  {'algorithm':<13}{'ms':>10}{'rooms/ms':>10}  perfect")
+    for size in args.sizes:
+        for algorithm in args.algorithms:
+            ms, maze = best_time(algorithm, size, args.seed, args.repeat)
+            row = {"size": size, "algorithm": algorithm, "ms": ms}
+            if not args.no_check:
+                row["perfect"] = is_perfect(maze)
+            rows.append(row)
+            perfect = "-" if args.no_check else ("yes" if row["perfect"] else "NO")
+            print(f"{size:>6}  {algorithm:<13}{ms:>10.1f}{size * size / ms:>10.0f}  {perfect}", flush=True)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"seed": args.seed, "rows": rows}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
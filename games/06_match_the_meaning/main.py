@@ -3,17 +3,26 @@ import random
 import json
 import os
 import asyncio
+import sys
+
+# Shared helpers live in games/shared (copied next to main.py for pygbag builds)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared.text import text_cache
+from shared.scheduler import FrameScheduler
+from shared.clock import ticks
+from shared.profiler import profiler
+from shared.runtime import runtime
 
 class GameWindow:
     def __init__(self):
         random.seed()
         # pygame setup
-        pygame.init()
+        runtime.init()
 
         # Set up the game window dimensions
         self.screen_width = 800
         self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        self.screen = runtime.display((self.screen_width, self.screen_height))
 
         # Set the title of the window
         pygame.display.set_caption("Match the Meaning")
@@ -31,8 +40,8 @@ class GameWindow:
         self.GREY3 = (200, 200, 200)
 
         # Initialize font
-        self.font = pygame.font.SysFont(None, 50)
-        self.small_font = pygame.font.SysFont(None, 40)
+        self.font = runtime.font(None, 50)
+        self.small_font = runtime.font(None, 40)
 
         # Load dictionary
         self.load_dictionary()
@@ -81,26 +90,9 @@ class GameWindow:
         self.selected_status = {option: None for option in self.options}
 
     def draw_text(self, text, x, y, font, color):
-        # Break the text into lines if it exceeds the screen width
-        words = text.split(" ")
-        lines = []
-        current_line = ""
-
-        for word in words:
-            # If the word doesn't fit on the current line, move it to the next line
-            if font.size(current_line + word)[0] <= self.screen_width - 140:  # 40px padding from the edge
-                current_line += word + " "
-            else:
-                lines.append(current_line)
-                current_line = word + " "
-        
-        lines.append(current_line)  # Add the last line
-
-        # Draw each line of text
-        line_height = font.get_height() + 5  # Add some space between lines
-        for i, line in enumerate(lines):
-            text_surface = font.render(line, True, color)
-            self.screen.blit(text_surface, (x, y + i * line_height))
+        # Break the text into lines if it exceeds the screen width (40px padding from the edge).
+        # Layouts and rendered lines are cached, so unchanged text costs only blits
+        text_cache.draw(self.screen, font, text, (x, y), color, wrap_width=self.screen_width - 140)
 
     def check_click(self, pos):
         for i, (rect, option) in enumerate(self.option_rects):
@@ -113,19 +105,26 @@ class GameWindow:
                     else:
                         self.selected_status[option] = "incorrect"
                         self.feedback = f"Wrong! {self.word}"
-                    self.feedback_timer = pygame.time.get_ticks()
+                    self.feedback_timer = ticks()
+
+    def launch_launcher(self):
+        runtime.launch_launcher()
 
     async def main(self):
         running = True
-        clock = pygame.time.Clock()
+        # Event driven: sleep until input or until the feedback timer runs out
+        scheduler = FrameScheduler()
 
         while running:
+            profiler.begin_frame()
+            profiler.phase("events")
             for event in pygame.event.get():
+                profiler.handle_event(event)
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
-                        pass
+                        self.launch_launcher()
                     elif event.key == pygame.K_r:
                         self.feedback = f"The word was: {self.word}"
                         self.next_round()
@@ -143,10 +142,11 @@ class GameWindow:
                                 else:
                                     self.selected_status[selected_option] = "incorrect"
                                     self.feedback = f"Wrong! {self.word}"
-                                self.feedback_timer = pygame.time.get_ticks()
+                                self.feedback_timer = ticks()
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     self.check_click(event.pos)
 
+            profiler.phase("draw")
             self.screen.fill(self.GREY)
 
             if not self.game_over:
@@ -176,22 +176,24 @@ class GameWindow:
                     self.draw_text(f"{i+1}. {option}", square.x + 10, square.y + 5, self.small_font, self.BLACK)
                     self.option_rects.append((square, option))
 
-                total_points = str(self.player_total_points)
-                self.draw_text(total_points, self.screen_width - 200, self.screen_height // 10, self.font, self.BLACK)
+                text_cache.draw_number(self.screen, self.font, self.player_total_points, (self.screen_width - 200, self.screen_height // 10), self.BLACK)
 
                 if self.feedback:
                     self.draw_text(self.feedback, self.screen_width // 10, 340, self.font, self.GREEN if "Correct" in self.feedback else self.RED)
-                    if pygame.time.get_ticks() - self.feedback_timer > 2000:
+                    if ticks() - self.feedback_timer > 2000:
                         self.next_round()
                         self.feedback = ""
             else:
                 self.draw_text(f"Final Score: {self.player_total_points}", self.screen_width // 4, self.screen_height // 2, self.font, self.RED)
 
+            profiler.draw(self.screen)
+            profiler.phase("present")
             pygame.display.flip()
-            clock.tick(60)
-            await asyncio.sleep(0)
+            profiler.end_frame()
+            deadline = self.feedback_timer + 2000 if self.feedback else None
+            await scheduler.next_frame(deadline=deadline)
 
-        pygame.quit()
+        runtime.quit()
 
 if __name__ == "__main__":
     game = GameWindow()
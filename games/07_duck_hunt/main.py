@@ -1,22 +1,31 @@
 import pygame
 import random
 import os
+import sys
 import asyncio
 
+# Shared helpers live in games/shared (copied next to main.py for pygbag builds)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared.assets import cache
+from shared.text import text_cache
+from shared.clock import Clock
+from shared.profiler import profiler
+from shared.runtime import runtime
+
 class GameWindow():
     def __init__(self):
         random.seed()
-        pygame.init()
+        runtime.init()
         self.screen_width = 800
         self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        self.screen = runtime.display((self.screen_width, self.screen_height))
         pygame.display.set_caption("Duck Hunt")
         self.colors = {
             "WHITE": (255, 255, 255), "GREY": (178, 190, 181), "BLACK": (0, 0, 0), 
             "RED": (210, 43, 43), "GREEN": (49, 146, 54), "BLUE": (76, 81, 247),
             "PURPLE": (157, 77, 187), "GOLD": (243, 175, 25), "GREY2": (100, 100, 100)
         }
-        self.font = pygame.font.SysFont(None, 55)
+        self.font = runtime.font(None, 55)
         self.dt = 0
         self.bird_amount = 10  # ← FIXED: define how many birds you want
         self.gamestate = True  # ← FIXED: initialize game state
@@ -37,7 +46,8 @@ class GameWindow():
         if not self.bg_image:
             return pygame.Vector2(0, 0)
         bg_width, bg_height = self.bg_image.get_size()
-        margin = self.bird_height
+        # The fallback background is screen sized, smaller than twice the margin
+        margin = min(self.bird_height, bg_width // 2 - 1, bg_height // 2 - 1)
         x = random.randint(margin, bg_width - margin - 1)
         y = random.randint(margin, bg_height - margin - 1)
         return pygame.Vector2(x, y)
@@ -50,9 +60,9 @@ class GameWindow():
         selected_birds = random.sample(all_birds, self.bird_amount)
         images = {}
         for bird in selected_birds:
-            path = os.path.join("images", "birds", f"{bird}.png")
+            path = self.bird_path(bird)
             try:
-                image = pygame.image.load(path)
+                image = cache.load(path)
                 images[bird] = image 
             except pygame.error as e:
                 print(f"Error loading {bird}.png: {e}")
@@ -85,11 +95,8 @@ class GameWindow():
             screen_bird_x = self.bird_pos.x - offset_x
             screen_bird_y = self.bird_pos.y - offset_y
 
-            original_image = self.bird_image
-            new_height = self.bird_height
-            aspect_ratio = original_image.get_width() / original_image.get_height()
-            new_width = int(new_height * aspect_ratio)
-            self.small_bird = pygame.transform.scale(original_image, (new_width, new_height))
+            self.small_bird = cache.load_scaled_height(self.bird_path(self.bird_type), self.bird_height)
+            new_width, new_height = self.small_bird.get_size()
 
             self.bird_rect_on_screen = pygame.Rect(screen_bird_x, screen_bird_y, new_width, new_height)
             self.screen.blit(self.small_bird, self.bird_rect_on_screen.topleft)
@@ -103,13 +110,16 @@ class GameWindow():
                 "city.jpg", "city2.jpg", "city3.jpg", "city4.jpg", "city5.jpg", "city6.jpg",
                 "city7.jpg", "city8.jpg", "city9.jpg", "city10.jpg", "city11.jpg"])
             bg_path = os.path.join("images", "background", bg_name)
-            bg = pygame.image.load(bg_path).convert()
+            bg = cache.load(bg_path, alpha=False)
             print(f"Loaded background: {bg_name}")
             return bg
-        except pygame.error as e:
+        except (pygame.error, FileNotFoundError) as e:
             print(f"Error loading background image: {e}")
             return pygame.Surface((self.screen_width, self.screen_height))  # Fallback
 
+    def bird_path(self, bird):
+        return os.path.join("images", "birds", f"{bird}.png")
+
     def next_round(self):
         if self.player_total_points % 3 == 0 and self.bird_height > 10:
             self.bird_height = int(self.bird_height * 0.5)
@@ -124,8 +134,7 @@ class GameWindow():
         self.next_round()
 
     def draw_text(self, text, x, y, color):
-        text_surface = self.font.render(text, True, color)
-        self.screen.blit(text_surface, (x, y))
+        text_cache.draw(self.screen, self.font, text, (x, y), color)
 
     def hitbox_toggle(self):
         self.hitbox = not self.hitbox
@@ -141,9 +150,8 @@ class GameWindow():
                 continue
 
             scaled_height = 130
-            aspect_ratio = image.get_width() / image.get_height()
-            scaled_width = int(scaled_height * aspect_ratio)
-            scaled_img = pygame.transform.scale(image, (scaled_width, scaled_height))
+            scaled_img = cache.load_scaled_height(self.bird_path(bird_name), scaled_height)
+            scaled_width = scaled_img.get_width()
 
             if x + scaled_width > self.screen_width - padding:
                 x = padding
@@ -157,13 +165,19 @@ class GameWindow():
             x += scaled_width + padding
             max_height_in_row = max(max_height_in_row, scaled_height + 5)
 
+    def launch_launcher(self):
+        runtime.launch_launcher()
+
     async def main(self):
         running = True
-        clock = pygame.time.Clock()
+        clock = Clock()
         time_elapsed = 0
 
         while running:
+            profiler.begin_frame()
+            profiler.phase("events")
             for event in pygame.event.get():
+                profiler.handle_event(event)
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
@@ -184,22 +198,26 @@ class GameWindow():
                     else:
                         print("Missed!")
 
+            profiler.phase("draw")
             if self.show_bird_info:
                 self.display_all_bird_images()
             elif self.gamestate:
                 mouse_x, mouse_y = pygame.mouse.get_pos()
                 self.load_bg(mouse_x, mouse_y)
                 time_elapsed += self.dt
-                self.draw_text(f'{int(self.player_total_points)}', self.screen_width - 200, self.screen_height // 10, self.colors["WHITE"])
+                text_cache.draw_number(self.screen, self.font, int(self.player_total_points), (self.screen_width - 200, self.screen_height // 10), self.colors["WHITE"])
             else:
                 self.screen.fill(self.colors["GREY"])
                 self.draw_text(f"FINAL SCORE: {self.player_total_points}", self.screen_width // 5, self.screen_height // 2, self.colors["BLACK"])
 
+            profiler.draw(self.screen)
+            profiler.phase("present")
             pygame.display.flip()
+            profiler.end_frame()
             self.dt = clock.tick(60) / 1000
             await asyncio.sleep(0)
 
-        pygame.quit()
+        runtime.quit()
 
 if __name__ == "__main__":
     game = GameWindow()
@@ -2,17 +2,32 @@ import pygame
 import random
 import json
 import os
+import sys
 import asyncio
 
+# Shared helpers live in games/shared (copied next to main.py for pygbag builds)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared.assets import cache
+from shared.text import text_cache
+from shared.render import DirtyRenderer
+from shared.scheduler import FrameScheduler
+from shared.clock import ticks
+from shared.profiler import profiler
+from shared.runtime import runtime
+
 class GameWindow:
     def __init__(self):
         random.seed()
-        pygame.init()
+        runtime.init()
 
         self.screen_width = 800
         self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        self.screen = runtime.display((self.screen_width, self.screen_height))
         pygame.display.set_caption("CEO Simulator")
+        # The choice screen is mostly static: scene changes flip, hover changes present their buttons
+        self.renderer = DirtyRenderer(self.screen)
+        self.scene = None
+        self.hovered = None
 
         self.WHITE = (255, 255, 255)
         self.GREY = (178, 190, 181)
@@ -22,9 +37,9 @@ class GameWindow:
         self.BLUE = (76, 81, 247)
         self.GOLD = (200, 180, 50)
 
-        self.font = pygame.font.SysFont(None, 40)
-        self.small_font = pygame.font.SysFont(None, 30)
-        self.smaller_font = pygame.font.SysFont(None, 25)
+        self.font = runtime.font(None, 40)
+        self.small_font = runtime.font(None, 30)
+        self.smaller_font = runtime.font(None, 25)
 
         self.money_high = 1000
         self.reputation_high = 1000
@@ -64,7 +79,7 @@ class GameWindow:
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
+                    runtime.quit()
                     exit()
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     for rect, ceo_type in buttons:
@@ -91,6 +106,15 @@ class GameWindow:
             pygame.draw.rect(self.screen, self.BLACK, rect, 2)
             self.draw_text(ceo_type, rect.x + 20, rect.y + 10, self.small_font, self.WHITE)
             self.startup_buttons.append((rect, ceo_type))
+        self.mark_hover([rect for rect, _ in self.startup_buttons], mouse_pos)
+
+    def mark_hover(self, rects, mouse_pos):
+        """Present the buttons whose highlight changed since the last frame."""
+        hovered = next((rect for rect in rects if rect.collidepoint(mouse_pos)), None)
+        if hovered != self.hovered:
+            self.renderer.mark(self.hovered)
+            self.renderer.mark(hovered)
+            self.hovered = hovered
 
     def load_scenarios(self):
         with open(os.path.join("jsons", "ceo_scenarios.json"), "r") as file:
@@ -144,27 +168,14 @@ class GameWindow:
         self.click = True
 
     def draw_text(self, text, x, y, font, color):
-        words = text.split(" ")
-        lines = []
-        current_line = ""
-        for word in words:
-            if font.size(current_line + word)[0] <= self.screen_width - 100:
-                current_line += word + " "
-            else:
-                lines.append(current_line)
-                current_line = word + " "
-        lines.append(current_line)
-
-        line_height = font.get_height() + 5
-        for i, line in enumerate(lines):
-            text_surface = font.render(line, True, color)
-            self.screen.blit(text_surface, (x, y + i * line_height))
+        # Wrapped layouts and rendered lines are cached, so unchanged text costs only blits
+        text_cache.draw(self.screen, font, text, (x, y), color, wrap_width=self.screen_width - 100)
 
     def load_bg(self):
         try:
-            # Load and scale monitor image once
-            monitor = pygame.image.load(os.path.join("images", "ceo", "monitor_desk.png"))
-            monitor = pygame.transform.scale(monitor, (self.screen_width, self.screen_height))
+            # Decoded and scaled once, then served from the asset cache
+            screen_size = (self.screen_width, self.screen_height)
+            monitor = cache.load(os.path.join("images", "ceo", "monitor_desk.png"), screen_size)
 
             # Dictionary mapping CEO types to their background and ornament images
             ceo_assets = {
@@ -176,12 +187,10 @@ class GameWindow:
 
             if self.type in ceo_assets:
                 bg_file, ornament_file = ceo_assets[self.type]
-                bg = pygame.image.load(os.path.join("images", "ceo", bg_file))
-                bg = pygame.transform.scale(bg, (self.screen_width, self.screen_height))
+                bg = cache.load(os.path.join("images", "ceo", bg_file), screen_size)
                 self.screen.blit(bg, (0, 0))
 
-                ornament = pygame.image.load(os.path.join("images", "ceo", ornament_file))
-                ornament = pygame.transform.scale(ornament, (self.screen_width, self.screen_height))
+                ornament = cache.load(os.path.join("images", "ceo", ornament_file), screen_size)
 
                 pygame.draw.rect(self.screen, self.GREY, (28, 38, 743, 400))
                 self.screen.blit(monitor, (0, 0))
@@ -244,7 +253,7 @@ class GameWindow:
             if rect.collidepoint(pos):
                 self.apply_effects(choice["effects"])
                 self.feedback = choice["feedback"]
-                self.feedback_timer = pygame.time.get_ticks()
+                self.feedback_timer = ticks()
                 return
 
     def draw_stats(self):
@@ -308,6 +317,9 @@ class GameWindow:
             return
 
     def draw_game_screen(self):
+        # Move on before drawing, so the frame the feedback ends already shows the next scenario
+        if self.feedback and ticks() - self.feedback_timer > 2000:
+            self.next_scenario()
         self.screen.fill(self.GREY)
         self.load_bg()
         self.draw_stats()
@@ -315,9 +327,11 @@ class GameWindow:
 
         self.option_rects = []
         mouse_pos = pygame.mouse.get_pos()
+        buttons = []
 
         for i, choice in enumerate(self.current["choices"]):
             rect = pygame.Rect(70, 210 + i * 70, 660, 50)
+            buttons.append(rect)
             is_hovered = rect.collidepoint(mouse_pos)
             button_color = (140, 140, 255) if is_hovered else self.BLUE
             pygame.draw.rect(self.screen, button_color, rect)
@@ -326,6 +340,7 @@ class GameWindow:
             if self.click:
                 self.option_rects.append((rect, choice))
 
+        self.mark_hover(buttons, mouse_pos)
         if any(rect.collidepoint(mouse_pos) for rect, _ in self.option_rects):
             try:
                 pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_HAND)
@@ -342,8 +357,6 @@ class GameWindow:
             pygame.draw.rect(self.screen, self.GREY, (70, 210, 660, 200))
             self.draw_text(self.feedback, 70, 260, self.font, self.GREEN)
             self.draw_text(self.penalty_message, 70, 310, self.font, self.RED)
-            if pygame.time.get_ticks() - self.feedback_timer > 2000:
-                self.next_scenario()
 
         self.draw_text(self.type, self.screen_width - 200, 70, self.small_font, self.BLACK)
         self.check_game_over()
@@ -383,7 +396,7 @@ class GameWindow:
         while waiting:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
+                    runtime.quit()
                     exit()
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r:
@@ -391,15 +404,24 @@ class GameWindow:
                         self.startup_screen()
                         waiting = False
                     elif event.key == pygame.K_ESCAPE:
-                        pygame.quit()
+                        # Back to the launcher when hosted, quit standalone
+                        self.launch_launcher()
+                        runtime.quit()
                         exit()
 
+    def launch_launcher(self):
+        runtime.launch_launcher()
+
     async def main(self):
-        clock = pygame.time.Clock()
+        # Event driven: sleep until input or until the feedback timer runs out
+        scheduler = FrameScheduler()
         running = True
 
         while running:
+            profiler.begin_frame()
+            profiler.phase("events")
             for event in pygame.event.get():
+                profiler.handle_event(event)
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -416,8 +438,10 @@ class GameWindow:
                         self.reset()
                         self.screen_state = "startup"
                     elif event.key == pygame.K_ESCAPE:
+                        self.launch_launcher()
                         running = False
 
+            profiler.phase("draw")
             if self.screen_state == "startup":
                 self.draw_startup_screen()
             elif self.screen_state == "game":
@@ -425,11 +449,20 @@ class GameWindow:
             elif self.screen_state == "summary":
                 self.draw_summary_screen()
 
-            pygame.display.flip()
-            clock.tick(60)
-            await asyncio.sleep(0)
+            # Anything but a button highlight changes most of the screen
+            scene = (self.screen_state, self.type, self.scenarios_played, self.feedback)
+            if scene != self.scene:
+                self.renderer.invalidate()
+                self.scene = scene
+
+            self.renderer.mark(profiler.draw(self.screen))
+            profiler.phase("present")
+            self.renderer.present()
+            profiler.end_frame()
+            deadline = self.feedback_timer + 2000 if self.feedback else None
+            await scheduler.next_frame(deadline=deadline)
 
-        pygame.quit()
+        runtime.quit()
 
 if __name__ == "__main__":
     game = GameWindow()
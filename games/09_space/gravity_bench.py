@@ -0,0 +1,93 @@
+"""Barnes-Hut against exact gravity: speed and accuracy by body count.
+
+Builds a 09_space-style system (the star plus planets on a disc around it,
+sandbox masses) for each size, times exact_accelerations() and
+barnes_hut_accelerations() at each opening angle, and reports how far the
+approximate accelerations are from the exact ones.
+
+    python games/09_space/gravity_bench.py
+    python games/09_space/gravity_bench.py --sizes 500 2000 8000 --thetas 0.3 0.5 0.8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from physics import exact_accelerations, barnes_hut_accelerations
+
+GRAVITY_MULTIPLIER = 170  # the hardest level's
+
+
+def make_system(n, seed):
+    """The star at index 0 plus n planets between 30 and 290 px from it."""
+    rng = np.random.default_rng(seed)
+    distance = rng.uniform(30, 290, n + 1)
+    angle = rng.uniform(0, 2 * np.pi, n + 1)
+    x = 400 + distance * np.cos(angle)
+    y = 300 + distance * np.sin(angle)
+    mass = rng.uniform(1e5, 1e8, n + 1)
+    x[0], y[0], mass[0] = 400, 300, 1e14
+    return x, y, mass
+
+
+def best_time(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def compare(n, thetas, seed, repeat, exact_limit):
+    x, y, mass = make_system(n, seed)
+    rows = []
+    exact = None
+    if n <= exact_limit:
+        exact_ms, exact = best_time(lambda: exact_accelerations(x, y, mass, 0, GRAVITY_MULTIPLIER), repeat)
+        rows.append({"n": n, "solver": "exact", "ms": exact_ms})
+    for theta in thetas:
+        ms, approx = best_time(lambda: barnes_hut_accelerations(x, y, mass, 0, GRAVITY_MULTIPLIER, theta), repeat)
+        row = {"n": n, "solver": f"barnes-hut {theta:g}", "ms": ms}
+        if exact is not None:
+            error = np.hypot(approx[0] - exact[0], approx[1] - exact[1]) / np.hypot(*exact)
+            row["median_error"] = float(np.median(error))
+            row["p99_error"] = float(np.percentile(error, 99))
+            row["speedup"] = rows[0]["ms"] / ms
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 1000, 2000, 4000])
+    parser.add_argument("--thetas", type=float, nargs="+", default=[0.3, 0.5, 0.8])
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    parser.add_argument("--exact-limit", type=int, default=4000,
+                        help="largest size to run exact summation at (it needs n x n arrays)")
+    parser.add_argument("--json", help="write the rows to this file")
+    args = parser.parse_args()
+
+    rows = []
+    print(f"{'bodies':>7}  {'solver':<16}{'ms':>9}{'speedup':>9}{'median err':>12}{'p99 err':>10}")
+    for n in args.sizes:
+        for row in compare(n, args.thetas, args.seed, args.repeat, args.exact_limit):
+            rows.append(row)
+            line = f"{row['n']:>7}  {row['solver']:<16}{row['ms']:>9.2f}"
+            if "speedup" in row:
+                line += f"{row['speedup']:>8.1f}x{row['median_error']:>11.2%}{row['p99_error']:>10.2%}"
+            print(line)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"seed": args.seed, "rows": rows}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
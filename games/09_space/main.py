@@ -1,11 +1,33 @@
+# /// script
+# dependencies = [
+#     "numpy",
+# ]
+# ///
 import pygame
 import math
-import time
 import random
 import asyncio
+import os
+import sys
+
+# Shared helpers live in games/shared (copied next to main.py for pygbag builds)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared.text import text_cache
+from shared.clock import Clock, seconds
+from shared.profiler import profiler
+from shared.loop import FixedStep
+from shared.pool import Pool
+from shared.runtime import runtime
+from shared.sprites import CircleSprites
+
+# Game-local modules (physics.py, trails.py, particles.py) sit next to this file
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from physics import G, NBody
+from trails import TrailRing, FadeTrails
+from particles import ParticleSystem
 
 # Initialize Pygame
-pygame.init()
+runtime.init()
 
 # Constants
 WIDTH, HEIGHT = 800, 600
@@ -17,12 +39,22 @@ YELLOW = (255, 255, 0)
 GREEN = (0, 255, 0)
 BLACK = (0, 0, 0)
 GOLD = (243, 175, 25)
-G = 6.67430e-11
 BASE_GRAVITY_MULTIPLIER = 80
 BASE_COLLISION_PENALTY = 10
 BASE_ORBIT_LIMIT = 1000
-
-font = pygame.font.SysFont(None, 24)
+# Sandbox mode fills the system up to this many planets, one ring per step.
+# Rings are further apart, and their planets spaced wider, than two planets
+# are wide, so circular orbits never meet
+SANDBOX_BODIES = 2000
+SANDBOX_RING_INNER, SANDBOX_RING_OUTER, SANDBOX_RING_SPACING = 40, 290, 10
+# Keys 1-3 pick the mass, radius and color of the planets a click places
+BODY_KEYS = {
+    pygame.K_1: (1e-50, 5, BLUE),
+    pygame.K_2: (1e5, 10, PURPLE),
+    pygame.K_3: (1e10, 15, RED),
+}
+
+font = runtime.font(None, 24)
 
 class CelestialBody:
     def __init__(self, x, y, mass, radius, color, vx=0, vy=0):
@@ -33,52 +65,65 @@ class CelestialBody:
         self.color = color
         self.vx = vx
         self.vy = vy
-        self.trail = []
-
-    def draw(self, screen):
-        if len(self.trail) > 2:
-            pygame.draw.lines(screen, self.color, False, self.trail, 1)
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-
-    def update_position(self, bodies, star, gravity_multiplier):
-        ax, ay = 0, 0
-        for body in bodies:
-            if body != self:
-                dx = body.x - self.x
-                dy = body.y - self.y
-                distance = math.hypot(dx, dy)
-                if distance < 1e-2:
-                    continue
-                adjusted_G = G * (gravity_multiplier if (body != star and self != star) else 1)
-                force = adjusted_G * self.mass * body.mass / (distance ** 2)
-                ax += force * dx / distance / self.mass
-                ay += force * dy / distance / self.mass
-        self.vx += ax
-        self.vy += ay
-        self.x += self.vx
-        self.y += self.vy
-        if len(self.trail) > 100:
-            self.trail.pop(0)
-        self.trail.append((int(self.x), int(self.y)))
+        # Acceleration from the last physics step (sizes the next substeps)
+        self.ax = 0.0
+        self.ay = 0.0
+        # Position before the last step, for drawing between steps
+        self.prev_x = x
+        self.prev_y = y
+        self.trail = TrailRing()
+
+    def draw(self, screen, alpha=1.0, trail=True):
+        if trail:
+            self.trail.draw(screen, self.color)
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        pygame.draw.circle(screen, self.color, (int(x), int(y)), self.radius)
+
+    def moved(self, x, y, vx, vy, ax, ay):
+        """Take the state computed by a physics substep."""
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.ax = ax
+        self.ay = ay
+
+    def start_step(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def end_step(self):
+        self.trail.append(int(self.x), int(self.y))
 
 class FloatingText:
-    def __init__(self, text, x, y, color, duration=1.5):
+    def __init__(self, text="", x=0, y=0, color=WHITE, duration=1.5):
+        self.text = None
+        self.color = None
+        self.reset(text, x, y, color, duration)
+
+    def reset(self, text, x, y, color, duration=1.5):
+        # Rendered once per message; a recycled text with the same message keeps its surface
+        if text != self.text or color != self.color:
+            self.surface = font.render(text, True, color)
         self.text = text
         self.x = x
         self.y = y
         self.color = color
         self.duration = duration
-        self.start_time = time.time()
+        self.start_time = seconds()
+        self.alpha = None
 
-    def draw(self, screen):
-        elapsed = time.time() - self.start_time
+    def draw(self, screen, now):
+        elapsed = now - self.start_time
         if elapsed > self.duration:
             return False
         offset = int(elapsed * 30)
         alpha = max(0, 255 - int(elapsed / self.duration * 255))
-        surf = font.render(self.text, True, self.color)
-        surf.set_alpha(alpha)
-        screen.blit(surf, (self.x, self.y - offset))
+        if alpha != self.alpha:
+            self.surface.set_alpha(alpha)
+            self.alpha = alpha
+        screen.blit(self.surface, (self.x, self.y - offset))
         return True
 
 class Level:
@@ -88,30 +133,24 @@ class Level:
         self.survive_time = survive_time
         self.completed = False
 
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.radius = random.randint(2, 4)
-        self.color = color
-        self.vx = random.uniform(-2, 2)
-        self.vy = random.uniform(-2, 2)
-        self.lifetime = 3.0
-        self.birth_time = time.time()
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        return time.time() - self.birth_time < self.lifetime
-
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-
 class GameWindow:
     def __init__(self):
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        self.screen = runtime.display((WIDTH, HEIGHT))
         pygame.display.set_caption("S p a c e")
-        self.clock = pygame.time.Clock()
+        self.clock = Clock()
+        # The physics is tuned per 1/60 s step, so it always runs at that rate
+        self.stepper = FixedStep(60)
+        # T cycles auto (by body count), exact and Barnes-Hut gravity, [ and ] tune theta
+        self.physics = NBody()
+        self.sandbox = False
+        # L switches between redrawn trail lines and a fading trail surface
+        self.fade_trails = FadeTrails((WIDTH, HEIGHT))
+        self.trail_mode = "lines"
+        # Collision effects are recycled instead of allocated per crash
+        self.floating_texts = Pool(FloatingText)
+        self.particles = ParticleSystem()
+        self.particle_sprites = CircleSprites()
+        self.particle_sprites.prepare((2, 3, 4), (255, 100, 100))
         self.reset()
         self.levels = [
             Level(1, 1, 5), Level(2, 2, 5), Level(3, 3, 5),
@@ -122,19 +161,21 @@ class GameWindow:
 
     def reset(self):
         self.bodies = []
-        self.floating_texts = []
-        self.particles = []
+        self.fade_trails.clear()
+        self.floating_texts.clear()
+        self.particles.clear()
         self.score = 0
-        self.last_bonus_time = time.time()
-        self.last_rogue_spawn = time.time()
-        self.game_start_time = time.time()
-        self.level_start_time = time.time()
+        self.last_bonus_time = seconds()
+        self.last_rogue_spawn = seconds()
+        self.game_start_time = seconds()
+        self.level_start_time = seconds()
         self.key_mass = 1e10
         self.key_radius = 5
         self.key_color = BLUE
         self.star = CelestialBody(WIDTH / 2, HEIGHT / 2, 1e14, 10, YELLOW)
         self.bodies.append(self.star)
         self.current_level = 0
+        self.sandbox_rings = 0
 
     def spawn_rogue_body(self):
         angle = random.uniform(0, 2 * math.pi)
@@ -149,26 +190,92 @@ class GameWindow:
         color = random.choice([RED, GREEN, GOLD, PURPLE])
         return CelestialBody(x, y, mass, radius, color, vx, vy)
 
+    def spawn_ring(self):
+        """The next sandbox ring: small planets evenly spaced on one circular orbit.
+
+        All planets of a ring circle at the same angular speed, so they keep
+        their spacing. Returns [] once the rings or the planet budget run out.
+        """
+        distance = SANDBOX_RING_INNER + self.sandbox_rings * SANDBOX_RING_SPACING
+        count = min(int(2 * math.pi * distance / SANDBOX_RING_SPACING), SANDBOX_BODIES + 1 - len(self.bodies))
+        if distance > SANDBOX_RING_OUTER or count <= 0:
+            return []
+        self.sandbox_rings += 1
+        speed = math.sqrt(G * self.star.mass / distance)
+        start = random.uniform(0, 2 * math.pi)
+        ring = []
+        for i in range(count):
+            angle = start + 2 * math.pi * i / count
+            x = self.star.x + math.cos(angle) * distance
+            y = self.star.y + math.sin(angle) * distance
+            vx = self.star.vx - math.sin(angle) * speed
+            vy = self.star.vy + math.cos(angle) * speed
+            # Light enough that the planets barely pull each other off their rings
+            mass = random.uniform(1e5, 1e6)
+            radius = random.randint(2, 4)
+            color = random.choice([RED, GREEN, GOLD, PURPLE])
+            ring.append(CelestialBody(x, y, mass, radius, color, vx, vy))
+        return ring
+
+    def toggle_sandbox(self):
+        sandbox = not self.sandbox
+        self.reset()
+        self.sandbox = sandbox
+        # Thousands of tiny fast planets would always hit the substep cap, and
+        # orbits that never meet need no substeps; thousands of 100-point
+        # trail lines are too slow to redraw
+        self.physics.max_substeps = 1 if sandbox else 8
+        self.trail_mode = "fade" if sandbox else "lines"
+        self.add_floating_text("Sandbox" if sandbox else "Levels", WIDTH // 2 - 40, HEIGHT // 2, GREEN)
+
+    def gravity_label(self):
+        solver = self.physics.active_solver(len(self.bodies))
+        if solver == "barnes-hut":
+            solver = f"barnes-hut, theta {self.physics.theta:.1f}"
+        if self.physics.solver == "auto":
+            return f"Gravity: auto ({solver})"
+        return f"Gravity: {solver}"
+
     def spawn_collision_particles(self, x, y, color, count=15):
-        return [Particle(x, y, color) for _ in range(count)]
-
-    def check_collisions(self, collision_penalty):
-        i = 1
-        while i < len(self.bodies):
-            j = i + 1
-            while j < len(self.bodies):
-                a, b = self.bodies[i], self.bodies[j]
-                dist = math.hypot(a.x - b.x, a.y - b.y)
-                if dist < (a.radius + b.radius):
-                    x, y = int((a.x + b.x) / 2), int((a.y + b.y) / 2)
-                    self.floating_texts.append(FloatingText(f"Planets collide!", x, y, RED))
-                    self.particles.extend(self.spawn_collision_particles(x, y, (255, 100, 100)))
-                    self.bodies.pop(j)
-                    self.bodies.pop(i)
-                    return True
-                j += 1
-            i += 1
-        return False
+        self.particles.emit(x, y, color, count, seconds())
+
+    def add_floating_text(self, text, x, y, color):
+        self.floating_texts.spawn().reset(text, x, y, color)
+
+    def resolve_contacts(self, collision_penalty):
+        """Apply every escape, star crash and planet collision of this substep at once.
+
+        Escapes win over crashes and crashes over planet collisions, as in the
+        old separate passes; a body is only removed once. Returns True if any
+        two planets collided.
+        """
+        star_distance, pairs = self.physics.contacts(self.bodies, self.star)
+        gone = [False] * len(self.bodies)
+        for i in (star_distance > BASE_ORBIT_LIMIT).nonzero()[0].tolist():
+            if self.bodies[i] is not self.star:
+                self.add_floating_text("Planet escaped orbit!", WIDTH // 2 - 80, 560, RED)
+                gone[i] = True
+
+        collided = False
+        for i, j in pairs:
+            if gone[i] or gone[j]:
+                continue
+            a, b = self.bodies[i], self.bodies[j]
+            if a is self.star or b is self.star:
+                body = b if a is self.star else a
+                self.score -= collision_penalty
+                self.add_floating_text(f"Planet crashed!", int(body.x), int(body.y), RED)
+                gone[j if a is self.star else i] = True
+            else:
+                x, y = int((a.x + b.x) / 2), int((a.y + b.y) / 2)
+                self.add_floating_text(f"Planets collide!", x, y, RED)
+                self.spawn_collision_particles(x, y, (255, 100, 100))
+                gone[i] = gone[j] = True
+                collided = True
+
+        if any(gone):
+            self.bodies = [body for body, lost in zip(self.bodies, gone) if not lost]
+        return collided
 
     def draw_level_goal(self, level, elapsed):
         lines = [
@@ -177,10 +284,20 @@ class GameWindow:
             f"Level Time: {elapsed}/{level.survive_time}"
         ]
         for i, line in enumerate(lines):
-            self.screen.blit(font.render(line, True, WHITE), (20, 520 + i * 20))
+            text_cache.draw(self.screen, font, line, (20, 520 + i * 20), WHITE)
+
+    def draw_sandbox_status(self):
+        lines = [
+            "Sandbox",
+            f"Planets: {len(self.bodies) - 1}",
+            self.gravity_label(),
+        ]
+        for i, line in enumerate(lines):
+            text_cache.draw(self.screen, font, line, (20, 520 + i * 20), WHITE)
 
     def handle_events(self):
         for event in pygame.event.get():
+            profiler.handle_event(event)
             if event.type == pygame.QUIT:
                 return False
             elif event.type == pygame.KEYDOWN:
@@ -188,166 +305,138 @@ class GameWindow:
                     self.launch_launcher()
                 elif event.key == pygame.K_r:
                     self.reset()
-                elif event.key == pygame.K_1:
-                    self.key_mass = 1e-50
-                    self.key_color = BLUE
-                    self.key_radius = 5
-                elif event.key == pygame.K_2:
-                    self.key_mass = 1e5
-                    self.key_color = PURPLE
-                    self.key_radius = 10
-                elif event.key == pygame.K_3:
-                    self.key_mass = 1e10
-                    self.key_color = RED
-                    self.key_radius = 15
+                elif event.key in BODY_KEYS:
+                    self.key_mass, self.key_radius, self.key_color = BODY_KEYS[event.key]
+                elif event.key == pygame.K_s:
+                    self.toggle_sandbox()
+                elif event.key == pygame.K_l:
+                    self.trail_mode = "fade" if self.trail_mode == "lines" else "lines"
+                    self.fade_trails.clear()
+                    self.add_floating_text(f"Trails: {self.trail_mode}", WIDTH // 2 - 50, 40, WHITE)
+                elif event.key == pygame.K_t:
+                    self.physics.next_solver()
+                    self.add_floating_text(self.gravity_label(), WIDTH // 2 - 100, 40, WHITE)
+                elif event.key in (pygame.K_LEFTBRACKET, pygame.K_RIGHTBRACKET):
+                    change = 0.1 if event.key == pygame.K_RIGHTBRACKET else -0.1
+                    self.physics.theta = round(min(1.5, max(0.1, self.physics.theta + change)), 1)
+                    self.add_floating_text(self.gravity_label(), WIDTH // 2 - 100, 40, WHITE)
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 x, y = pygame.mouse.get_pos()
-                dx, dy = x - self.star.x, y - self.star.y
-                distance = math.hypot(dx, dy)
-                if distance == 0:
+                if not self.place_body(x, y):
                     return True
-                speed = math.sqrt(G * self.star.mass / distance)
-                vx, vy = -dy / distance * speed, dx / distance * speed
-                new_body = CelestialBody(x, y, self.key_mass, self.key_radius, self.key_color, vx, vy)
-                self.bodies.append(new_body)
-                self.score += 10
-                # self.floating_texts.append(FloatingText("+10", x, y, GREEN))
         return True
 
-    # def update(self):
-    #     now = time.time()
-    #     elapsed = int(now - self.game_start_time)
-    #     level_elapsed = int(now - self.level_start_time)
-    #     difficulty = self.current_level
-    #     gravity_multiplier = BASE_GRAVITY_MULTIPLIER + difficulty * 10
-    #     collision_penalty = BASE_COLLISION_PENALTY + difficulty * 10
-
-    #     self.screen.fill(BLACK)
-
-    #     for body in self.bodies:
-    #         body.update_position(self.bodies, self.star, gravity_multiplier)
-    #         body.draw(self.screen)
-
-    #     for i in range(len(self.bodies) - 1, 0, -1):
-    #         body = self.bodies[i]
-    #         dist = math.hypot(body.x - self.star.x, body.y - self.star.y)
-    #         if dist > BASE_ORBIT_LIMIT:
-    #             self.floating_texts.append(FloatingText("Planet escaped orbit!", WIDTH // 2 - 80, 560, RED))
-    #             self.bodies.pop(i)
-    #         elif dist < (body.radius + self.star.radius):
-    #             self.score -= collision_penalty
-    #             self.floating_texts.append(FloatingText(f"Planet crashed!", int(body.x), int(body.y), RED))
-    #             self.bodies.pop(i)
-
-    #     if self.check_collisions(collision_penalty):
-    #         self.level_start_time = now
-    #         self.floating_texts.append(FloatingText("Timer Reset!", 150, 560, RED))
-
-    #     if now - self.last_bonus_time >= 10:
-    #         self.score += 10
-    #         # self.floating_texts.append(FloatingText("+10 (survive)", 10, 70, GREEN))
-    #         self.last_bonus_time = now
-
-    #     if now - self.last_rogue_spawn >= 20 - min(difficulty, 15) and self.current_level >= 3:
-    #         self.bodies.append(self.spawn_rogue_body())
-    #         self.last_rogue_spawn = now
-
-    #     if self.current_level < len(self.levels):
-    #         level = self.levels[self.current_level]
-    #         if len(self.bodies) <= level.target_planets:
-    #             self.level_start_time = now
-    #         if not level.completed and len(self.bodies) - 1 >= level.target_planets and level_elapsed >= level.survive_time:
-    #             level.completed = True
-    #             self.floating_texts.append(FloatingText(f"Level {level.number} Complete!", WIDTH // 2 - 80, HEIGHT // 2, GREEN))
-    #             self.current_level += 1
-    #             self.level_start_time = now
-
-    #     self.particles = [p for p in self.particles if p.update()]
-    #     for p in self.particles:
-    #         p.draw(self.screen)
-
-    #     self.floating_texts = [t for t in self.floating_texts if t.draw(self.screen)]
-
-    #     # self.screen.blit(font.render(f"Score: {self.score}", True, WHITE), (680, 20))
-    #     # self.screen.blit(font.render(f"Time: {elapsed}s", True, WHITE), (680, 560))
-    #     self.screen.blit(font.render(f"Level: {self.levels[self.current_level].number if self.current_level > 0 else 1}", True, WHITE), (20, 20))
-
-    #     if self.current_level < len(self.levels):
-    #         self.draw_level_goal(self.levels[self.current_level], level_elapsed)
-
-    #     pygame.display.flip()
-    #     self.clock.tick(60)
-    #     await asyncio.sleep(0)
+    def place_body(self, x, y):
+        """Put the selected planet at (x, y) on a circular orbit; False on the star's centre."""
+        dx, dy = x - self.star.x, y - self.star.y
+        distance = math.hypot(dx, dy)
+        if distance == 0:
+            return False
+        speed = math.sqrt(G * self.star.mass / distance)
+        vx, vy = -dy / distance * speed, dx / distance * speed
+        new_body = CelestialBody(x, y, self.key_mass, self.key_radius, self.key_color, vx, vy)
+        self.bodies.append(new_body)
+        self.score += 10
+        # self.add_floating_text("+10", x, y, GREEN)
+        return True
+
+    def update(self, dt):
+        """Advance the simulation by one fixed step."""
+        now = seconds()
+        level_elapsed = int(now - self.level_start_time)
+        # The sandbox plays at the hardest level's gravity
+        difficulty = len(self.levels) - 1 if self.sandbox else self.current_level
+        gravity_multiplier = BASE_GRAVITY_MULTIPLIER + difficulty * 10
+        collision_penalty = BASE_COLLISION_PENALTY + difficulty * 10
+
+        for body in self.bodies:
+            body.start_step()
+        # Close passes split the step so nothing skips past a collision check
+        substeps = self.physics.substeps(self.bodies, dt)
+        collided = False
+        for _ in range(substeps):
+            with profiler.span("gravity"):
+                self.physics.step(self.bodies, self.star, gravity_multiplier, dt / substeps)
+            with profiler.span("contacts"):
+                collided = self.resolve_contacts(collision_penalty) or collided
+        for body in self.bodies:
+            body.end_step()
+        if self.trail_mode == "fade":
+            with profiler.span("trails"):
+                self.fade_trails.step(self.bodies)
+
+        if collided:
+            self.level_start_time = now
+            self.add_floating_text("Timer Reset!", 150, 560, RED)
+
+        if now - self.last_bonus_time >= 10:
+            self.score += 10
+            # self.add_floating_text("+10 (survive)", 10, 70, GREEN)
+            self.last_bonus_time = now
+
+        if self.sandbox:
+            self.bodies.extend(self.spawn_ring())
+        elif now - self.last_rogue_spawn >= 20 - min(difficulty, 15) and self.current_level >= 3:
+            self.bodies.append(self.spawn_rogue_body())
+            self.last_rogue_spawn = now
+
+        if self.current_level < len(self.levels) and not self.sandbox:
+            level = self.levels[self.current_level]
+            if len(self.bodies) <= level.target_planets:
+                self.level_start_time = now
+            if not level.completed and len(self.bodies) - 1 >= level.target_planets and level_elapsed >= level.survive_time:
+                level.completed = True
+                self.add_floating_text(f"Level {level.number} Complete!", WIDTH // 2 - 80, HEIGHT // 2, GREEN)
+                self.current_level += 1
+                self.level_start_time = now
+
+        self.particles.update(now)
+
+    def launch_launcher(self):
+        runtime.launch_launcher()
 
     async def main(self):
         running = True
+        dt = 0
         while running:
+            profiler.begin_frame()
+            profiler.phase("events")
             running = self.handle_events()
-            now = time.time()
-            elapsed = int(now - self.game_start_time)
-            level_elapsed = int(now - self.level_start_time)
-            difficulty = self.current_level
-            gravity_multiplier = BASE_GRAVITY_MULTIPLIER + difficulty * 10
-            collision_penalty = BASE_COLLISION_PENALTY + difficulty * 10
-
-            self.screen.fill(BLACK)
-
-            for body in self.bodies:
-                body.update_position(self.bodies, self.star, gravity_multiplier)
-                body.draw(self.screen)
-
-            for i in range(len(self.bodies) - 1, 0, -1):
-                body = self.bodies[i]
-                dist = math.hypot(body.x - self.star.x, body.y - self.star.y)
-                if dist > BASE_ORBIT_LIMIT:
-                    self.floating_texts.append(FloatingText("Planet escaped orbit!", WIDTH // 2 - 80, 560, RED))
-                    self.bodies.pop(i)
-                elif dist < (body.radius + self.star.radius):
-                    self.score -= collision_penalty
-                    self.floating_texts.append(FloatingText(f"Planet crashed!", int(body.x), int(body.y), RED))
-                    self.bodies.pop(i)
-
-            if self.check_collisions(collision_penalty):
-                self.level_start_time = now
-                self.floating_texts.append(FloatingText("Timer Reset!", 150, 560, RED))
-
-            if now - self.last_bonus_time >= 10:
-                self.score += 10
-                # self.floating_texts.append(FloatingText("+10 (survive)", 10, 70, GREEN))
-                self.last_bonus_time = now
-
-            if now - self.last_rogue_spawn >= 20 - min(difficulty, 15) and self.current_level >= 3:
-                self.bodies.append(self.spawn_rogue_body())
-                self.last_rogue_spawn = now
+            profiler.phase("update")
+            self.stepper.run(dt, self.update)
 
-            if self.current_level < len(self.levels):
-                level = self.levels[self.current_level]
-                if len(self.bodies) <= level.target_planets:
-                    self.level_start_time = now
-                if not level.completed and len(self.bodies) - 1 >= level.target_planets and level_elapsed >= level.survive_time:
-                    level.completed = True
-                    self.floating_texts.append(FloatingText(f"Level {level.number} Complete!", WIDTH // 2 - 80, HEIGHT // 2, GREEN))
-                    self.current_level += 1
-                    self.level_start_time = now
+            profiler.phase("draw")
+            lines = self.trail_mode == "lines"
+            if lines:
+                self.screen.fill(BLACK)
+            else:
+                self.fade_trails.draw(self.screen)
+            with profiler.span("draw_bodies"):
+                for body in self.bodies:
+                    body.draw(self.screen, self.stepper.alpha, lines)
 
-            self.particles = [p for p in self.particles if p.update()]
-            for p in self.particles:
-                p.draw(self.screen)
+            self.particles.draw(self.screen, self.particle_sprites)
 
-            self.floating_texts = [t for t in self.floating_texts if t.draw(self.screen)]
+            self.floating_texts.retain(FloatingText.draw, self.screen, seconds())
 
             # self.screen.blit(font.render(f"Score: {self.score}", True, WHITE), (680, 20))
             # self.screen.blit(font.render(f"Time: {elapsed}s", True, WHITE), (680, 560))
-            self.screen.blit(font.render(f"Level: {self.levels[self.current_level].number if self.current_level > 0 else 1}", True, WHITE), (20, 20))
+            text_cache.draw(self.screen, font, f"Level: {self.levels[self.current_level].number if self.current_level > 0 else 1}", (20, 20), WHITE)
 
-            if self.current_level < len(self.levels):
+            if self.sandbox:
+                self.draw_sandbox_status()
+            elif self.current_level < len(self.levels):
+                level_elapsed = int(seconds() - self.level_start_time)
                 self.draw_level_goal(self.levels[self.current_level], level_elapsed)
 
+            profiler.draw(self.screen)
+            profiler.phase("present")
             pygame.display.flip()
-            self.clock.tick(60)
+            profiler.end_frame()
+            dt = self.clock.tick(60) / 1000
             await asyncio.sleep(0)
             
-        pygame.quit()
+        runtime.quit()
 
 if __name__ == "__main__":
     game = GameWindow()
@@ -0,0 +1,85 @@
+import random
+
+import numpy as np
+
+
+class ParticleSystem:
+    """Collision debris as parallel NumPy columns (struct of arrays).
+
+    Live particles are packed in [0, count). update() moves them all and
+    expires the old ones with one mask against the frame time it is handed,
+    instead of every particle asking the clock. Colors are stored as indexes
+    into `colors`, so draw() can batch each color through CircleSprites.
+    """
+
+    COLUMNS = ("x", "y", "vx", "vy", "radius", "birth", "color")
+
+    def __init__(self, capacity=256, lifetime=3.0):
+        self.count = 0
+        self.lifetime = lifetime
+        self.colors = []
+        for name in self.COLUMNS:
+            setattr(self, name, np.zeros(capacity))
+
+    def __len__(self):
+        return self.count
+
+    def grow(self, needed):
+        capacity = len(self.x)
+        while capacity < needed:
+            capacity *= 2
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            bigger = np.zeros(capacity)
+            bigger[:self.count] = column[:self.count]
+            setattr(self, name, bigger)
+
+    def emit(self, x, y, color, count, now):
+        """`count` particles flying out of (x, y), born at `now` seconds."""
+        start, end = self.count, self.count + count
+        if end > len(self.x):
+            self.grow(end)
+        if color not in self.colors:
+            self.colors.append(color)
+        # Drawn from `random` like the old per-object particles, so seeded
+        # runs and replays stay deterministic
+        for i in range(start, end):
+            self.radius[i] = random.randint(2, 4)
+            self.vx[i] = random.uniform(-2, 2)
+            self.vy[i] = random.uniform(-2, 2)
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.birth[start:end] = now
+        self.color[start:end] = self.colors.index(color)
+        self.count = end
+
+    def update(self, now):
+        """Move every particle one step and drop those older than `lifetime`."""
+        n = self.count
+        if not n:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        alive = now - self.birth[:n] < self.lifetime
+        if alive.all():
+            return
+        kept = int(alive.sum())
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:kept] = column[:n][alive]
+        self.count = kept
+
+    def draw(self, screen, sprites):
+        n = self.count
+        if not n:
+            return
+        if len(self.colors) == 1:
+            sprites.draw(screen, self.x[:n], self.y[:n], self.radius[:n], self.colors[0])
+            return
+        for index, color in enumerate(self.colors):
+            mask = self.color[:n] == index
+            if mask.any():
+                sprites.draw(screen, self.x[:n][mask], self.y[:n][mask], self.radius[:n][mask], color)
+
+    def clear(self):
+        self.count = 0
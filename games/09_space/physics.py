@@ -0,0 +1,383 @@
+import math
+
+import numpy as np
+
+G = 6.67430e-11
+# The game's physics was tuned per 1/60 s step: velocities are px per STEP,
+# accelerations px per STEP per STEP, whatever dt the integrator is given
+STEP = 1 / 60
+# Pairs closer than this exert no force (the old per-pair loop skipped them too)
+MIN_DISTANCE = 1e-2
+# The "auto" solver uses Barnes-Hut from this many bodies on; below it the
+# exact sum is faster (gravity_bench.py puts the crossover at 450-700 bodies)
+AUTO_BARNES_HUT = 600
+
+
+def exact_accelerations(x, y, mass, star, gravity_multiplier):
+    """Acceleration on every body from every other one, all pairs at once.
+
+    Gravity between two planets is scaled by `gravity_multiplier`; any pair
+    involving the star (index `star`) uses plain G, so the star's pull stays
+    fixed as levels get harder. Returns (ax, ay) in px per step per step.
+    """
+    # dx[i, j] = x[j] - x[i]; the n x n temporaries are reused in place
+    dx = np.subtract.outer(x, x)
+    dx *= -1
+    dy = np.subtract.outer(y, y)
+    dy *= -1
+    pull = dx * dx
+    pull += dy * dy
+    near = pull < MIN_DISTANCE * MIN_DISTANCE
+    pull[near] = 1.0
+    # pull[i, j] = G * multiplier * m_j / d^3
+    distance = np.sqrt(pull)
+    pull *= distance
+    np.reciprocal(pull, out=pull)
+    pull[near] = 0.0
+    pull *= mass * (G * gravity_multiplier)
+    if star is not None:
+        # Plain G along the star's row and column
+        pull[star, :] /= gravity_multiplier
+        pull[:, star] /= gravity_multiplier
+    return np.einsum("ij,ij->i", pull, dx), np.einsum("ij,ij->i", pull, dy)
+
+
+def spread_bits(v):
+    """Put a zero bit between each of the low 16 bits of `v` (for Morton codes)."""
+    v = v & 0xFFFF
+    v = (v | (v << 8)) & 0x00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F
+    v = (v | (v << 2)) & 0x33333333
+    return (v | (v << 1)) & 0x55555555
+
+
+def ranges(starts, counts):
+    """Concatenation of range(s, s + c) for every (s, c) pair."""
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return offsets + np.arange(int(counts.sum()))
+
+
+class QuadTreeLevel:
+    """The occupied cells of one quadtree depth, as ranges of Morton-sorted bodies."""
+
+    def __init__(self, codes, shift, mass, mass_x, mass_y, centre_x, centre_y):
+        key = codes >> shift
+        first = np.ones(len(codes), dtype=bool)
+        first[1:] = key[1:] != key[:-1]
+        self.starts = np.flatnonzero(first)
+        self.ends = np.append(self.starts[1:], len(codes))
+        self.counts = self.ends - self.starts
+        self.mass = np.add.reduceat(mass, self.starts)
+        self.cx = np.add.reduceat(mass_x, self.starts) / self.mass
+        self.cy = np.add.reduceat(mass_y, self.starts) / self.mass
+        # How far the centre of mass sits from the cell's middle
+        self.offset = np.hypot(self.cx - centre_x[self.starts], self.cy - centre_y[self.starts])
+        # Which cell of this level every (sorted) body sits in
+        self.body_cell = np.cumsum(first) - 1
+        self.child_lo = self.child_hi = None
+
+
+class QuadTree:
+    """Barnes-Hut quadtree over point masses, built and walked one level at a time.
+
+    Bodies are sorted by Morton code, so every cell at every depth is a
+    contiguous run of bodies and its children are a contiguous run of cells
+    one level down. The walk keeps a frontier of (body, cell) pairs: a cell
+    that looks small enough from the body acts as one mass at its centre of
+    mass, a small cell (leaf_size bodies or fewer) is summed body by body,
+    and anything else is replaced by its children.
+    All of it is array operations, no per-node Python.
+    """
+
+    def __init__(self, x, y, mass, depth=16, leaf_size=8):
+        n = len(x)
+        left, top = x.min(), y.min()
+        self.size = max(x.max() - left, y.max() - top, 1e-6) * (1 + 1e-9)
+        cells = 1 << depth
+        ix = np.minimum(((x - left) * (cells / self.size)).astype(np.int64), cells - 1)
+        iy = np.minimum(((y - top) * (cells / self.size)).astype(np.int64), cells - 1)
+        codes = spread_bits(ix) | (spread_bits(iy) << 1)
+        self.order = np.argsort(codes, kind="stable")
+        codes = codes[self.order]
+        self.x = x[self.order]
+        self.y = y[self.order]
+        self.mass = mass[self.order]
+
+        ix = ix[self.order]
+        iy = iy[self.order]
+        self.levels = []
+        for level in range(depth + 1):
+            # Middle of the cell each body is in, at this depth
+            width = self.size / (1 << level)
+            centre_x = left + ((ix >> (depth - level)) + 0.5) * width
+            centre_y = top + ((iy >> (depth - level)) + 0.5) * width
+            cells = QuadTreeLevel(codes, 2 * (depth - level), self.mass, self.mass * self.x, self.mass * self.y,
+                                  centre_x, centre_y)
+            if self.levels:
+                parent = self.levels[-1]
+                parent.child_lo = np.searchsorted(cells.starts, parent.starts)
+                parent.child_hi = np.searchsorted(cells.starts, parent.ends)
+            self.levels.append(cells)
+            if cells.counts.max() <= leaf_size:
+                break
+        self.leaf_size = leaf_size
+        self.n = n
+
+    def accelerations(self, theta):
+        """Sum of m_j * (r_j - r_i) / d^3 for every body (multiply by G yourself)."""
+        n = self.n
+        x, y, mass = self.x, self.y, self.mass
+        ax = np.zeros(n)
+        ay = np.zeros(n)
+        body = np.arange(n)
+        cell = np.zeros(n, dtype=np.intp)
+        last = len(self.levels) - 1
+        for depth, level in enumerate(self.levels):
+            if not len(body):
+                break
+            width = self.size / (1 << depth)
+            dx = level.cx[cell] - x[body]
+            dy = level.cy[cell] - y[body]
+            distance_sq = dx * dx + dy * dy
+
+            # Far enough away (and not holding the body itself): one point mass.
+            # Barnes' criterion, width < theta * (distance - offset), keeps a
+            # lopsided cell from being accepted by a body right next to it
+            distance = np.sqrt(distance_sq)
+            far = ((width < theta * (distance - level.offset[cell])) & (level.body_cell[body] != cell)
+                   & (distance >= MIN_DISTANCE))
+            hit = np.flatnonzero(far)
+            pull = level.mass[cell[hit]] / (distance_sq[hit] * distance[hit])
+            ax += np.bincount(body[hit], pull * dx[hit], n)
+            ay += np.bincount(body[hit], pull * dy[hit], n)
+
+            # Small cells: sum their bodies directly
+            near = ~far
+            leaf = near & ((level.counts[cell] <= self.leaf_size) | (depth == last))
+            counts = level.counts[cell[leaf]]
+            pair_body = np.repeat(body[leaf], counts)
+            other = ranges(level.starts[cell[leaf]], counts)
+            dx = x[other] - x[pair_body]
+            dy = y[other] - y[pair_body]
+            distance_sq = dx * dx + dy * dy
+            skip = distance_sq < MIN_DISTANCE * MIN_DISTANCE
+            distance_sq[skip] = 1.0
+            pull = mass[other] / (distance_sq * np.sqrt(distance_sq))
+            pull[skip] = 0.0
+            ax += np.bincount(pair_body, pull * dx, n)
+            ay += np.bincount(pair_body, pull * dy, n)
+
+            if depth == last:
+                break
+            # Everything else: look at the children next level down
+            opened = near & ~leaf
+            parent = cell[opened]
+            children = level.child_hi[parent] - level.child_lo[parent]
+            body = np.repeat(body[opened], children)
+            cell = ranges(level.child_lo[parent], children)
+
+        unsorted_ax = np.empty(n)
+        unsorted_ay = np.empty(n)
+        unsorted_ax[self.order] = ax
+        unsorted_ay[self.order] = ay
+        return unsorted_ax, unsorted_ay
+
+
+def barnes_hut_accelerations(x, y, mass, star, gravity_multiplier, theta=0.5):
+    """Same result as exact_accelerations(), approximated in O(n log n).
+
+    Only planets go in the tree, since their pull is scaled by
+    gravity_multiplier. The star's pull on everything, and everything's pull
+    on the star, use plain G and are summed exactly.
+    """
+    n = len(x)
+    ax = np.zeros(n)
+    ay = np.zeros(n)
+    planets = np.arange(n) if star is None else np.flatnonzero(np.arange(n) != star)
+    if len(planets):
+        tree = QuadTree(x[planets], y[planets], mass[planets])
+        tree_ax, tree_ay = tree.accelerations(theta)
+        ax[planets] = tree_ax * (G * gravity_multiplier)
+        ay[planets] = tree_ay * (G * gravity_multiplier)
+    if star is not None and len(planets):
+        dx = x[star] - x[planets]
+        dy = y[star] - y[planets]
+        distance_sq = dx * dx + dy * dy
+        skip = distance_sq < MIN_DISTANCE * MIN_DISTANCE
+        distance_sq[skip] = 1.0
+        inv_cube = distance_sq ** -1.5
+        inv_cube[skip] = 0.0
+        ax[planets] += G * mass[star] * inv_cube * dx
+        ay[planets] += G * mass[star] * inv_cube * dy
+        ax[star] = -G * (mass[planets] * inv_cube * dx).sum()
+        ay[star] = -G * (mass[planets] * inv_cube * dy).sum()
+    return ax, ay
+
+
+# Cell offsets that, with the cell itself, reach every neighbour exactly once
+HALF_NEIGHBOURHOOD = ((1, -1), (1, 0), (1, 1), (0, 1))
+# Up to this many bodies, testing every pair is cheaper than building the grid
+ALL_PAIRS_CONTACTS = 64
+all_pairs_cache = {}
+
+
+def all_pairs(n):
+    """Every (i, j) with i < j < n, row-major; built once per n."""
+    pairs = all_pairs_cache.get(n)
+    if pairs is None:
+        pairs = all_pairs_cache[n] = np.triu_indices(n, 1)
+    return pairs
+
+
+def contacts(x, y, radius):
+    """Every pair (i, j), i < j, whose circles overlap, found with a uniform grid.
+
+    Cells are as wide as the largest diameter, so touching circles are in
+    the same or adjacent cells. Bodies are sorted by cell key; each cell is
+    compared with itself and four of its neighbours (the other four see it
+    from their side), all as array operations. Cost grows with the number of
+    bodies and near pairs, not with n^2. A level's few dozen bodies are
+    tested all against all instead, which finds the same pairs.
+    """
+    n = len(x)
+    if n < 2:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    if n <= ALL_PAIRS_CONTACTS:
+        # Row-major, so already sorted by (i, j)
+        i, j = all_pairs(n)
+        gap_x = x[i] - x[j]
+        gap_y = y[i] - y[j]
+        reach = radius[i] + radius[j]
+        touching = gap_x * gap_x + gap_y * gap_y < reach * reach
+        return i[touching], j[touching]
+    cell_size = 2 * radius.max()
+    cx = np.floor(x / cell_size).astype(np.int64)
+    cy = np.floor(y / cell_size).astype(np.int64)
+    # Row-major key with room for any column offset the bodies can reach
+    span = int(cy.max() - cy.min()) + 3
+    keys = (cx - cx.min() + 1) * span + (cy - cy.min() + 1)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    first = []
+    second = []
+    # Same cell: every later body in the run
+    ends = np.searchsorted(sorted_keys, sorted_keys, "right")
+    after = ends - np.arange(n) - 1
+    first.append(np.repeat(np.arange(n), after))
+    second.append(ranges(np.arange(n) + 1, after))
+    for dx, dy in HALF_NEIGHBOURHOOD:
+        target = sorted_keys + dx * span + dy
+        starts = np.searchsorted(sorted_keys, target, "left")
+        counts = np.searchsorted(sorted_keys, target, "right") - starts
+        first.append(np.repeat(np.arange(n), counts))
+        second.append(ranges(starts, counts))
+    a = order[np.concatenate(first)]
+    b = order[np.concatenate(second)]
+
+    gap_x = x[a] - x[b]
+    gap_y = y[a] - y[b]
+    reach = radius[a] + radius[b]
+    touching = gap_x * gap_x + gap_y * gap_y < reach * reach
+    a, b = a[touching], b[touching]
+    i, j = np.minimum(a, b), np.maximum(a, b)
+    pair_order = np.lexsort((j, i))
+    return i[pair_order], j[pair_order]
+
+
+class NBody:
+    """Every body's state as NumPy arrays, stepped in one vectorized pass.
+
+    The game keeps its list of CelestialBody objects; step() gathers their
+    positions, velocities and masses into arrays, computes all accelerations
+    from the same snapshot (so the result no longer depends on list order),
+    and writes the new state back.
+
+    Integration is drift-kick-drift leapfrog, which is symplectic: orbits
+    keep their energy instead of spiralling in or out as they did with Euler
+    steps. substeps() picks how finely to split a frame's dt so no body
+    moves more than `courant` of its own radius per substep. Fast close
+    passes get small steps, and two bodies closing head-on can't jump through
+    each other between collision checks (they close by at most the sum of
+    their radii per substep).
+    """
+
+    SOLVERS = ("auto", "exact", "barnes-hut")
+
+    def __init__(self, solver="auto", theta=0.5, courant=1.0, max_substeps=8):
+        self.x = self.y = self.vx = self.vy = self.mass = np.zeros(0)
+        self.solver = solver
+        # Barnes-Hut opening angle: smaller is more accurate and slower
+        self.theta = theta
+        self.courant = courant
+        self.max_substeps = max_substeps
+
+    def next_solver(self):
+        self.solver = self.SOLVERS[(self.SOLVERS.index(self.solver) + 1) % len(self.SOLVERS)]
+        return self.solver
+
+    def load(self, bodies):
+        n = len(bodies)
+        self.x = np.fromiter((body.x for body in bodies), float, n)
+        self.y = np.fromiter((body.y for body in bodies), float, n)
+        self.vx = np.fromiter((body.vx for body in bodies), float, n)
+        self.vy = np.fromiter((body.vy for body in bodies), float, n)
+        self.mass = np.fromiter((body.mass for body in bodies), float, n)
+
+    def store(self, bodies, ax, ay):
+        for body, x, y, vx, vy, body_ax, body_ay in zip(bodies, self.x.tolist(), self.y.tolist(), self.vx.tolist(),
+                                                         self.vy.tolist(), ax.tolist(), ay.tolist()):
+            body.moved(x, y, vx, vy, body_ax, body_ay)
+
+    def substeps(self, bodies, dt):
+        """How many substeps `dt` seconds need so every body moves under courant * radius per substep.
+
+        Uses each body's speed and its acceleration from the last step (a
+        body's displacement over h is about |v| h + |a| h^2 / 2).
+        """
+        if not bodies:
+            return 1
+        h = dt / STEP
+        worst = 0.0
+        for body in bodies:
+            reach = self.courant * body.radius
+            worst = max(worst, math.hypot(body.vx, body.vy) * h / reach,
+                        h * math.sqrt(math.hypot(body.ax, body.ay) / reach))
+        return min(self.max_substeps, max(1, math.ceil(worst)))
+
+    def contacts(self, bodies, star):
+        """Distance of every body from `star`, and every overlapping pair of bodies (as index lists)."""
+        n = len(bodies)
+        x = np.fromiter((body.x for body in bodies), float, n)
+        y = np.fromiter((body.y for body in bodies), float, n)
+        radius = np.fromiter((body.radius for body in bodies), float, n)
+        i, j = contacts(x, y, radius)
+        star_distance = np.hypot(x - star.x, y - star.y)
+        return star_distance, list(zip(i.tolist(), j.tolist()))
+
+    def active_solver(self, n):
+        """The solver that runs for `n` bodies: "auto" picks by body count."""
+        if self.solver != "auto":
+            return self.solver
+        return "barnes-hut" if n >= AUTO_BARNES_HUT else "exact"
+
+    def accelerations(self, star, gravity_multiplier):
+        if self.active_solver(len(self.x)) == "barnes-hut":
+            return barnes_hut_accelerations(self.x, self.y, self.mass, star, gravity_multiplier, self.theta)
+        return exact_accelerations(self.x, self.y, self.mass, star, gravity_multiplier)
+
+    def step(self, bodies, star, gravity_multiplier, dt=STEP):
+        """Advance `bodies` by `dt` seconds: drift half, kick with a(x), drift half."""
+        if not bodies:
+            return
+        h = dt / STEP
+        self.load(bodies)
+        star_index = bodies.index(star) if star in bodies else None
+        self.x += self.vx * (h / 2)
+        self.y += self.vy * (h / 2)
+        ax, ay = self.accelerations(star_index, gravity_multiplier)
+        self.vx += ax * h
+        self.vy += ay * h
+        self.x += self.vx * (h / 2)
+        self.y += self.vy * (h / 2)
+        self.store(bodies, ax, ay)
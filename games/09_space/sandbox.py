@@ -0,0 +1,168 @@
+"""Headless level validator: how often can each Level be cleared?
+
+Runs the real GameWindow.update() on the uncapped virtual clock with no
+window and no drawing, so a level's minutes of game time take a second or
+two. A scripted player puts planets down through GameWindow.place_body(), the
+same code a mouse click runs, replacing lost planets until the level's
+target is met. Every (level, seed) run is independent (a fresh system with
+only the star), and the runs are spread over worker processes.
+
+--body picks the planet the player places, as keys 1-3 do in the game
+(default: whatever is selected at the start of a game).
+
+Placement policies:
+    rings   each planet on its own orbit, 70-280 px out (a careful player)
+    random  clicks anywhere in the play area, like bench.py (a careless one)
+
+    python games/09_space/sandbox.py                       # every level, 32 seeds
+    python games/09_space/sandbox.py --levels 7 8 9 10 --seeds 200 --policy random
+    python games/09_space/sandbox.py --timeout 60 --json levels.json
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+GAMES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POLICIES = ("rings", "random")
+BODIES = ("default", "1", "2", "3")
+RING_INNER, RING_OUTER, RING_SPACING = 70, 280, 30
+
+# One GameWindow per worker process, reset for every run, and its main module
+game = None
+game_module = None
+
+
+def init_worker():
+    global game, game_module
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    # Otherwise SDL turns SIGTERM into a quit event and Pool.terminate() waits forever
+    os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"
+    sys.path.insert(0, GAMES_DIR)
+    from bench import load_game
+    from shared.clock import settings
+
+    settings.uncapped = True
+    settings.virtual_ms = 0.0
+    game_module, game = load_game("09_space", 0)
+
+
+def placement(policy, placed, rng):
+    """Where the scripted player clicks for its `placed`-th planet."""
+    if policy == "random":
+        return rng.randint(100, 699), rng.randint(50, 549)
+    rings = (RING_OUTER - RING_INNER) // RING_SPACING + 1
+    distance = RING_INNER + placed % rings * RING_SPACING
+    angle = rng.uniform(0, 2 * math.pi)
+    return game.star.x + math.cos(angle) * distance, game.star.y + math.sin(angle) * distance
+
+
+def run_level(task):
+    """Play one level from an empty system; returns the run's outcome."""
+    index, seed, policy, body, timeout, place_every = task
+    import pygame
+    from shared.clock import settings
+    from physics import STEP
+
+    random.seed(seed)
+    rng = random.Random(seed)
+    settings.virtual_ms = 0.0
+    game.reset()
+    if body != "default":
+        game.key_mass, game.key_radius, game.key_color = game_module.BODY_KEYS[pygame.key.key_code(body)]
+    for level in game.levels:
+        level.completed = False
+    game.current_level = index
+    level = game.levels[index]
+
+    steps = int(timeout / STEP)
+    place_steps = max(1, round(place_every / STEP))
+    placed = lost = 0
+    for step in range(steps):
+        if step % place_steps == 0 and len(game.bodies) - 1 < level.target_planets:
+            game.place_body(*placement(policy, placed, rng))
+            placed += 1
+        before = game.bodies
+        game.update(STEP)
+        if game.bodies is not before:
+            # Contacts rebuilt the list; rogue bodies are only ever appended
+            lost += len(set(map(id, before)) - set(map(id, game.bodies)))
+        settings.virtual_ms += STEP * 1000
+        if level.completed:
+            break
+    return {
+        "level": level.number,
+        "seed": seed,
+        "cleared": level.completed,
+        "seconds": (step + 1) * STEP,
+        "placed": placed,
+        # Planets that crashed, collided or escaped (rogue bodies included)
+        "lost": lost,
+    }
+
+
+def summarize(runs):
+    cleared = sorted(run["seconds"] for run in runs if run["cleared"])
+    return {
+        "runs": len(runs),
+        "cleared": len(cleared) / len(runs),
+        "median_s": cleared[len(cleared) // 2] if cleared else None,
+        "p90_s": cleared[min(len(cleared) - 1, int(len(cleared) * 0.9))] if cleared else None,
+        "mean_placed": sum(run["placed"] for run in runs) / len(runs),
+        "mean_lost": sum(run["lost"] for run in runs) / len(runs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, nargs="+", help="level numbers to check (default: all)")
+    parser.add_argument("--seeds", type=int, default=32, help="runs per level")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--policy", choices=POLICIES, default="rings")
+    parser.add_argument("--body", choices=BODIES, default="default", help="planet type key")
+    parser.add_argument("--timeout", type=float, default=120, help="simulated seconds before a run counts as failed")
+    parser.add_argument("--place-every", type=float, default=0.5,
+                        help="simulated seconds between the scripted player's clicks")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--json", help="write every run and the per-level summary to this file")
+    args = parser.parse_args()
+
+    # The level table lives in GameWindow; read it from a worker-style game
+    init_worker()
+    levels = [(index, level) for index, level in enumerate(game.levels)
+              if not args.levels or level.number in args.levels]
+    tasks = [(index, seed, args.policy, args.body, args.timeout, args.place_every)
+             for index, _ in levels for seed in range(args.first_seed, args.first_seed + args.seeds)]
+
+    start = time.perf_counter()
+    # "spawn" gives every worker a clean pygame, whatever the platform default
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(args.workers, initializer=init_worker) as pool:
+        runs = pool.map(run_level, tasks, chunksize=max(1, len(tasks) // (args.workers * 4)))
+    elapsed = time.perf_counter() - start
+    simulated = sum(run["seconds"] for run in runs)
+
+    print(f"{'level':>5}{'planets':>9}{'survive':>9}{'runs':>6}{'cleared':>9}{'median s':>10}{'p90 s':>8}{'placed':>8}{'lost':>7}")
+    summary = {}
+    for index, level in levels:
+        row = summarize([run for run in runs if run["level"] == level.number])
+        summary[level.number] = row
+        median = f"{row['median_s']:.1f}" if row["median_s"] is not None else "-"
+        p90 = f"{row['p90_s']:.1f}" if row["p90_s"] is not None else "-"
+        print(f"{level.number:>5}{level.target_planets:>9}{level.survive_time:>9}{row['runs']:>6}"
+              f"{row['cleared']:>9.0%}{median:>10}{p90:>8}{row['mean_placed']:>8.1f}{row['mean_lost']:>7.1f}")
+    print(f"{len(runs)} runs, {simulated / 60:.0f} simulated minutes in {elapsed:.1f} s "
+          f"on {args.workers} workers ({simulated / elapsed:.0f}x real time), policy {args.policy}, body {args.body}")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"policy": args.policy, "body": args.body, "timeout": args.timeout, "summary": summary, "runs": runs}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
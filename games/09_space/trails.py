@@ -0,0 +1,71 @@
+import pygame
+
+
+class TrailRing:
+    """A body's last `length` positions in a preallocated ring buffer.
+
+    append() overwrites the oldest point once the buffer is full, so keeping
+    the trail is O(1) per step instead of list.pop(0). The slots are a plain
+    list of (x, y) tuples: pygame.draw.lines wants a sequence of points, and
+    two list slices are cheaper than converting an array every frame.
+    """
+
+    def __init__(self, length=101):
+        self.buffer = [(0, 0)] * length
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, x, y):
+        self.buffer[self.head] = (x, y)
+        self.head = (self.head + 1) % len(self.buffer)
+        if self.count < len(self.buffer):
+            self.count += 1
+
+    def points(self):
+        """Oldest to newest."""
+        if self.count < len(self.buffer):
+            return self.buffer[:self.count]
+        return self.buffer[self.head:] + self.buffer[:self.head]
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def draw(self, screen, color):
+        if self.count > 2:
+            pygame.draw.lines(screen, color, False, self.points(), 1)
+
+
+class FadeTrails:
+    """Trails painted onto a persistent surface that darkens a little every step.
+
+    Each step only the newest segment of every body is drawn, and the whole
+    surface is dimmed by `fade` with one subtractive blit, so the cost no
+    longer depends on trail length. The surface is blitted as the frame's
+    background instead of filling the screen black.
+    """
+
+    def __init__(self, size, fade=3):
+        self.surface = pygame.Surface(size)
+        # Blitting a flat surface with BLEND_RGB_SUB is far faster than
+        # fill(..., special_flags=BLEND_RGB_SUB) on the same area
+        self.dimmer = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()
+            self.dimmer = self.dimmer.convert()
+        self.dimmer.fill((fade, fade, fade))
+        self.clear()
+
+    def clear(self):
+        self.surface.fill((0, 0, 0))
+
+    def step(self, bodies):
+        self.surface.blit(self.dimmer, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+        for body in bodies:
+            pygame.draw.line(self.surface, body.color, (int(body.prev_x), int(body.prev_y)), (int(body.x), int(body.y)))
+
+    def draw(self, screen):
+        screen.blit(self.surface, (0, 0))
@@ -2,15 +2,29 @@ import pygame
 import random
 import colorsys
 import asyncio
+import os
+import sys
+
+# Shared helpers live in games/shared (copied next to main.py for pygbag builds)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared.text import text_cache
+from shared.render import DirtyRenderer
+from shared.scheduler import FrameScheduler
+from shared.clock import ticks
+from shared.profiler import profiler
+from shared.runtime import runtime
 
 class GameWindow:
     def __init__(self):
-        pygame.init()
+        runtime.init()
 
         self.screen_width = 800
         self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        self.screen = runtime.display((self.screen_width, self.screen_height))
         pygame.display.set_caption("Color Correct")
+        # The color grid only changes on clicks, so only changed frames are presented
+        self.renderer = DirtyRenderer(self.screen)
+        self.scene = None
 
         self.GREY = (178, 190, 181)
         self.BLACK = (0, 0, 0)
@@ -20,9 +34,10 @@ class GameWindow:
         self.flash_size = 250
         self.choice_size = 147  # Fixed size for squares
         self.margin = 10       # Margin between squares
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = runtime.font(None, 48)
 
-        self.clock = pygame.time.Clock()
+        # Event driven: sleep until input, the flash ending or the round timer
+        self.scheduler = FrameScheduler()
         self.dt = 0
 
         self.round = 1
@@ -58,7 +73,7 @@ class GameWindow:
         self.COLORS = self.generate_shades(self.hue, self.num_shades)
         self.flash_color_name = random.choice(list(self.COLORS.keys()))
         self.flash_color = self.COLORS[self.flash_color_name]
-        self.flash_start_time = pygame.time.get_ticks()
+        self.flash_start_time = ticks()
         self.showing_flash = True
         self.user_selected = False
         self.result_text = ""
@@ -98,18 +113,24 @@ class GameWindow:
                 elif self.selected_rect and rect == self.selected_rect:
                     pygame.draw.rect(self.screen, self.RED, rect, 5)
 
+    def launch_launcher(self):
+        runtime.launch_launcher()
+
     async def main(self):
         running = True
         while running:
+            profiler.begin_frame()
+            profiler.phase("events")
             self.screen.fill(self.GREY)
-            current_time = pygame.time.get_ticks()
+            current_time = ticks()
 
             for event in pygame.event.get():
+                profiler.handle_event(event)
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
-                        pass
+                        self.launch_launcher()
                     elif event.key == pygame.K_r:
                         self.reset()
                 elif not self.showing_flash and event.type == pygame.MOUSEBUTTONDOWN and not self.user_selected:
@@ -132,29 +153,37 @@ class GameWindow:
                     self.round += 1
                     self.next_round()
 
+            profiler.phase("draw")
+            # End the flash before drawing, so its last frame already shows the choices
+            if self.showing_flash and current_time - self.flash_start_time >= self.flash_duration:
+                self.showing_flash = False
             if self.showing_flash:
-                if current_time - self.flash_start_time < self.flash_duration:
-                    self.draw_flash_square()
-                else:
-                    self.showing_flash = False
+                self.draw_flash_square()
             else:
                 self.draw_choice_squares()
 
-            round_info = self.font.render(f"Round {self.round}", True, self.BLACK)
-            self.screen.blit(round_info, (20, 30))
-
-            score_info = self.font.render(f"Score {self.score}", True, self.BLACK) 
-            self.screen.blit(score_info, (600, 30))
+            text_cache.draw(self.screen, self.font, f"Round {self.round}", (20, 30), self.BLACK)
+            text_cache.draw(self.screen, self.font, f"Score {self.score}", (600, 30), self.BLACK)
 
             if self.user_selected:
-                text = self.font.render(f"{self.result_text}", True, self.BLACK)
+                text = text_cache.render(self.font, self.result_text, self.BLACK)
                 self.screen.blit(text, ((self.screen_width - text.get_width()) // 2, 30))
 
-            pygame.display.flip()
-            self.dt = self.clock.tick(60) / 1000
-            await asyncio.sleep(0)
-
-        pygame.quit()
+            # Every change here is a new round, the flash ending or a pick
+            scene = (self.round, self.score, self.showing_flash, self.user_selected)
+            if scene != self.scene:
+                self.renderer.invalidate()
+                self.scene = scene
+
+            self.renderer.mark(profiler.draw(self.screen))
+            profiler.phase("present")
+            self.renderer.present()
+            profiler.end_frame()
+            deadline = self.flash_start_time + self.flash_duration if self.showing_flash else None
+            await self.scheduler.next_frame(deadline=deadline)
+            self.dt = self.scheduler.dt
+
+        runtime.quit()
 
 if __name__ == "__main__":
     game = GameWindow()
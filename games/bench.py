@@ -0,0 +1,225 @@
+"""Headless, deterministic frame-time benchmark for every game.
+
+Each game runs in its own process under SDL's dummy video driver with a fixed
+random seed, an uncapped clock (fixed 1/60 s steps, no sleeping) and a scripted
+stream of input events. Reports frames/sec and p50/p95/p99 frame times.
+
+    python games/bench.py                      # every game, 600 frames
+    python games/bench.py 02 09 --frames 2000  # games whose folder starts with 02 / 09
+    python games/bench.py --json today.json --compare yesterday.json
+    python games/bench.py 09 --trace traces    # also write traces/<game>.json (Chrome trace)
+    python games/bench.py --replay late_wave.rec   # replay a recorded session (see replay.py)
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+GAMES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Scripted input per game: which keys to press, how often, and where to click.
+# ESC is never scripted, it leaves the game.
+SCRIPTS = {
+    "01_card_guessing_game": {"keys": ["K_LEFT", "K_RIGHT", "K_UP", "K_DOWN", "K_SPACE"], "key_every": 10},
+    "02_dodge_ball": {"keys": ["K_q", "K_e"], "key_every": 240},
+    "03_drinking_game": {"click_every": 20, "click_area": (60, 280, 700, 300)},
+    "04_duck_duck_goose": {"click_every": 15, "click_area": (0, 50, 800, 400)},
+    "05_maze_v2": {"keys": ["K_UP", "K_DOWN", "K_LEFT", "K_RIGHT", "K_m"], "key_every": 5},
+    "06_match_the_meaning": {"keys": ["K_1", "K_2", "K_3", "K_4", "K_5", "K_6"], "key_every": 30},
+    "07_duck_hunt": {"click_every": 20, "click_area": (0, 0, 800, 600)},
+    "08_ceo_simulator": {"click_every": 30, "click_area": (250, 180, 300, 300)},
+    "09_space": {"keys": ["K_1", "K_2", "K_3"], "key_every": 90, "click_every": 12, "click_area": (100, 50, 600, 500)},
+    "10_color_correct": {"click_every": 25, "click_area": (10, 80, 780, 460)},
+}
+
+
+def list_games(prefixes):
+    games = sorted(
+        name for name in os.listdir(GAMES_DIR)
+        if os.path.isfile(os.path.join(GAMES_DIR, name, "main.py")) and name[:2].isdigit()
+    )
+    if prefixes:
+        games = [name for name in games if any(name.startswith(p) for p in prefixes)]
+    return games
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(frame_times):
+    ordered = sorted(frame_times)
+    total = sum(frame_times)
+    return {
+        "frames": len(frame_times),
+        "fps": len(frame_times) / total if total else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+    }
+
+
+def scripted_events(pygame, script, frame, rng):
+    """Input events to post before `frame` runs."""
+    events = []
+    key_every = script.get("key_every")
+    if key_every and frame % key_every == 0:
+        key = getattr(pygame, rng.choice(script["keys"]))
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+        events.append(pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode="", scancode=0))
+    click_every = script.get("click_every")
+    if click_every and frame % click_every == 0:
+        x, y, w, h = script["click_area"]
+        pos = (rng.randint(x, x + w - 1), rng.randint(y, y + h - 1))
+        events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos))
+        events.append(pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=pos))
+    return events
+
+
+def load_game(name, seed):
+    """Import games/<name>/main.py and build its GameWindow with a fixed seed."""
+    game_dir = os.path.join(GAMES_DIR, name)
+    os.chdir(game_dir)  # assets are loaded relative to the game folder
+    sys.path.insert(0, GAMES_DIR)
+
+    # Games call random.seed() with no argument in __init__; keep them on our seed
+    original_seed = random.seed
+    random.seed = lambda a=None, *args, **kwargs: original_seed(seed if a is None else a, *args, **kwargs)
+    random.seed(seed)
+    try:
+        spec = importlib.util.spec_from_file_location(f"game_{name}", os.path.join(game_dir, "main.py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module, module.GameWindow()
+    finally:
+        random.seed = original_seed
+
+
+def run_one(name, frames, warmup, seed, replay=None):
+    """Benchmark one game in this process and return its summary.
+
+    With `replay` (a recording from replay.py) the game, seed, input and
+    frame count all come from the recording instead of SCRIPTS.
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    import pygame
+    from shared.clock import settings
+    from shared.replay import InputPlayer
+
+    settings.uncapped = True
+    settings.virtual_ms = 0.0
+    player = None
+    if replay:
+        player = InputPlayer(replay)
+        name, seed, frames = player.name, player.seed, max(0, len(player.frames) - warmup)
+
+    script = SCRIPTS.get(name, {})
+    rng = random.Random(seed)
+    frame_times = []
+    state = {"frame": 0, "last": None}
+
+    def on_tick():
+        now = time.perf_counter()
+        if state["last"] is not None and state["frame"] > warmup:
+            frame_times.append(now - state["last"])
+        state["last"] = now
+        state["frame"] += 1
+        if state["frame"] >= warmup + frames:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+            return
+        if player is None:
+            for event in scripted_events(pygame, script, state["frame"], rng):
+                pygame.event.post(event)
+
+    settings.on_tick = on_tick
+    if player:
+        player.install()
+    _, game = load_game(name, seed)
+    try:
+        asyncio.run(game.main())
+    except SystemExit:
+        pass
+    result = summarize(frame_times)
+    result["game"] = f"{name}:{os.path.basename(replay)}" if replay else name
+    return result
+
+
+def run_in_subprocess(name, args, replay=None):
+    command = [sys.executable, os.path.abspath(__file__), "--child", name,
+               "--frames", str(args.frames), "--warmup", str(args.warmup), "--seed", str(args.seed)]
+    if replay:
+        command += ["--replay", os.path.abspath(replay)]
+    env = dict(os.environ)
+    if args.trace:
+        os.makedirs(args.trace, exist_ok=True)
+        # Picked up by shared.profiler in the child, written when it exits
+        env["PROFILE_TRACE"] = os.path.abspath(os.path.join(args.trace, f"{name}.json"))
+    proc = subprocess.run(command, capture_output=True, text=True, env=env)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    error = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+    return {"game": name, "error": error}
+
+
+def print_table(results, baseline):
+    print(f"{'game':<24}{'fps':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for result in results:
+        if "error" in result:
+            print(f"{result['game']:<24}  failed: {result['error']}")
+            continue
+        line = (f"{result['game']:<24}{result['fps']:>10.1f}{result['p50_ms']:>9.2f}"
+                f"{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}{result['max_ms']:>9.2f}")
+        old = baseline.get(result["game"])
+        if old and "p95_ms" in old and old["p95_ms"]:
+            change = (result["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100
+            line += f"   p95 {change:+.1f}% vs baseline"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("games", nargs="*", help="folder name prefixes, e.g. 02 09_space (default: all)")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="results file from an earlier run to diff against")
+    parser.add_argument("--trace", help="directory to write a per-phase Chrome trace for each game into")
+    parser.add_argument("--replay", action="append", default=[], help="input recording to benchmark (repeatable)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        replay = args.replay[0] if args.replay else None
+        print(json.dumps(run_one(args.child, args.frames, args.warmup, args.seed, replay)))
+        return
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = {result["game"]: result for result in json.load(file)["results"]}
+
+    if args.replay:
+        results = [run_in_subprocess("replay", args, replay) for replay in args.replay]
+    else:
+        results = [run_in_subprocess(name, args) for name in list_games(args.games)]
+    print_table(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"seed": args.seed, "frames": args.frames, "time": time.time(), "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import pygame
+import asyncio
+import glob
+import importlib.util
+import os
+import sys
+import time
+
+# Shared helpers live in games/shared (copied next to main.py for pygbag builds)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared.assets import cache
+from shared.text import text_cache
+from shared.scheduler import FrameScheduler
+from shared.runtime import runtime, ReturnToLauncher, QuitLauncher
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def find_games():
+    """Game folders next to the launcher (pygbag build) or next to its folder (checkout)."""
+    for root in (HERE, os.path.dirname(HERE)):
+        games = sorted(
+            os.path.join(root, name) for name in os.listdir(root)
+            if name[:2].isdigit() and os.path.isfile(os.path.join(root, name, "main.py"))
+        )
+        if games:
+            return games
+    return []
+
+
+def game_title(game_dir):
+    return os.path.basename(game_dir)[3:].replace("_", " ").title()
+
+
+def asset_paths(game_dir):
+    paths = []
+    for extension in ("png", "jpg", "jpeg"):
+        paths += glob.glob(os.path.join(game_dir, "images", "**", f"*.{extension}"), recursive=True)
+    return sorted(paths)
+
+
+class LauncherWindow:
+    """Menu that runs every game's GameWindow in this process.
+
+    The window, fonts, asset cache and text cache stay alive between games, so
+    switching doesn't re-run pygame.init() or decode images again. While the
+    menu is open, the selected game's images are decoded into the shared cache
+    in small time slices.
+    """
+
+    def __init__(self):
+        runtime.hosted = True
+        runtime.init()
+        self.screen_width = 800
+        self.screen_height = 600
+        self.screen = runtime.display((self.screen_width, self.screen_height), "Games")
+
+        self.WHITE = (255, 255, 255)
+        self.GREY = (178, 190, 181)
+        self.GREY2 = (100, 100, 100)
+        self.BLACK = (0, 0, 0)
+        self.GOLD = (243, 175, 25)
+
+        self.font = runtime.font(None, 55)
+        self.small_font = runtime.font(None, 34)
+
+        self.games = find_games()
+        self.modules = {}
+        self.selected = 0
+        self.buttons = []
+        self.warm_task = None
+        self.warm_target = None
+        self.warmed = set()
+        # Longest stretch one warm-up slice may block the menu
+        self.warm_slice = 0.008
+
+    def load_module(self, game_dir):
+        module = self.modules.get(game_dir)
+        if module is None:
+            name = f"game_{os.path.basename(game_dir)}"
+            spec = importlib.util.spec_from_file_location(name, os.path.join(game_dir, "main.py"))
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            self.modules[game_dir] = module
+        return module
+
+    async def warm_up(self, game_dir):
+        """Decode a game's images into the shared cache without freezing the menu.
+
+        Stops after half the cache budget so warming one game (07's city
+        backgrounds are huge) doesn't evict everything else.
+        """
+        started = time.perf_counter()
+        loaded = 0
+        for path in asset_paths(game_dir):
+            if loaded > cache.budget_bytes // 2:
+                break
+            try:
+                # Backgrounds are JPEGs and are loaded without alpha by the games
+                loaded += cache.surface_bytes(cache.load(path, alpha=not path.lower().endswith((".jpg", ".jpeg"))))
+            except pygame.error as e:
+                print(f"Error preloading {path}: {e}")
+            if time.perf_counter() - started > self.warm_slice:
+                await asyncio.sleep(0)
+                started = time.perf_counter()
+        self.warmed.add(game_dir)
+
+    def warm(self, game_dir):
+        if game_dir in self.warmed or game_dir == self.warm_target and self.warming():
+            return
+        if self.warm_task:
+            self.warm_task.cancel()
+        self.warm_target = game_dir
+        self.warm_task = asyncio.create_task(self.warm_up(game_dir))
+
+    def warming(self):
+        return self.warm_task is not None and not self.warm_task.done()
+
+    async def play(self, game_dir):
+        """Run a game until it hands back control; False if its window was closed."""
+        # Warm-up slices would otherwise keep eating into the game's frames
+        if self.warm_task:
+            self.warm_task.cancel()
+            self.warm_task = None
+        cwd = os.getcwd()
+        # Games load their assets relative to their own folder
+        os.chdir(game_dir)
+        try:
+            game = self.load_module(game_dir).GameWindow()
+            await game.main()
+        except ReturnToLauncher:
+            pass
+        except QuitLauncher:
+            return False
+        finally:
+            os.chdir(cwd)
+            self.restore()
+        return True
+
+    def restore(self):
+        """Undo what a game may have left behind."""
+        pygame.time.set_timer(pygame.USEREVENT, 0)
+        pygame.mouse.set_visible(True)
+        try:
+            pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
+        except pygame.error:
+            pass  # No system cursors (e.g. headless)
+        pygame.event.clear()
+        self.screen = runtime.display((self.screen_width, self.screen_height), "Games")
+
+    def draw(self):
+        self.screen.fill(self.GREY)
+        text_cache.draw(self.screen, self.font, "Games", (40, 30), self.BLACK)
+
+        self.buttons = []
+        for i, game_dir in enumerate(self.games):
+            column, row = divmod(i, 5)
+            rect = pygame.Rect(40 + column * 370, 110 + row * 85, 350, 70)
+            color = self.GOLD if i == self.selected else self.WHITE
+            pygame.draw.rect(self.screen, color, rect)
+            number = (i + 1) % 10
+            text_cache.draw(self.screen, self.small_font, f"{number}. {game_title(game_dir)}", (rect.x + 15, rect.y + 22), self.BLACK)
+            self.buttons.append(rect)
+
+        if self.games:
+            status = "Loading..." if self.warming() and self.warm_target == self.games[self.selected] else "Ready"
+            text_cache.draw(self.screen, self.small_font, f"Enter to play, ESC in a game to come back. {status}",
+                            (40, self.screen_height - 60), self.GREY2)
+
+    def handle_key(self, key):
+        """Move the selection; returns the index of a game to start, if any."""
+        if not self.games:
+            return None
+        if key in (pygame.K_RETURN, pygame.K_SPACE):
+            return self.selected
+        if pygame.K_0 <= key <= pygame.K_9:
+            index = (key - pygame.K_1) % 10
+            return index if index < len(self.games) else None
+        if key == pygame.K_UP:
+            self.selected = (self.selected - 1) % len(self.games)
+        elif key == pygame.K_DOWN:
+            self.selected = (self.selected + 1) % len(self.games)
+        elif key == pygame.K_LEFT:
+            self.selected = max(0, self.selected - 5)
+        elif key == pygame.K_RIGHT:
+            self.selected = min(len(self.games) - 1, self.selected + 5)
+        return None
+
+    async def main(self):
+        # The menu is event driven; it only runs at full rate while warming up
+        scheduler = FrameScheduler()
+        running = True
+
+        while running:
+            launch = None
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    launch = self.handle_key(event.key)
+                elif event.type == pygame.MOUSEMOTION:
+                    for i, rect in enumerate(self.buttons):
+                        if rect.collidepoint(event.pos):
+                            self.selected = i
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    for i, rect in enumerate(self.buttons):
+                        if rect.collidepoint(event.pos):
+                            launch = i
+
+            if launch is not None and running:
+                if not await self.play(self.games[launch]):
+                    break
+                # Most likely played next, so start decoding it right away
+                self.selected = (launch + 1) % len(self.games)
+                scheduler.wake()
+
+            if self.games:
+                self.warm(self.games[self.selected])
+            self.draw()
+            pygame.display.flip()
+            await scheduler.next_frame(animating=self.warming())
+
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    launcher = LauncherWindow()
+    asyncio.run(launcher.main())
@@ -0,0 +1,71 @@
+"""Record a play session's input and replay it frame for frame.
+
+    python games/replay.py record 09 heavy.rec         # play 09_space, input goes to heavy.rec
+    python games/replay.py record 05 maze.rec --seed 7
+    python games/replay.py play heavy.rec              # watch it again (uncapped)
+    python games/replay.py play heavy.rec --realtime   # at the recorded speed
+    python games/bench.py --replay heavy.rec           # benchmark it
+
+Recordings store the RNG seed, every event batch, the keyboard/mouse state
+and the frame timeline, so a replay follows exactly the same code paths.
+"""
+import argparse
+import asyncio
+import os
+import random
+
+from bench import list_games, load_game
+from shared.replay import InputPlayer, InputRecorder
+
+
+def run(game):
+    try:
+        asyncio.run(game.main())
+    except SystemExit:
+        pass
+
+
+def record(args):
+    games = list_games([args.game])
+    if not games:
+        raise SystemExit(f"no game folder starts with {args.game!r}")
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 31)
+    recorder = InputRecorder(os.path.abspath(args.file), seed, games[0])
+    recorder.install()
+    _, game = load_game(games[0], seed)
+    try:
+        run(game)
+    finally:
+        recorder.close()
+
+
+def play(args):
+    player = InputPlayer(os.path.abspath(args.file), realtime=args.realtime)
+    print(f"Replaying {len(player.frames)} frames of {player.name} (seed {player.seed})")
+    player.install()
+    _, game = load_game(player.name, player.seed)
+    try:
+        run(game)
+    finally:
+        player.uninstall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="play a game and record its input")
+    record_parser.add_argument("game", help="game folder prefix, e.g. 09 or 05_maze")
+    record_parser.add_argument("file")
+    record_parser.add_argument("--seed", type=int, help="RNG seed (default: random, stored in the file)")
+    play_parser = commands.add_parser("play", help="replay a recording")
+    play_parser.add_argument("file")
+    play_parser.add_argument("--realtime", action="store_true", help="pace frames like the recording")
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args)
+    else:
+        play(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# Helpers shared by every game in games/*. The pygbag workflow copies this
+# folder next to each main.py before building, so games import it as `shared`.
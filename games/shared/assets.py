@@ -0,0 +1,91 @@
+import os
+from collections import OrderedDict
+
+import pygame
+
+
+class AssetCache:
+    """Decoded, converted and pre-scaled surfaces keyed by (path, size, alpha)."""
+
+    def __init__(self, budget_bytes=96 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.surfaces = OrderedDict()
+
+    def load(self, path, size=None, alpha=True):
+        """Return the image at `path`, scaled to `size` (or native size if None).
+
+        alpha=True converts with convert_alpha(), alpha=False with convert().
+        Raises pygame.error like pygame.image.load when the file can't be read.
+        """
+        key = (os.path.abspath(path), tuple(size) if size else None, alpha)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        if size:
+            # Scaled variants are built from the cached native decode so each
+            # file is only read from disk once
+            surface = pygame.transform.scale(self.load(path, None, alpha), key[1])
+        else:
+            surface = self.convert(pygame.image.load(key[0]), alpha)
+        self.store(key, surface)
+        return surface
+
+    def load_scaled_height(self, path, height, alpha=True):
+        """Load an image scaled to `height`, keeping its aspect ratio."""
+        image = self.load(path, None, alpha)
+        aspect_ratio = image.get_width() / image.get_height()
+        return self.load(path, (int(height * aspect_ratio), height), alpha)
+
+    def preload(self, paths, alpha=True):
+        """Warm the cache so the first frames don't touch the filesystem."""
+        for path in paths:
+            try:
+                self.load(path, None, alpha)
+            except pygame.error as e:
+                print(f"Error preloading {path}: {e}")
+
+    def convert(self, surface, alpha):
+        # convert() needs a display mode; before set_mode keep the raw decode
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def store(self, key, surface):
+        self.surfaces[key] = surface
+        self.used_bytes += self.surface_bytes(surface)
+        # Evict least recently used entries, but never the one just added
+        while self.used_bytes > self.budget_bytes and len(self.surfaces) > 1:
+            _, old = self.surfaces.popitem(last=False)
+            self.used_bytes -= self.surface_bytes(old)
+            self.evictions += 1
+
+    def surface_bytes(self, surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def clear(self):
+        self.surfaces.clear()
+        self.used_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.surfaces),
+            "used_bytes": self.used_bytes,
+            "budget_bytes": self.budget_bytes,
+        }
+
+
+# One cache per process so every game (and the launcher) shares decoded images
+cache = AssetCache()
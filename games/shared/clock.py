@@ -0,0 +1,68 @@
+import asyncio
+
+import pygame
+
+
+class ClockSettings:
+    """Process-wide switches a benchmark or replay harness flips before running a game."""
+
+    def __init__(self):
+        # Don't sleep in tick(); every frame reports exactly `fixed_dt_ms`
+        self.uncapped = False
+        self.fixed_dt_ms = 1000 / 60
+        # Called at the end of every frame, before pacing (harness stepping hook)
+        self.on_tick = None
+        # Called after pacing with the dt tick() returns (input recorder hook)
+        self.on_frame = None
+        self.virtual_ms = 0.0
+
+
+settings = ClockSettings()
+
+
+class Clock:
+    """Drop-in for pygame.time.Clock that a harness can uncap and step."""
+
+    def __init__(self):
+        self.clock = pygame.time.Clock()
+
+    def tick(self, framerate=0):
+        if settings.on_tick:
+            settings.on_tick()
+        if settings.uncapped:
+            self.clock.tick()
+            settings.virtual_ms += settings.fixed_dt_ms
+            dt = settings.fixed_dt_ms
+        else:
+            dt = self.clock.tick(framerate)
+        if settings.on_frame:
+            settings.on_frame(dt)
+        return dt
+
+    def get_fps(self):
+        return self.clock.get_fps()
+
+
+def ticks():
+    """Milliseconds since start; use instead of pygame.time.get_ticks() for game timers.
+
+    Uncapped runs advance a virtual clock by one fixed step per frame, so timers
+    behave the same at 60 fps and at thousands of frames per second.
+    """
+    if settings.uncapped:
+        return int(settings.virtual_ms)
+    return pygame.time.get_ticks()
+
+
+def seconds():
+    """Seconds since start, on the same timeline as ticks()."""
+    if settings.uncapped:
+        return settings.virtual_ms / 1000
+    return pygame.time.get_ticks() / 1000
+
+
+async def sleep(delay):
+    """asyncio.sleep that returns immediately in uncapped runs."""
+    if settings.uncapped:
+        delay = 0
+    await asyncio.sleep(delay)
@@ -0,0 +1,46 @@
+class FixedStep:
+    """Fixed-rate simulation steps driven by variable frame times.
+
+    Each frame, feed the frame's dt (seconds) to run(); it calls update(step)
+    as many times as the accumulated time allows, so gameplay runs at the same
+    speed whatever the frame rate. After a spike at most `max_steps` are run
+    and the rest of the backlog is dropped, so a slow browser tab slows down
+    instead of freezing. `alpha` (0..1) is how far the frame is between the
+    last two steps; draw positions with lerp(previous, current).
+    """
+
+    def __init__(self, rate=60, max_steps=5, speed=1.0):
+        self.step = 1 / rate
+        self.max_steps = max_steps
+        # Simulated seconds per real second (headless runs can go faster)
+        self.speed = speed
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.steps = 0
+        self.total_steps = 0
+        self.dropped = 0.0
+
+    def run(self, frame_dt, update):
+        """Run the fixed steps due this frame; returns how many ran."""
+        self.accumulator += frame_dt * self.speed
+        steps = 0
+        while self.accumulator >= self.step:
+            if steps == self.max_steps:
+                # Too far behind: keep the partial step, drop the backlog
+                self.dropped += self.accumulator - self.accumulator % self.step
+                self.accumulator %= self.step
+                break
+            update(self.step)
+            self.accumulator -= self.step
+            steps += 1
+        self.steps = steps
+        self.total_steps += steps
+        self.alpha = self.accumulator / self.step
+        return steps
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+    def lerp(self, previous, current):
+        return previous + (current - previous) * self.alpha
@@ -0,0 +1,51 @@
+class Pool:
+    """Reusable storage for short-lived entities (particles, shots, popups...).
+
+    Entities are made once by `factory` and recycled: spawn() hands out a dead
+    one and the caller resets its fields. Live entities are packed at the front
+    of `items`; everything after `count` is the free list. Killing swaps the
+    last live entity into the hole, so removal is O(1) and nothing is
+    allocated once the pool has grown to the game's peak size. Iteration order
+    is not stable across removals.
+    """
+
+    def __init__(self, factory, capacity=32):
+        self.factory = factory
+        self.items = [factory() for _ in range(capacity)]
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        # Don't spawn or kill while iterating; use retain() for that
+        items = self.items
+        for i in range(self.count):
+            yield items[i]
+
+    def spawn(self):
+        """Return a recycled entity (fields still hold its old values)."""
+        if self.count == len(self.items):
+            self.items.append(self.factory())
+        item = self.items[self.count]
+        self.count += 1
+        return item
+
+    def kill(self, index):
+        last = self.count - 1
+        items = self.items
+        items[index], items[last] = items[last], items[index]
+        self.count = last
+
+    def retain(self, keep, *args):
+        """Call keep(entity, *args) on every live entity and kill those where it returns False."""
+        items = self.items
+        i = 0
+        while i < self.count:
+            if keep(items[i], *args):
+                i += 1
+            else:
+                self.kill(i)
+
+    def clear(self):
+        self.count = 0
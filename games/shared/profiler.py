@@ -0,0 +1,151 @@
+import atexit
+import json
+import os
+import sys
+import time
+from collections import deque
+
+import pygame
+
+
+class Span:
+    """Context manager timing one named section of a frame."""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class FrameProfiler:
+    """Per-phase frame timings with an on-screen overlay and Chrome trace export.
+
+    A main loop marks its phases with phase("events"), phase("update"),
+    phase("draw"), phase("present") between begin_frame() and end_frame(), and
+    wraps hot sections in `with profiler.span("name"):`. F3 toggles the overlay,
+    F4 starts/stops recording a trace (chrome://tracing or ui.perfetto.dev).
+    Setting PROFILE_TRACE=<file> records from startup and writes on exit.
+    """
+
+    def __init__(self, history=120, max_trace_events=200000):
+        self.history = history
+        self.max_trace_events = max_trace_events
+        self.stats = {}
+        self.frame_totals = {}
+        self.spans = {}
+        self.overlay = False
+        # Screen area of the last overlay drawn, so it can be cleared when hidden
+        self.drawn = None
+        self.font = None
+        self.origin = time.perf_counter()
+        self.frame_start = None
+        self.current_phase = None
+        self.phase_start = 0.0
+        self.trace = None
+        self.trace_path = os.environ.get("PROFILE_TRACE")
+        if self.trace_path:
+            self.trace = []
+            atexit.register(self.write_trace)
+
+    def span(self, name):
+        span = self.spans.get(name)
+        if span is None:
+            span = self.spans[name] = Span(self, name)
+        return span
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+        self.current_phase = None
+        self.frame_totals = {}
+
+    def phase(self, name):
+        """End the running phase (if any) and start `name`."""
+        now = time.perf_counter()
+        if self.current_phase is not None:
+            self.record(self.current_phase, self.phase_start, now)
+        self.current_phase = name
+        self.phase_start = now
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        now = time.perf_counter()
+        if self.current_phase is not None:
+            self.record(self.current_phase, self.phase_start, now)
+        self.record("frame", self.frame_start, now)
+        for name, total in self.frame_totals.items():
+            samples = self.stats.get(name)
+            if samples is None:
+                samples = self.stats[name] = deque(maxlen=self.history)
+            samples.append(total * 1000)
+        self.frame_start = None
+        self.current_phase = None
+
+    def record(self, name, start, end):
+        self.frame_totals[name] = self.frame_totals.get(name, 0.0) + (end - start)
+        if self.trace is not None and len(self.trace) < self.max_trace_events:
+            self.trace.append({
+                "name": name, "ph": "X", "pid": 1, "tid": 1,
+                "ts": (start - self.origin) * 1e6, "dur": (end - start) * 1e6,
+            })
+
+    def summary(self):
+        """{name: (average ms, max ms)} over the rolling window."""
+        return {name: (sum(samples) / len(samples), max(samples))
+                for name, samples in self.stats.items() if samples}
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_F3:
+            self.overlay = not self.overlay
+        elif event.key == pygame.K_F4:
+            if self.trace is None:
+                self.trace = []
+                print("Recording frame trace... press F4 again to save")
+            else:
+                self.write_trace()
+                self.trace = None
+
+    def draw(self, screen):
+        """Draw the overlay; returns the area it covers or just stopped covering, or None."""
+        drawn, self.drawn = self.drawn, None
+        if not self.overlay:
+            return drawn
+        if self.font is None:
+            self.font = pygame.font.SysFont(None, 20)
+        rows = sorted(self.summary().items(), key=lambda item: (item[0] != "frame", -item[1][0]))
+        line_height = self.font.get_height()
+        box = pygame.Surface((230, 10 + line_height * len(rows)), pygame.SRCALPHA)
+        box.fill((0, 0, 0, 170))
+        for i, (name, (average, peak)) in enumerate(rows):
+            line = f"{name[:16]:<16} {average:6.2f} {peak:6.2f} ms"
+            box.blit(self.font.render(line, True, (255, 255, 255)), (6, 5 + i * line_height))
+        self.drawn = screen.blit(box, (screen.get_width() - box.get_width() - 5, 5))
+        return self.drawn.union(drawn) if drawn else self.drawn
+
+    def write_trace(self):
+        if not self.trace:
+            return None
+        path = self.trace_path or f"trace_{int(time.time())}.json"
+        data = {"traceEvents": self.trace, "displayTimeUnit": "ms"}
+        with open(path, "w") as file:
+            json.dump(data, file)
+        print(f"Wrote {len(self.trace)} trace events to {path}")
+        if sys.platform == "emscripten":
+            # The browser build has no reachable filesystem; dump to the console
+            print(json.dumps(data))
+        self.trace = []
+        return path
+
+
+# One profiler per process, shared by every game's main loop
+profiler = FrameProfiler()
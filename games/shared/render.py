@@ -0,0 +1,122 @@
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class DirtyRenderer:
+    """Opt-in replacement for pygame.display.flip() that only presents changed regions.
+
+    Games keep drawing the whole frame as usual, report what changed with
+    mark() (or invalidate() when the whole scene did) and call present()
+    instead of flip(). Only the marked regions are sent to
+    pygame.display.update(), and a frame with nothing marked is not presented
+    at all. When more than `full_flip_ratio` of the screen is marked, a plain
+    flip is cheaper and is used instead.
+
+    With diff=True the screen is also compared tile by tile with the previous
+    frame and every changed tile is presented, which shows up regions a game
+    forgot to mark. That copies and compares the whole framebuffer each frame,
+    so it is a debugging aid; it needs numpy.
+    """
+
+    def __init__(self, screen, tile_size=40, full_flip_ratio=0.5, diff=False):
+        self.screen = screen
+        self.tile_size = tile_size
+        self.full_flip_ratio = full_flip_ratio
+        self.diff = diff and np is not None
+        self.previous = None
+        self.marked = []
+        self.full = True
+        self.frames = 0
+        self.full_flips = 0
+        self.partial_updates = 0
+        self.skipped = 0
+
+    def mark(self, rect):
+        """Present a region this frame; None (nothing was drawn) is ignored."""
+        if rect is not None:
+            self.marked.append(pygame.Rect(rect).clip(self.screen.get_rect()))
+
+    def invalidate(self):
+        """Force a full flip on the next present (e.g. after a scene change)."""
+        self.full = True
+
+    def present(self):
+        self.frames += 1
+        rects = self.changed_rects()
+        self.marked = []
+
+        if rects is None:
+            pygame.display.flip()
+            self.full_flips += 1
+        elif rects:
+            pygame.display.update(rects)
+            self.partial_updates += 1
+        else:
+            self.skipped += 1
+        self.full = False
+
+    def changed_rects(self):
+        """Rects to present, or None when the whole screen should be flipped."""
+        if self.diff:
+            return self.diff_rects()
+        if self.full:
+            return None
+        return self.limit(self.marked, sum(r.w * r.h for r in self.marked))
+
+    def diff_rects(self):
+        """changed_rects() plus every tile that differs from the previous frame."""
+        pixels = self.snapshot()
+        previous, self.previous = self.previous, pixels
+        if pixels is None or self.full or previous is None or previous.shape != pixels.shape:
+            return None
+
+        # Reduce the per-pixel difference to one flag per tile. A raw row-major
+        # copy is several times faster than surfarray.array2d here.
+        t = self.tile_size
+        height, width = pixels.shape
+        changed = pixels != previous
+        if height % t or width % t:
+            changed = np.pad(changed, ((0, -height % t), (0, -width % t)))
+        rows, columns = changed.shape[0] // t, changed.shape[1] // t
+        changed = changed.reshape(rows, t, columns * t).any(axis=1).reshape(rows, columns, t).any(axis=2)
+
+        rects = list(self.marked)
+        area = sum(r.w * r.h for r in rects)
+        # Merge horizontal runs of dirty tiles in each tile row into one rect
+        for ty in range(rows):
+            row = np.flatnonzero(changed[ty])
+            if not row.size:
+                continue
+            breaks = np.flatnonzero(np.diff(row) != 1)
+            starts = np.concatenate(([row[0]], row[breaks + 1]))
+            ends = np.concatenate((row[breaks], [row[-1]]))
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                rect = pygame.Rect(start * t, ty * t, (end - start + 1) * t, t).clip(self.screen.get_rect())
+                rects.append(rect)
+                area += rect.w * rect.h
+        return self.limit(rects, area)
+
+    def snapshot(self):
+        if self.screen.get_bytesize() != 4:
+            return None
+        raw = self.screen.get_buffer().raw
+        pixels = np.frombuffer(raw, np.uint32).reshape(self.screen.get_height(), -1)
+        return pixels[:, :self.screen.get_width()]
+
+    def limit(self, rects, area):
+        screen_area = self.screen.get_width() * self.screen.get_height()
+        if area > screen_area * self.full_flip_ratio:
+            return None
+        return rects
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "full_flips": self.full_flips,
+            "partial_updates": self.partial_updates,
+            "skipped": self.skipped,
+        }
@@ -0,0 +1,377 @@
+import atexit
+import json
+import struct
+import zlib
+
+import pygame
+
+from shared.clock import settings
+
+# File layout: an uncompressed header (magic, version, RNG seed, start ticks,
+# game name) followed by a zlib stream of frames. A frame holds the dt its
+# tick() returned, the ticks() value the next frame starts at, the keyboard and
+# mouse state the game sampled, and every batch of events returned by
+# pygame.event.get() during the frame.
+MAGIC = b"PGIR"
+VERSION = 1
+HEADER = struct.Struct("<4sHqd")
+FRAME = struct.Struct("<ddBH")
+
+HAS_KEYS, HAS_MOUSE_POS, HAS_MOUSE_BUTTONS = 1, 2, 4
+
+# How each event's attributes are packed; anything else falls back to JSON
+KIND_BARE, KIND_KEY, KIND_BUTTON, KIND_MOTION, KIND_WHEEL, KIND_JSON = range(6)
+EVENT_KINDS = {
+    pygame.QUIT: KIND_BARE,
+    pygame.USEREVENT: KIND_BARE,
+    pygame.KEYDOWN: KIND_KEY,
+    pygame.KEYUP: KIND_KEY,
+    pygame.MOUSEBUTTONDOWN: KIND_BUTTON,
+    pygame.MOUSEBUTTONUP: KIND_BUTTON,
+    pygame.MOUSEMOTION: KIND_MOTION,
+    pygame.MOUSEWHEEL: KIND_WHEEL,
+}
+
+
+def now_ms():
+    """The shared clock's timeline, unrounded (virtual while uncapped)."""
+    if settings.uncapped:
+        return settings.virtual_ms
+    return float(pygame.time.get_ticks())
+
+
+def button_mask(buttons):
+    return sum(1 << i for i, pressed in enumerate(buttons) if pressed)
+
+
+def encode_event(event):
+    kind = EVENT_KINDS.get(event.type, KIND_JSON)
+    if kind == KIND_BARE and event.dict:
+        kind = KIND_JSON
+    data = struct.pack("<IB", event.type, kind)
+    if kind == KIND_KEY:
+        text = getattr(event, "unicode", "").encode("utf-8")
+        data += struct.pack("<iHHB", event.key, getattr(event, "mod", 0), getattr(event, "scancode", 0), len(text)) + text
+    elif kind == KIND_BUTTON:
+        data += struct.pack("<hhB", *event.pos, event.button)
+    elif kind == KIND_MOTION:
+        data += struct.pack("<hhhhB", *event.pos, *event.rel, button_mask(event.buttons))
+    elif kind == KIND_WHEEL:
+        data += struct.pack("<hh", event.x, event.y)
+    elif kind == KIND_JSON:
+        attrs = {name: value for name, value in event.dict.items()
+                 if isinstance(value, (bool, int, float, str, tuple, list))}
+        text = json.dumps(attrs).encode("utf-8")
+        data += struct.pack("<H", len(text)) + text
+    return data
+
+
+def decode_event(data, offset):
+    """Return (event, new offset)."""
+    event_type, kind = struct.unpack_from("<IB", data, offset)
+    offset += 5
+    attrs = {}
+    if kind == KIND_KEY:
+        key, mod, scancode, length = struct.unpack_from("<iHHB", data, offset)
+        offset += 9
+        attrs = {"key": key, "mod": mod, "scancode": scancode,
+                 "unicode": data[offset:offset + length].decode("utf-8")}
+        offset += length
+    elif kind == KIND_BUTTON:
+        x, y, button = struct.unpack_from("<hhB", data, offset)
+        offset += 5
+        attrs = {"pos": (x, y), "button": button}
+    elif kind == KIND_MOTION:
+        x, y, dx, dy, mask = struct.unpack_from("<hhhhB", data, offset)
+        offset += 9
+        attrs = {"pos": (x, y), "rel": (dx, dy), "buttons": tuple(bool(mask & (1 << i)) for i in range(3))}
+    elif kind == KIND_WHEEL:
+        x, y = struct.unpack_from("<hh", data, offset)
+        offset += 4
+        attrs = {"x": x, "y": y}
+    elif kind == KIND_JSON:
+        (length,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        attrs = json.loads(data[offset:offset + length].decode("utf-8"))
+        offset += length
+    return pygame.event.Event(event_type, attrs), offset
+
+
+class Frame:
+    """Input the game saw during one frame."""
+
+    def __init__(self):
+        self.dt = 0.0
+        self.ticks = 0
+        self.keys = None
+        self.mouse_pos = None
+        self.mouse_buttons = None
+        self.batches = []
+
+    def encode(self):
+        flags = ((HAS_KEYS if self.keys is not None else 0)
+                 | (HAS_MOUSE_POS if self.mouse_pos is not None else 0)
+                 | (HAS_MOUSE_BUTTONS if self.mouse_buttons is not None else 0))
+        parts = [FRAME.pack(self.dt, self.ticks, flags, len(self.batches))]
+        if self.keys is not None:
+            parts.append(struct.pack(f"<H{len(self.keys)}H", len(self.keys), *self.keys))
+        if self.mouse_pos is not None:
+            parts.append(struct.pack("<hh", *self.mouse_pos))
+        if self.mouse_buttons is not None:
+            parts.append(struct.pack("<B", self.mouse_buttons))
+        for batch in self.batches:
+            parts.append(struct.pack("<H", len(batch)))
+            parts.extend(encode_event(event) for event in batch)
+        return b"".join(parts)
+
+    @classmethod
+    def decode(cls, data, offset):
+        frame = cls()
+        frame.dt, frame.ticks, flags, batch_count = FRAME.unpack_from(data, offset)
+        offset += FRAME.size
+        if flags & HAS_KEYS:
+            (count,) = struct.unpack_from("<H", data, offset)
+            frame.keys = struct.unpack_from(f"<{count}H", data, offset + 2)
+            offset += 2 + 2 * count
+        if flags & HAS_MOUSE_POS:
+            frame.mouse_pos = struct.unpack_from("<hh", data, offset)
+            offset += 4
+        if flags & HAS_MOUSE_BUTTONS:
+            (frame.mouse_buttons,) = struct.unpack_from("<B", data, offset)
+            offset += 1
+        for _ in range(batch_count):
+            (count,) = struct.unpack_from("<H", data, offset)
+            offset += 2
+            batch = []
+            for _ in range(count):
+                event, offset = decode_event(data, offset)
+                batch.append(event)
+            frame.batches.append(batch)
+        return frame, offset
+
+
+class InputHooks:
+    """Swaps pygame's input functions and the clock hooks for a recorder or player."""
+
+    PATCHED = (
+        (pygame.event, "get"),
+        (pygame.key, "get_pressed"),
+        (pygame.mouse, "get_pos"),
+        (pygame.mouse, "get_pressed"),
+    )
+
+    def __init__(self):
+        self.originals = None
+
+    def install(self):
+        self.originals = [(module, name, getattr(module, name)) for module, name in self.PATCHED]
+        pygame.event.get = self.get_events
+        pygame.key.get_pressed = self.get_pressed_keys
+        pygame.mouse.get_pos = self.get_mouse_pos
+        pygame.mouse.get_pressed = self.get_mouse_pressed
+
+    def uninstall(self):
+        if self.originals is None:
+            return
+        for module, name, original in self.originals:
+            setattr(module, name, original)
+        self.originals = None
+
+    def original(self, module, name):
+        for patched_module, patched_name, function in self.originals:
+            if patched_module is module and patched_name == name:
+                return function
+        return getattr(module, name)
+
+
+class InputRecorder(InputHooks):
+    """Writes everything a game reads from pygame's input API to `path`.
+
+    Install it before the game is built (its random.seed() calls must see the
+    recorded seed, see bench.load_game) and run the game as usual.
+    """
+
+    def __init__(self, path, seed, name=""):
+        super().__init__()
+        self.path = path
+        self.seed = seed
+        self.name = name
+        self.file = None
+        self.compressor = None
+        self.frame = Frame()
+        self.frames = 0
+
+    def install(self):
+        super().install()
+        self.file = open(self.path, "wb")
+        name = self.name.encode("utf-8")
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.seed, now_ms()))
+        self.file.write(struct.pack("<B", len(name)) + name)
+        self.compressor = zlib.compressobj(9)
+        settings.on_frame = self.on_frame
+        atexit.register(self.close)
+
+    def get_events(self, *args, **kwargs):
+        events = self.original(pygame.event, "get")(*args, **kwargs)
+        self.frame.batches.append(list(events))
+        return events
+
+    def get_pressed_keys(self):
+        keys = self.original(pygame.key, "get_pressed")()
+        if self.frame.keys is None:
+            self.frame.keys = [scancode for scancode, pressed in enumerate(keys) if pressed]
+        return keys
+
+    def get_mouse_pos(self, *args, **kwargs):
+        pos = self.original(pygame.mouse, "get_pos")(*args, **kwargs)
+        if self.frame.mouse_pos is None:
+            self.frame.mouse_pos = pos
+        return pos
+
+    def get_mouse_pressed(self, num_buttons=3):
+        buttons = self.original(pygame.mouse, "get_pressed")(num_buttons)
+        if self.frame.mouse_buttons is None:
+            self.frame.mouse_buttons = button_mask(self.original(pygame.mouse, "get_pressed")(5))
+        return buttons
+
+    def on_frame(self, dt):
+        self.frame.dt = dt
+        self.frame.ticks = now_ms()
+        self.write_frame()
+
+    def write_frame(self):
+        self.file.write(self.compressor.compress(self.frame.encode()))
+        self.frame = Frame()
+        self.frames += 1
+
+    def close(self):
+        if self.file is None:
+            return
+        # The game usually quits mid-frame; keep the events that ended it
+        if self.frame.batches:
+            self.frame.ticks = now_ms()
+            self.write_frame()
+        self.file.write(self.compressor.flush())
+        self.file.close()
+        self.file = None
+        if settings.on_frame == self.on_frame:
+            settings.on_frame = None
+        self.uninstall()
+        print(f"Recorded {self.frames} frames to {self.path}")
+
+
+def read_header(data):
+    magic, version, seed, start_ticks = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not an input recording")
+    if version != VERSION:
+        raise ValueError(f"unsupported input recording version {version}")
+    offset = HEADER.size
+    length = data[offset]
+    name = data[offset + 1:offset + 1 + length].decode("utf-8")
+    return seed, start_ticks, name, offset + 1 + length
+
+
+class InputPlayer(InputHooks):
+    """Feeds a recording back to a game frame by frame.
+
+    The clock runs uncapped on the recorded timeline, so ticks(), seconds()
+    and every tick() dt match the session exactly. Real input is ignored
+    except QUIT; a QUIT is delivered once the recording runs out.
+    """
+
+    def __init__(self, path, realtime=False):
+        super().__init__()
+        self.path = path
+        self.realtime = realtime
+        with open(path, "rb") as file:
+            data = file.read()
+        self.seed, self.start_ticks, self.name, offset = read_header(data)
+        self.frames = self.decode_frames(zlib.decompress(data[offset:]))
+        self.index = 0
+        self.batch = 0
+        self.previous_on_tick = None
+        self.previous_on_frame = None
+        self.frame_started = 0
+
+    @staticmethod
+    def decode_frames(data):
+        frames = []
+        offset = 0
+        while offset < len(data):
+            frame, offset = Frame.decode(data, offset)
+            frames.append(frame)
+        return frames
+
+    @property
+    def finished(self):
+        return self.index >= len(self.frames)
+
+    def install(self):
+        super().install()
+        self.previous_on_tick = settings.on_tick
+        self.previous_on_frame = settings.on_frame
+        settings.on_tick = self.on_tick
+        settings.on_frame = self.on_frame
+        settings.uncapped = True
+        settings.virtual_ms = self.start_ticks
+        self.frame_started = pygame.time.get_ticks()
+
+    def uninstall(self):
+        if self.originals is not None:
+            settings.on_tick = self.previous_on_tick
+            settings.on_frame = self.previous_on_frame
+        super().uninstall()
+
+    def current(self):
+        return self.frames[self.index] if not self.finished else None
+
+    def get_events(self, *args, **kwargs):
+        # Drain the real queue so the window stays responsive; only QUIT passes
+        real = self.original(pygame.event, "get")()
+        events = [event for event in real if event.type == pygame.QUIT]
+        frame = self.current()
+        if frame is None:
+            events.append(pygame.event.Event(pygame.QUIT))
+        elif self.batch < len(frame.batches):
+            events = frame.batches[self.batch] + events
+            self.batch += 1
+        return events
+
+    def get_pressed_keys(self):
+        keys = self.original(pygame.key, "get_pressed")()
+        frame = self.current()
+        pressed = set(frame.keys) if frame is not None and frame.keys else set()
+        return type(keys)(scancode in pressed for scancode in range(len(keys)))
+
+    def get_mouse_pos(self, *args, **kwargs):
+        frame = self.current()
+        if frame is None or frame.mouse_pos is None:
+            return (0, 0)
+        return tuple(frame.mouse_pos)
+
+    def get_mouse_pressed(self, num_buttons=3):
+        frame = self.current()
+        mask = frame.mouse_buttons if frame is not None and frame.mouse_buttons else 0
+        return tuple(bool(mask & (1 << i)) for i in range(num_buttons))
+
+    def on_tick(self):
+        frame = self.current()
+        if frame is not None:
+            # Clock.tick() returns this as the frame's dt
+            settings.fixed_dt_ms = frame.dt
+            if self.realtime:
+                elapsed = pygame.time.get_ticks() - self.frame_started
+                pygame.time.delay(max(0, int(frame.dt - elapsed)))
+                self.frame_started = pygame.time.get_ticks()
+        if self.previous_on_tick:
+            self.previous_on_tick()
+
+    def on_frame(self, dt):
+        frame = self.current()
+        if frame is not None:
+            settings.virtual_ms = frame.ticks
+        self.index += 1
+        self.batch = 0
+        if self.previous_on_frame:
+            self.previous_on_frame(dt)
@@ -0,0 +1,67 @@
+import pygame
+
+
+class ReturnToLauncher(Exception):
+    """Raised inside a hosted game to hand control back to the launcher."""
+
+
+class QuitLauncher(Exception):
+    """Raised when a hosted game's window is closed: the launcher quits too."""
+
+
+class Runtime:
+    """pygame state shared by every game running in one process.
+
+    Standalone, a game behaves as before: init(), display() and quit() map to
+    pygame.init(), set_mode() and pygame.quit(). When the launcher hosts the
+    games (`hosted` is True), pygame is initialised once, the window and fonts
+    are reused between games, and pressing ESC raises ReturnToLauncher while
+    quitting raises QuitLauncher, so the launcher can tell leaving a game
+    from closing the window.
+    """
+
+    def __init__(self):
+        self.hosted = False
+        self.initialized = False
+        self.fonts = {}
+
+    def init(self):
+        if not self.initialized:
+            pygame.init()
+            self.initialized = True
+
+    def display(self, size, caption=None):
+        """The window surface at `size`, only recreated when the size changes."""
+        self.init()
+        screen = pygame.display.get_surface()
+        if screen is None or screen.get_size() != tuple(size):
+            screen = pygame.display.set_mode(size)
+        if caption:
+            pygame.display.set_caption(caption)
+        return screen
+
+    def font(self, name, size):
+        """pygame.font.SysFont(name, size), made once per process."""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            self.init()
+            font = self.fonts[key] = pygame.font.SysFont(name, size)
+        return font
+
+    def launch_launcher(self):
+        """ESC handler: back to the launcher when hosted, ignored standalone."""
+        if self.hosted:
+            raise ReturnToLauncher()
+
+    def quit(self):
+        """End of a game's main loop (the window was closed)."""
+        if self.hosted:
+            raise QuitLauncher()
+        pygame.quit()
+        self.initialized = False
+        self.fonts.clear()
+
+
+# One runtime per process, shared by the launcher and every game
+runtime = Runtime()
@@ -0,0 +1,65 @@
+import asyncio
+import sys
+
+import pygame
+
+from shared.clock import Clock, settings, ticks
+
+
+class FrameScheduler:
+    """Frame pacing for event-driven games: full rate while animating, asleep while idle.
+
+    Replaces the usual `clock.tick(60); await asyncio.sleep(0)` at the end of a
+    main loop with `await scheduler.next_frame(animating, deadline)`. While nothing
+    animates the loop blocks until an input event arrives or `deadline` (a
+    shared.clock.ticks() value, e.g. a feedback timer running out) passes.
+    """
+
+    def __init__(self, fps=60, settle_frames=1, poll_ms=30):
+        self.clock = Clock()
+        self.fps = fps
+        # Frames drawn at full rate after every wake-up, so state changed while
+        # drawing (e.g. a round advanced by a timer check) reaches the screen
+        self.settle_frames = settle_frames
+        # Longest stretch the asyncio loop is blocked, so other tasks keep running
+        self.poll_ms = poll_ms
+        self.pending = settle_frames
+        self.dt = 0
+        self.idle_waits = 0
+
+    def wake(self):
+        """Draw the next frames at full rate even if nothing is animating."""
+        self.pending = self.settle_frames
+
+    async def next_frame(self, animating=False, deadline=None):
+        # Uncapped (benchmark) runs never idle, every call is one frame
+        if animating or self.pending > 0 or settings.uncapped:
+            self.pending -= 1
+            self.dt = self.clock.tick(self.fps) / 1000
+            await asyncio.sleep(0)
+            return
+
+        self.idle_waits += 1
+        await self.wait(deadline)
+        self.pending = self.settle_frames
+        # Restart the clock so the idle time isn't reported as one huge frame
+        self.clock.tick()
+        self.dt = 0
+
+    async def wait(self, deadline):
+        while not pygame.event.peek():
+            timeout = self.poll_ms
+            if deadline is not None:
+                timeout = min(timeout, deadline - ticks())
+            if timeout <= 0:
+                return
+            if sys.platform == "emscripten":
+                # Blocking would freeze the browser tab; yield to the page instead
+                await asyncio.sleep(timeout / 1000)
+                continue
+            event = pygame.event.wait(timeout)
+            if event.type != pygame.NOEVENT:
+                # Put it back for the game's own pygame.event.get()
+                pygame.event.post(event)
+                return
+            await asyncio.sleep(0)
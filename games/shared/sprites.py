@@ -0,0 +1,47 @@
+import pygame
+
+
+class CircleSprites:
+    """Pre-rendered filled circles, one per (radius, color), blitted in batches.
+
+    Each sprite is the same pygame.draw.circle() a game would call per
+    object, drawn once onto a colorkeyed RLE surface, so output is pixel for
+    pixel the same. draw() hands a whole array of circles to one
+    Surface.blits() call.
+    """
+
+    KEY = (255, 0, 255)
+
+    def __init__(self):
+        self.sprites = {}
+
+    def sprite(self, radius, color):
+        key = (radius, color)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((radius * 2, radius * 2))
+            sprite.fill(self.KEY)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            sprite.set_colorkey(self.KEY, pygame.RLEACCEL)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            self.sprites[key] = sprite
+        return sprite
+
+    def prepare(self, radii, color):
+        for radius in radii:
+            self.sprite(radius, color)
+
+    def draw(self, screen, xs, ys, radii, color):
+        """Draw circles centred on (xs[i], ys[i]) (NumPy arrays, truncated to ints)."""
+        if not len(xs):
+            return
+        radii = radii.astype(int)
+        lefts = (xs.astype(int) - radii).tolist()
+        tops = (ys.astype(int) - radii).tolist()
+        radii = radii.tolist()
+        sprites = {radius: self.sprite(radius, color) for radius in set(radii)}
+        screen.blits([(sprites[radius], (left, top)) for radius, left, top in zip(radii, lefts, tops)], False)
+
+    def clear(self):
+        self.sprites.clear()
@@ -0,0 +1,122 @@
+from collections import OrderedDict
+
+
+class NumberAtlas:
+    """Pre-rendered digit glyphs so changing scores are blitted, not re-rasterized."""
+
+    chars = "0123456789+-.,: "
+
+    def __init__(self, font, color, antialias=True):
+        self.glyphs = {char: font.render(char, antialias, color) for char in self.chars}
+        self.height = font.get_height()
+
+    def size(self, text):
+        return sum(self.glyphs[char].get_width() for char in text), self.height
+
+    def draw(self, screen, text, pos):
+        x, y = pos
+        for char in text:
+            glyph = self.glyphs[char]
+            screen.blit(glyph, (x, y))
+            x += glyph.get_width()
+
+    def can_draw(self, text):
+        return all(char in self.glyphs for char in text)
+
+
+class TextCache:
+    """Rendered text surfaces and word-wrapped layouts with LRU eviction."""
+
+    def __init__(self, max_surfaces=512, max_layouts=128):
+        self.max_surfaces = max_surfaces
+        self.max_layouts = max_layouts
+        self.surfaces = OrderedDict()
+        self.layouts = OrderedDict()
+        self.atlases = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, entries, key):
+        value = entries.get(key)
+        if value is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+        else:
+            self.misses += 1
+        return value
+
+    def remember(self, entries, key, value, limit):
+        entries[key] = value
+        if len(entries) > limit:
+            entries.popitem(last=False)
+        return value
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.lookup(self.surfaces, key)
+        if surface is None:
+            surface = self.remember(self.surfaces, key, font.render(text, antialias, color), self.max_surfaces)
+        return surface
+
+    def wrap(self, font, text, width):
+        """Split text into lines no wider than `width`, measuring each word once per layout."""
+        key = (font, text, width)
+        lines = self.lookup(self.layouts, key)
+        if lines is None:
+            lines = []
+            current_line = ""
+            for word in text.split(" "):
+                # If the word doesn't fit on the current line, move it to the next line
+                if font.size(current_line + word)[0] <= width:
+                    current_line += word + " "
+                else:
+                    lines.append(current_line)
+                    current_line = word + " "
+            lines.append(current_line)
+            lines = self.remember(self.layouts, key, tuple(lines), self.max_layouts)
+        return lines
+
+    def draw(self, screen, font, text, pos, color, wrap_width=None, line_spacing=5):
+        x, y = pos
+        if wrap_width is None:
+            screen.blit(self.render(font, text, color), (x, y))
+            return
+        line_height = font.get_height() + line_spacing
+        for i, line in enumerate(self.wrap(font, text, wrap_width)):
+            screen.blit(self.render(font, line, color), (x, y + i * line_height))
+
+    def number_atlas(self, font, color):
+        key = (font, tuple(color))
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            atlas = self.atlases[key] = NumberAtlas(font, color)
+        return atlas
+
+    def draw_number(self, screen, font, value, pos, color):
+        """Draw a changing number (score, timer) from the digit atlas."""
+        text = str(value)
+        atlas = self.number_atlas(font, color)
+        if atlas.can_draw(text):
+            atlas.draw(screen, text, pos)
+        else:
+            self.draw(screen, font, text, pos, color)
+
+    def clear(self):
+        self.surfaces.clear()
+        self.layouts.clear()
+        self.atlases.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "surfaces": len(self.surfaces),
+            "layouts": len(self.layouts),
+            "atlases": len(self.atlases),
+        }
+
+
+# One cache per process, shared by every game's draw_text
+text_cache = TextCache()
@@ -0,0 +1,97 @@
+class Timer:
+    """Handle for one scheduled callback; cancel() stops it from firing."""
+
+    def __init__(self, wheel, ticks, callback, args, repeat):
+        self.wheel = wheel
+        self.ticks = ticks
+        self.callback = callback
+        self.args = args
+        self.repeat = repeat
+        self.due = 0
+        self.active = True
+
+    def __bool__(self):
+        return self.active
+
+    def cancel(self):
+        if self.active:
+            self.active = False
+            self.wheel.pending -= 1
+
+
+class TimerWheel:
+    """Frame-driven timers on a hashed timing wheel.
+
+    The main loop calls advance(dt) once per frame; time is counted in ticks
+    of `resolution` seconds and a timer due on tick T waits in slot
+    T % len(slots), so scheduling, cancelling and each tick are O(1) in the
+    number of timers. Callbacks run inside advance() on the game's own loop:
+    no asyncio tasks to leak, and nothing wakes up between frames. A timer
+    made with every() repeats until cancelled or until its callback returns
+    False.
+    """
+
+    def __init__(self, resolution=1 / 60, slots=64):
+        self.resolution = resolution
+        self.slots = [[] for _ in range(slots)]
+        self.tick = 0
+        self.accumulator = 0.0
+        self.pending = 0
+
+    def after(self, delay, callback, *args):
+        """Call callback(*args) once, `delay` seconds from now."""
+        return self.schedule(Timer(self, self.to_ticks(delay), callback, args, False))
+
+    def every(self, interval, callback, *args):
+        """Call callback(*args) every `interval` seconds."""
+        return self.schedule(Timer(self, self.to_ticks(interval), callback, args, True))
+
+    def to_ticks(self, seconds):
+        return max(1, round(seconds / self.resolution))
+
+    def schedule(self, timer):
+        timer.due = self.tick + timer.ticks
+        self.slots[timer.due % len(self.slots)].append(timer)
+        self.pending += 1
+        return timer
+
+    def advance(self, dt):
+        """Move time forward by `dt` seconds and fire every timer that came due."""
+        self.accumulator += dt
+        ticks = int(self.accumulator / self.resolution)
+        self.accumulator -= ticks * self.resolution
+        if not self.pending:
+            self.tick += ticks
+            return
+        for _ in range(ticks):
+            self.tick += 1
+            slot = self.slots[self.tick % len(self.slots)]
+            if slot:
+                self.fire(slot)
+
+    def fire(self, slot):
+        due = [timer for timer in slot if timer.due <= self.tick]
+        if not due:
+            return
+        # Timers further than one lap away stay for a later pass
+        slot[:] = [timer for timer in slot if timer.due > self.tick]
+        for timer in due:
+            if not timer.active:
+                continue  # Cancelled while waiting
+            again = timer.callback(*timer.args) is not False and timer.repeat
+            if not timer.active:
+                continue  # Cancelled by its own callback
+            if again:
+                timer.due = self.tick + timer.ticks
+                self.slots[timer.due % len(self.slots)].append(timer)
+            else:
+                timer.active = False
+                self.pending -= 1
+
+    def clear(self):
+        """Cancel every timer."""
+        for slot in self.slots:
+            for timer in slot:
+                timer.active = False
+            slot.clear()
+        self.pending = 0